@@ -0,0 +1,9 @@
+from drf_case.cache import invalidate_namespace
+
+# Ekip verisine ait tüm cache anahtarları bu namespace altında sürümlenir
+CREW_NAMESPACE = 'crew'
+
+
+def invalidate_crew_cache():
+  """Sadece ekip cache'lerini geçersiz kılar, Redis'in geri kalanına dokunmaz."""
+  invalidate_namespace(CREW_NAMESPACE)
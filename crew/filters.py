@@ -7,10 +7,8 @@ class CrewMemberFilter(django_filters.FilterSet):
 
   # İsim ve rol için kısmi eşleşme
   name = django_filters.CharFilter(lookup_expr='icontains')
-  role = django_filters.MultipleChoiceFilter(
-    choices=CrewMember.ROLE_CHOICES,
-    lookup_expr='in'
-  )
+  # ?role=pilot&role=copilot: her değer exact eşleşme, sonuçlar OR'lanır
+  role = django_filters.MultipleChoiceFilter(choices=CrewMember.ROLE_CHOICES)
 
   class Meta:
     model = CrewMember
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crew', '0002_alter_crewmember_options'),
+        ('flights', '0003_flight_flight_sched_desc_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crewmember',
+            index=models.Index(fields=['name', 'id'], name='crew_name_id_idx'),
+        ),
+    ]
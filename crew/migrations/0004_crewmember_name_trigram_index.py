@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+  # pg_trgm sadece PostgreSQL'de var; SQLite (testler) normal LIKE taramasıyla çalışır
+  if schema_editor.connection.vendor != 'postgresql':
+    return
+  schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+  schema_editor.execute(
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS crew_name_trgm_idx '
+    'ON crew_crewmember USING gin ((UPPER("name"::text)) gin_trgm_ops)'
+  )
+
+
+def drop_trigram_index(apps, schema_editor):
+  if schema_editor.connection.vendor != 'postgresql':
+    return
+  schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS crew_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+  atomic = False
+
+  dependencies = [
+    ('crew', '0003_crewmember_crew_name_id_idx'),
+  ]
+
+  operations = [
+    migrations.RunPython(create_trigram_index, drop_trigram_index),
+  ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crew', '0004_crewmember_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crewmember',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from flights.models import Flight
 
 class CrewMember(models.Model):
@@ -11,6 +11,13 @@ class CrewMember(models.Model):
   name = models.CharField(max_length=100)
   role = models.CharField(max_length=20, choices=ROLE_CHOICES)
   assigned_flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name='crew')
+  updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+  def save(self, *args, **kwargs):
+    # Sinyallerin yazdığı değişiklik kaydı satırla aynı transaction'da commit olur
+    using = kwargs.get('using') or router.db_for_write(CrewMember, instance=self)
+    with transaction.atomic(using=using):
+      super().save(*args, **kwargs)
 
   def __str__(self):
     return f"{self.name} ({self.role})"
@@ -19,3 +26,7 @@ class CrewMember(models.Model):
     verbose_name = 'Crew Member'
     verbose_name_plural = 'Crew Members'
     ordering = ['name']
+    indexes = [
+      # Varsayılan sıralama ve keyset sayfalama (name, id)
+      models.Index(fields=['name', 'id'], name='crew_name_id_idx'),
+    ]
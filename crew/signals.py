@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import CrewMember
+from .cache import invalidate_crew_cache
+from flights.changes import CREW, DELETE, UPSERT, record_changes
+
+
+@receiver(post_save, sender=CrewMember)
+@receiver(post_delete, sender=CrewMember)
+def crew_cache_invalidation_handler(sender, instance, **kwargs):
+  # Ekip yazmaları (uçuş silinirken CASCADE dahil) ekip cache'ini düşürür
+  invalidate_crew_cache()
+
+
+@receiver(post_save, sender=CrewMember)
+def crew_change_log_handler(sender, instance, **kwargs):
+  record_changes(CREW, UPSERT, [instance.pk])
+
+
+@receiver(post_delete, sender=CrewMember)
+def crew_delete_change_log_handler(sender, instance, **kwargs):
+  record_changes(CREW, DELETE, [instance.pk])
@@ -1,4 +1,6 @@
 from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from flights.models import Flight
@@ -183,9 +185,89 @@ class CrewAPITest(APITestCase):
     self.assertEqual(response.status_code, 200)
     
     # Check that all returned crew members are pilots
+    self.assertEqual([crew_member['name'] for crew_member in response.data['results']], ["Ahmet Pilot"])
     for crew_member in response.data['results']:
       self.assertEqual(crew_member['role'], "pilot")
 
+    response = self.client.get(url + "?role=pilot&role=copilot")
+    self.assertEqual(response.data['count'], 2)
+
+  def test_crew_keyset_pagination(self):
+    """Test crew keyset pagination walks name, id order without duplicates"""
+    self._authenticate_user(self.viewer_user)
+    CrewMember.objects.create(name="Ahmet Pilot", role="attendant", assigned_flight=self.flight2)
+
+    url = reverse('crewmember-list') + "?pagination=keyset&page_size=2"
+    names = []
+    while url:
+      response = self.client.get(url)
+      self.assertEqual(response.status_code, 200)
+      names.extend((item['name'], item['id']) for item in response.data['results'])
+      url = response.data['next']
+
+    self.assertEqual(names, sorted(CrewMember.objects.values_list('name', 'id')))
+
+  def test_crew_count_cached_and_invalidated(self):
+    """Test crew counts are cached per filter and refreshed after crew writes"""
+    self._authenticate_user(self.viewer_user)
+
+    pilots_url = reverse('crewmember-list') + "?role=pilot"
+    all_url = reverse('crewmember-list')
+    response = self.client.get(pilots_url)
+    self.assertEqual(response.data['count'], 1)
+    self.assertTrue(response.data['count_exact'])
+    self.assertEqual(self.client.get(all_url).data['count'], 2)
+
+    # Aynı filtre imzası için sayım cache'ten gelir
+    with CaptureQueriesContext(connection) as ctx:
+      self.assertEqual(self.client.get(pilots_url).data['count'], 1)
+    self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+    # Filtre dışındaki bir yazma filtreli sayımı değiştirmez, filtresizi değiştirir
+    CrewMember.objects.create(name="Yeni Hostes", role="attendant", assigned_flight=self.flight2)
+    self.assertEqual(self.client.get(pilots_url).data['count'], 1)
+    self.assertEqual(self.client.get(all_url).data['count'], 3)
+
+    CrewMember.objects.create(name="Yeni Pilot", role="pilot", assigned_flight=self.flight2)
+    self.assertEqual(self.client.get(pilots_url).data['count'], 2)
+
+  def test_crew_sparse_fields_with_flight_attributes(self):
+    """Test ?fields= trims crew rows and joins requested flight attributes"""
+    self._authenticate_user(self.viewer_user)
+
+    url = reverse('crewmember-list') + "?fields=name,flight.flight_number,flight.gate&ordering=name"
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(url)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.data['results'][0], {
+      "name": "Ahmet Pilot",
+      "flight": {"flight_number": "TK2020", "gate": "A1"},
+    })
+    # Uçuş alanları JOIN ile gelir, istenmeyen kolonlar seçilmez
+    crew_queries = [q["sql"] for q in ctx.captured_queries if '"crew_crewmember"."name"' in q["sql"]]
+    self.assertEqual(len(crew_queries), 1)
+    self.assertIn("JOIN", crew_queries[0])
+    self.assertNotIn('"crew_crewmember"."role"', crew_queries[0])
+    self.assertNotIn('"flights_flight"."origin"', crew_queries[0])
+
+  def test_crew_sparse_fields_unknown_field(self):
+    """Test that unknown sparse fields return 400"""
+    self._authenticate_user(self.viewer_user)
+    response = self.client.get(reverse('crewmember-list') + "?fields=name,flight.pilot")
+    self.assertEqual(response.status_code, 400)
+    self.assertIn("fields", response.data)
+
+  def test_crew_conditional_get(self):
+    """Test crew lists return 304 until a crew member changes"""
+    self._authenticate_user(self.viewer_user)
+    url = reverse('crewmember-list')
+    etag = self.client.get(url)["ETag"]
+    self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    self.pilot.name = "Ahmet Kaptan"
+    self.pilot.save()
+    self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
   def test_crew_role_choices(self):
     """Test crew member role validation"""
     self._authenticate_user(self.admin_user)
@@ -1,10 +1,16 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CrewMemberViewSet
+from drf_case.aio import async_read_urls
+from .views import CrewMemberViewSet, async_crew_list
 
 router = DefaultRouter()
 router.register(r'crew', CrewMemberViewSet)
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+  router_urls = async_read_urls(router_urls, {'crewmember-list': async_crew_list})
+
 urlpatterns = [
-  path('', include(router.urls)),
+  path('', include(router_urls)),
 ]
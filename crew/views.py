@@ -3,27 +3,51 @@ from rest_framework.permissions import IsAuthenticated
 from .models import CrewMember
 from .serializers import CrewMemberSerializer
 from .filters import CrewMemberFilter
-from rest_framework.pagination import PageNumberPagination
+from .cache import CREW_NAMESPACE
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from drf_case.pagination import CachedCountPagination, KeysetPagination, KeysetPaginationMixin
+from drf_case.aio import aconditional, finalize, render
+from drf_case.conditional import ConditionalGetMixin
+from drf_case.serializers import ValuesListMixin
+from drf_case.sparse import SparseFieldsetMixin
+from flights.serializers import FlightSerializer
+from flights.cache import FLIGHTS_NAMESPACE
 
 
-class CrewMemberPagination(PageNumberPagination):
+class CrewMemberPagination(CachedCountPagination):
   """Ekipler için özel sayfalama sınıfı"""
+  count_cache_namespace = CREW_NAMESPACE
   page_size = 10
   page_size_query_param = 'page_size'
   max_page_size = 100
   page_query_param = 'page'
 
 
-class CrewMemberViewSet(viewsets.ModelViewSet):
+class CrewMemberKeysetPagination(KeysetPagination):
+  """Derin sayfalar için ekip keyset sayfalaması (?pagination=keyset)"""
+  ordering = ('name', 'id')
+
+
+class CrewMemberViewSet(ConditionalGetMixin, ValuesListMixin, SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
   queryset = CrewMember.objects.all()
   serializer_class = CrewMemberSerializer
   filter_backends = (DjangoFilterBackend, OrderingFilter, SearchFilter)
   filterset_class = CrewMemberFilter
   pagination_class = CrewMemberPagination
+  keyset_pagination_class = CrewMemberKeysetPagination
+  # ?fields=name,role,flight.flight_number,flight.gate (uçuş alanları select_related ile)
+  sparse_relations = {'flight': ('assigned_flight', FlightSerializer)}
+  sparse_required_fields = ('name',)
+  conditional_namespaces = (CREW_NAMESPACE,)
   search_fields = ('name', 'role')
   permission_classes = [IsAuthenticated]
+
+  def get_conditional_namespaces(self):
+    # flight.<alan> istenen yanıtlar uçuş yazmalarında da değişir
+    if self.sparse_fields is not None and self.sparse_fields[1]:
+      return (CREW_NAMESPACE, FLIGHTS_NAMESPACE)
+    return self.conditional_namespaces
   
   def get_permissions(self):
     """Define permissions based on action"""
@@ -35,3 +59,25 @@ class CrewMemberViewSet(viewsets.ModelViewSet):
       permission_classes = [IsAuthenticated]
     
     return [permission() for permission in permission_classes]
+
+
+async def async_crew_list(view):
+  """
+  Sayfa numaralı ekip listesini async ORM ile döndürür (ASGI okuma yolu).
+  Filtre, arama, sıralama, ?fields= ve keyset istekleri senkron yolda.
+  """
+  if set(view.request.query_params) - {'page', 'page_size'}:
+    return None
+  values_serializer = view.get_values_serializer()
+  if values_serializer is None:
+    return None
+  state, validators, not_modified = await aconditional(view)
+  if state is None:
+    return None
+  if not_modified is not None:
+    return finalize(view, not_modified, validators)
+
+  paginator = view.paginator
+  page = await paginator.apaginate_queryset(values_serializer.values(view.get_queryset()), view.request, view)
+  data = values_serializer.serialize(page)
+  return finalize(view, render(view, paginator.get_paginated_response(data).data), validators)
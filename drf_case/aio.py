@@ -0,0 +1,152 @@
+"""
+ASGI altında okuma uç noktaları için async yol.
+
+Senkron DRF view'ları ASGI altında sync_to_async ile tek bir thread'de sırayla
+çalışır; yavaş bir DB/Redis çağrısı süreçteki tüm istekleri bekletir. Sık
+okunan yollar (cache'teki liste yanıtı, tek kayıt, ekip sayfası) burada event
+loop'tan çıkmadan yanıtlanır: Redis'e redis.asyncio ile, veritabanına
+Django'nun async ORM'i ile gidilir.
+
+Async yolun kapsamadığı her durumda (cache miss, desteklenmeyen parametre,
+geçersiz token, hata yanıtları, yazma istekleri) istek olduğu gibi senkron
+view'a devredilir; davranış ve hata biçimleri tek yerde kalır.
+"""
+import functools
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.urls import re_path
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from rest_framework.exceptions import APIException
+from drf_case.cache import aget_namespace_state
+from drf_case.conditional import apply_validators, compute_validators
+from users.authentication import CachedJWTAuthentication
+from users.claims import check_role_version
+
+_jwt = CachedJWTAuthentication()
+
+
+async def aauthenticate(request):
+  """JWT kimlik doğrulamasının async karşılığı; doğrulanamayan istek için None"""
+  try:
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+      return None
+    return await _jwt.aget_user(_jwt.get_validated_token(raw_token))
+  except APIException:
+    return None
+
+
+async def aauthenticate_token(raw_token):
+  """
+  Ham access token'ı doğrular ve kullanıcıyı snapshot cache'ten yükler: pasif
+  kullanıcı ve eski `rv`'li token da reddedilir. Geçersizse APIException.
+  """
+  token = _jwt.get_validated_token(raw_token)
+  user = await _jwt.aget_user(token)
+  check_role_version(token, user)
+  return user
+
+
+async def aiter_chunks(iterable, size):
+  """
+  Senkron bir akışı (ör. export satırları) `size`'lık parçalar halinde
+  thread'de okuyup async olarak verir. StreamingHttpResponse'a senkron
+  iterator verilirse ASGI altında gövdenin tamamı önce belleğe toplanır.
+  """
+  iterator = iter(iterable)
+  next_chunk = sync_to_async(lambda: ''.join(islice(iterator, size)))
+  while chunk := await next_chunk():
+    yield chunk
+
+
+def bind_viewset(sync_view, request, kwargs):
+  """
+  Router'ın ürettiği view'dan ViewSet örneği kurar (as_view'ın yaptığı gibi);
+  async yol sayfalama, içerik anlaşması, ?expand=/?fields= gibi IO yapmayan
+  yardımcıları senkron yol ile ortak kullanır.
+  """
+  view = sync_view.cls(**sync_view.initkwargs)
+  view.action_map = sync_view.actions
+  for method, action in sync_view.actions.items():
+    setattr(view, method, getattr(view, action))
+  view.args, view.kwargs = (), kwargs
+  view.request = view.initialize_request(request, **kwargs)
+  view.format_kwarg = None
+  view.headers = view.default_response_headers
+  view.request.accepted_renderer, view.request.accepted_media_type = view.perform_content_negotiation(view.request)
+  return view
+
+
+async def aconditional(view):
+  """
+  (namespace durumu, validators, 304 yanıtı ya da None) döndürür; namespace
+  sayaçları yoksa (None, None, None).
+  """
+  state = await aget_namespace_state(sorted(view.get_conditional_namespaces()))
+  if state is None:
+    return None, None, None
+  request = view.request
+  validators = compute_validators(request.get_full_path(), request.accepted_renderer.format, state)
+  etag, last_modified = validators
+  return state, validators, get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def render(view, data):
+  """Veriyi DRF Response ile aynı gövde ve Content-Type ile yanıta çevirir"""
+  request = view.request
+  renderer = request.accepted_renderer
+  body = renderer.render(data, request.accepted_media_type, view.get_renderer_context())
+  content_type = renderer.media_type if renderer.charset is None else f'{renderer.media_type}; charset={renderer.charset}'
+  return HttpResponse(body, content_type=content_type)
+
+
+def finalize(view, response, validators=None):
+  """APIView.finalize_response'un eklediği başlıklar (Allow, Vary) ve ETag"""
+  headers = dict(view.headers)
+  vary = headers.pop('Vary', None)
+  if vary is not None:
+    patch_vary_headers(response, [value.strip() for value in vary.split(',')])
+  for key, value in headers.items():
+    response[key] = value
+  if validators is not None:
+    apply_validators(response, validators)
+  return response
+
+
+def async_read_view(sync_view, handler):
+  """
+  GET/HEAD isteklerini önce `await handler(viewset)` ile yanıtlamayı dener.
+  Handler None dönerse ya da APIException yükselirse istek senkron view'a
+  devredilir; hata yanıtları böylece her zaman DRF tarafından üretilir.
+  """
+  delegate = sync_to_async(sync_view)
+
+  @functools.wraps(sync_view)
+  async def view(request, *args, **kwargs):
+    if request.method in ('GET', 'HEAD') and await aauthenticate(request) is not None:
+      try:
+        response = await handler(bind_viewset(sync_view, request, kwargs))
+      except APIException:
+        response = None
+      if response is not None:
+        return response
+    return await delegate(request, *args, **kwargs)
+
+  return view
+
+
+def async_read_urls(urls, handlers):
+  """
+  Router URL listesinde adı `handlers`'da olan kalıpları async okuma yoluyla
+  sarar; sıra korunur (ör. flights/export/ detay kalıbının önünde kalır).
+  """
+  patterns = []
+  for pattern in urls:
+    handler = handlers.get(pattern.name)
+    # ?format= son ekli kalıplar senkron yolda kalır
+    if handler is not None and 'format' not in pattern.pattern.regex.groupindex:
+      pattern = re_path(str(pattern.pattern), async_read_view(pattern.callback, handler), name=pattern.name)
+    patterns.append(pattern)
+  return patterns
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'drf_case.settings')
+# Okuma uç noktalarının async yolu (drf_case.aio). Kalıcı DB bağlantıları
+# thread başına tutulduğu için ASGI altında kapatılır.
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
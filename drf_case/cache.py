@@ -0,0 +1,260 @@
+"""
+Namespace bazlı, sürümlü cache yardımcıları.
+
+Her namespace (ör. 'flights') için Redis'te kalıcı bir sürüm sayacı tutulur.
+Namespace'e ait tüm anahtarlar bu sürümle yazılır/okunur (Django cache'in
+`version` parametresi). Yazma işlemleri sadece sayacı artırır; eski sürüme
+ait anahtarlar erişilemez hale gelir ve kendi TTL'leri ile düşer. Böylece
+paylaşılan Redis DB'sinde `cache.clear()` çağırmaya gerek kalmaz.
+"""
+import asyncio
+import gzip
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+VERSION_KEY = 'ns:{namespace}:version'
+MODIFIED_KEY = 'ns:{namespace}:modified'
+LOCK_KEY = 'lock:{key}'
+STALE_KEY = 'stale:{key}'
+
+# Bu boyutun üzerindeki gövdeler cache'e gzip'li yazılır (byte)
+GZIP_MIN_SIZE = 1024
+
+# django.middleware.gzip.GZipMiddleware ile aynı kontrol
+ACCEPTS_GZIP_RE = re.compile(r'\bgzip\b')
+
+
+def _initial_version():
+  # Sayaç Redis'ten düşerse (eviction/restart) eski anahtarlarla çakışmasın
+  # diye başlangıç değeri olarak milisaniye cinsinden zaman kullanılır.
+  return int(time.time() * 1000)
+
+
+def get_namespace_version(namespace):
+  """Namespace'in güncel sürümünü döndürür, yoksa oluşturur."""
+  key = VERSION_KEY.format(namespace=namespace)
+  version = cache.get(key)
+  if version is None:
+    cache.add(key, _initial_version(), timeout=None)
+    version = cache.get(key)
+  return version
+
+
+def get_namespace_modified(namespace):
+  """Namespace'in son değiştiği an (Unix zamanı, saniye), yoksa şimdi."""
+  key = MODIFIED_KEY.format(namespace=namespace)
+  modified = cache.get(key)
+  if modified is None:
+    cache.add(key, int(time.time()), timeout=None)
+    modified = cache.get(key)
+  return modified
+
+
+def bump_namespace_version(namespace):
+  """Namespace'i O(1) olarak geçersiz kılar (sayacı artırır)."""
+  key = VERSION_KEY.format(namespace=namespace)
+  # Last-Modified başlığı için değişiklik zamanı da sayaçla birlikte tutulur
+  cache.set(MODIFIED_KEY.format(namespace=namespace), int(time.time()), timeout=None)
+  try:
+    return cache.incr(key)
+  except ValueError:
+    # Anahtar yok: yeni bir başlangıç değeri yazmak eski anahtarları zaten
+    # geçersiz kılar.
+    if cache.add(key, _initial_version(), timeout=None):
+      return cache.get(key)
+    return cache.incr(key)
+
+
+_batch = threading.local()
+
+
+def invalidate_namespace(namespace):
+  """
+  Namespace'i geçersiz kılar. `batched_invalidation()` bloğu içindeyse artış
+  blok sonuna ertelenir; böylece toplu yazmalar sayacı bir kez artırır.
+
+  Açık bir transaction içinde çağrılırsa sayaç commit'ten sonra bir kez daha
+  artırılır: artış ile commit arasında gelen okumalar eski satırları yeni
+  sürümle cache'e yazabilir.
+  """
+  pending = getattr(_batch, 'pending', None)
+  if pending is not None:
+    pending.add(namespace)
+    return
+  bump_namespace_version(namespace)
+  if transaction.get_connection().in_atomic_block:
+    transaction.on_commit(lambda: bump_namespace_version(namespace))
+
+
+@contextmanager
+def batched_invalidation():
+  """Blok içindeki tüm geçersiz kılmaları namespace başına teke indirir."""
+  if getattr(_batch, 'pending', None) is not None:
+    # İç içe bloklarda artışı en dıştaki blok yapar
+    yield
+    return
+  _batch.pending = set()
+  try:
+    yield
+  finally:
+    pending, _batch.pending = _batch.pending, None
+    for namespace in pending:
+      bump_namespace_version(namespace)
+
+
+def get_versioned(namespace, key, default=None):
+  return cache.get(key, default, version=get_namespace_version(namespace))
+
+
+def set_versioned(namespace, key, value, timeout):
+  cache.set(key, value, timeout=timeout, version=get_namespace_version(namespace))
+
+
+def _build_and_store(key, build, soft_timeout, hard_timeout, version):
+  value = build()
+  envelope = {'value': value, 'soft_expires': time.time() + soft_timeout}
+  cache.set(key, envelope, timeout=hard_timeout, version=version)
+  # Sürümden bağımsız son geçerli kopya: sürüm artışından sonra kilidi
+  # alamayan istekler yeniden hesaplama bitene kadar bunu kullanır.
+  cache.set(STALE_KEY.format(key=key), value, timeout=hard_timeout)
+  return value
+
+
+def fetch_versioned(namespace, key, build, soft_timeout, hard_timeout, lock_timeout=10, wait_timeout=2):
+  """
+  Stampede korumalı cache okuması (single-flight + stale-while-revalidate).
+
+  - Kayıt soft TTL içindeyse doğrudan döner.
+  - Soft TTL geçmişse kilidi alan tek istek `build()` ile yeniler, diğerleri
+    eski değeri almaya devam eder. Hard TTL dolmadan kayıt tazelenmiş olur.
+  - Kayıt hiç yoksa (hard TTL dolmuş veya namespace sürümü artmış) kilidi
+    alamayan istekler son geçerli kopyayı alır; o da yoksa kısa bir süre
+    yeni kaydı bekler, gelmezse kendisi hesaplar.
+  """
+  version = get_namespace_version(namespace)
+  envelope = cache.get(key, version=version)
+  if envelope is not None and time.time() < envelope['soft_expires']:
+    return envelope['value']
+
+  lock_key = LOCK_KEY.format(key=key)
+  if cache.add(lock_key, 1, timeout=lock_timeout, version=version):
+    try:
+      return _build_and_store(key, build, soft_timeout, hard_timeout, version)
+    finally:
+      cache.delete(lock_key, version=version)
+
+  if envelope is not None:
+    return envelope['value']
+
+  stale = cache.get(STALE_KEY.format(key=key))
+  if stale is not None:
+    return stale
+
+  deadline = time.time() + wait_timeout
+  while time.time() < deadline:
+    time.sleep(0.05)
+    envelope = cache.get(key, version=version)
+    if envelope is not None:
+      return envelope['value']
+  return build()
+
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis():
+  """Çalışan event loop'a ait redis.asyncio istemcisi (cache ile aynı DB)"""
+  loop = asyncio.get_running_loop()
+  client = _clients.get(loop)
+  if client is None:
+    client = aioredis.from_url(settings.CACHES['default']['LOCATION'])
+    _clients[loop] = client
+  return client
+
+
+# Async karşılıklar (ASGI okuma yolu, drf_case.aio). Anahtarlar ve değerler
+# django_redis ile aynı biçimde kodlanır; iki yol aynı kayıtları okuyup yazar.
+
+async def aget(key, version=None):
+  raw = await get_async_redis().get(cache.make_key(key, version=version))
+  return None if raw is None else cache.client.decode(raw)
+
+
+async def aset(key, value, timeout, version=None):
+  await get_async_redis().set(cache.make_key(key, version=version), cache.client.encode(value), ex=timeout)
+
+
+async def aget_namespace_version(namespace):
+  version = await aget(VERSION_KEY.format(namespace=namespace))
+  if version is None:
+    # Sayaç yoksa oluşturma senkron yoldaki tek yerde kalır
+    version = await sync_to_async(get_namespace_version)(namespace)
+  return version
+
+
+async def aget_versioned(namespace, key, default=None):
+  value = await aget(key, version=await aget_namespace_version(namespace))
+  return default if value is None else value
+
+
+async def aset_versioned(namespace, key, value, timeout):
+  await aset(key, value, timeout, version=await aget_namespace_version(namespace))
+
+
+async def aget_namespace_state(namespaces):
+  """
+  {namespace: (sürüm, son değişiklik)} tek MGET ile okunur. Sayaçlardan biri
+  yoksa None döner (çağıran senkron yola düşer).
+  """
+  keys = []
+  for namespace in namespaces:
+    keys += [VERSION_KEY.format(namespace=namespace), MODIFIED_KEY.format(namespace=namespace)]
+  raw = await get_async_redis().mget([cache.make_key(key) for key in keys])
+  if any(value is None for value in raw):
+    return None
+  values = [cache.client.decode(value) for value in raw]
+  return {namespace: (values[2 * i], values[2 * i + 1]) for i, namespace in enumerate(namespaces)}
+
+
+async def afetch_fresh(key, version):
+  """fetch_versioned kaydı soft TTL içindeyse değerini, değilse None döndürür"""
+  envelope = await aget(key, version=version)
+  if envelope is None or time.time() >= envelope['soft_expires']:
+    return None
+  return envelope['value']
+
+
+def render_json_body(data):
+  """
+  Yanıtı cache'e yazmadan önce bir kez JSON'a çevirir (ve büyükse sıkıştırır).
+  Cache hit'lerinde unpickle + JSONRenderer maliyeti tamamen ortadan kalkar.
+  """
+  body = JSONRenderer().render(data)
+  if len(body) >= GZIP_MIN_SIZE:
+    return {'body': gzip.compress(body), 'gzip': True}
+  return {'body': body, 'gzip': False}
+
+
+def prerendered_response(request, rendered):
+  """render_json_body çıktısını olduğu gibi gönderir."""
+  body = rendered['body']
+  response = HttpResponse(content_type='application/json')
+  if rendered['gzip']:
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if ACCEPTS_GZIP_RE.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+      response['Content-Encoding'] = 'gzip'
+    else:
+      body = gzip.decompress(body)
+  response.content = body
+  return response
@@ -0,0 +1,84 @@
+"""
+Namespace sürümlerinden üretilen HTTP koşullu istek desteği.
+
+ETag, isteğin tam yolu, seçilen format ve yanıtın bağlı olduğu namespace
+sürümlerinden hesaplanır; Last-Modified namespace'lerin son değişiklik
+zamanıdır. İkisi de Redis'ten okunur, DB'ye gidilmez. İstemcinin elindeki
+sürüm hâlâ geçerliyse view hiç çalışmadan 304 Not Modified döner.
+
+Last-Modified saniye çözünürlüklüdür: değişikliğin olduğu saniye bitmeden
+verilen başlık, aynı saniyedeki sonraki bir yazmayı ayırt edemez ve
+If-Modified-Since ile yanlış 304'e yol açar. Bu yüzden o saniye dolana kadar
+başlık gönderilmez; istemci sadece ETag ile doğrular.
+"""
+import hashlib
+import time
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from drf_case.cache import get_namespace_modified, get_namespace_version
+
+
+class _ConditionalResponse(Exception):
+  def __init__(self, response):
+    self.response = response
+
+
+def compute_validators(full_path, fmt, state):
+  """
+  (etag, last_modified) döndürür.
+  `state`: {namespace: (sürüm, son değişiklik zamanı)}
+  """
+  versions = ','.join(f'{ns}:{state[ns][0]}' for ns in sorted(state))
+  digest = hashlib.sha1(f'{full_path}|{fmt}|{versions}'.encode('utf-8')).hexdigest()
+  # Gövde gzip'li ya da düz gönderilebildiği için zayıf ETag kullanılır
+  return f'W/"{digest}"', max(modified for _, modified in state.values())
+
+
+def apply_validators(response, validators):
+  etag, last_modified = validators
+  response['ETag'] = etag
+  if last_modified < int(time.time()):
+    response['Last-Modified'] = http_date(last_modified)
+  return response
+
+
+class ConditionalGetMixin:
+  """list/retrieve isteklerinde ETag/Last-Modified ve 304 desteği"""
+  # Yanıtın içeriğini belirleyen namespace'ler; yazmalar sürümlerini artırır
+  conditional_namespaces = ()
+  conditional_actions = ('list', 'retrieve')
+
+  def get_conditional_namespaces(self):
+    return self.conditional_namespaces
+
+  def get_validators(self, request):
+    """(etag, last_modified) döndürür"""
+    state = {
+      ns: (get_namespace_version(ns), get_namespace_modified(ns))
+      for ns in self.get_conditional_namespaces()
+    }
+    fmt = getattr(request.accepted_renderer, 'format', '')
+    return compute_validators(request.get_full_path(), fmt, state)
+
+  def initial(self, request, *args, **kwargs):
+    super().initial(request, *args, **kwargs)
+    self._validators = None
+    if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+      return
+    self._validators = self.get_validators(request)
+    etag, last_modified = self._validators
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+      raise _ConditionalResponse(response)
+
+  def handle_exception(self, exc):
+    if isinstance(exc, _ConditionalResponse):
+      return exc.response
+    return super().handle_exception(exc)
+
+  def finalize_response(self, request, response, *args, **kwargs):
+    response = super().finalize_response(request, response, *args, **kwargs)
+    validators = getattr(self, '_validators', None)
+    if validators is not None and response.status_code in (200, 304):
+      apply_validators(response, validators)
+    return response
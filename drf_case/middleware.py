@@ -1,19 +1,34 @@
 import time
 import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 logger = logging.getLogger(__name__)
 
 class RequestLoggingMiddleware:
+  # ASGI altında async view'lar thread'e geçmeden çalışsın diye iki modu da destekler
+  sync_capable = True
+  async_capable = True
+
   def __init__(self, get_response):
     self.get_response = get_response
+    if iscoroutinefunction(self.get_response):
+      markcoroutinefunction(self)
 
   def __call__(self, request):
+    if iscoroutinefunction(self):
+      return self.__acall__(request)
     start_time = time.time()
-    ip = request.META.get('REMOTE_ADDR')
-
     response = self.get_response(request)
+    self._log(request, start_time)
+    return response
+
+  async def __acall__(self, request):
+    start_time = time.time()
+    response = await self.get_response(request)
+    self._log(request, start_time)
+    return response
 
+  def _log(self, request, start_time):
+    ip = request.META.get('REMOTE_ADDR')
     duration = time.time() - start_time
     logger.info(f"📡 {request.method} {request.path} from {ip} took {duration:.2f}s")
-
-    return response
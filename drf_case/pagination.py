@@ -0,0 +1,286 @@
+"""
+Ortak sayfalama sınıfları.
+
+KeysetPagination, (sıralama alanı, id) çiftinden üretilen opak bir cursor ile
+bir sonraki sayfayı `WHERE (alan, id) > (son değer, son id)` koşuluyla çeker.
+COUNT(*) ve OFFSET kullanılmadığı için derin sayfalar ilk sayfa kadar ucuzdur.
+
+CachedCountPagination, sayfa numaralı sayfalamadaki COUNT(*) sonucunu filtre
+imzasına göre sürümlü cache'te tutar; filtresiz büyük tablolarda PostgreSQL
+planlayıcı tahminini (pg_class.reltuples) kullanır.
+"""
+import base64
+import hashlib
+import json
+from asgiref.sync import sync_to_async
+from django.core.exceptions import EmptyResultSet, ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from drf_case.cache import aget_versioned, aset_versioned, get_versioned, set_versioned
+
+
+def _parse_ordering(field):
+  return (field[1:], True) if field.startswith('-') else (field, False)
+
+
+def _to_json(value):
+  # Tarih/saat değerleri cursor'da ISO 8601 olarak taşınır; çözülürken
+  # modeldeki alanın to_python'u ile tekrar Python tipine çevrilir
+  return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+class KeysetPagination(BasePagination):
+  """Opak cursor'lu keyset sayfalama (?pagination=keyset)"""
+  page_size = 10
+  page_size_query_param = 'page_size'
+  max_page_size = 100
+  cursor_query_param = 'cursor'
+  mode_query_param = 'pagination'
+  mode_query_value = 'keyset'
+  invalid_cursor_message = 'Invalid cursor'
+
+  # (sıralama alanı, benzersiz eşitlik bozucu alan), ör. ('-scheduled_time', 'id')
+  ordering = None
+
+  @classmethod
+  def is_requested(cls, request):
+    params = request.query_params
+    return params.get(cls.mode_query_param) == cls.mode_query_value or bool(params.get(cls.cursor_query_param))
+
+  def get_page_size(self, request):
+    try:
+      size = int(request.query_params[self.page_size_query_param])
+    except (KeyError, ValueError):
+      return self.page_size
+    if size <= 0:
+      return self.page_size
+    return min(size, self.max_page_size)
+
+  def paginate_queryset(self, queryset, request, view=None):
+    self.request = request
+    self.page_size = self.get_page_size(request)
+    self.model = queryset.model
+
+    queryset = queryset.order_by(*self.ordering)
+    position = self.decode_cursor(request)
+    if position is not None:
+      queryset = queryset.filter(self._after(position))
+
+    # Bir fazla satır çekmek sonraki sayfanın varlığını COUNT'suz söyler
+    rows = list(queryset[:self.page_size + 1])
+    self.has_next = len(rows) > self.page_size
+    self.page = rows[:self.page_size]
+    return self.page
+
+  def _after(self, position):
+    (field, field_desc), (tiebreak, tiebreak_desc) = map(_parse_ordering, self.ordering)
+    value, last = position
+    # İlk koşul gereksiz görünse de index taramasının cursor'dan başlamasını
+    # sağlar; OR tek başına kullanılırsa index baştan süzülür.
+    return Q(**{f"{field}__{'lte' if field_desc else 'gte'}": value}) & (
+      Q(**{f"{field}__{'lt' if field_desc else 'gt'}": value}) |
+      Q(**{field: value, f"{tiebreak}__{'lt' if tiebreak_desc else 'gt'}": last})
+    )
+
+  def _position(self, row):
+    # Satırlar model nesnesi ya da .values() sözlüğü olabilir
+    names = [_parse_ordering(name)[0] for name in self.ordering]
+    if isinstance(row, dict):
+      return tuple(row[name] for name in names)
+    return tuple(getattr(row, name) for name in names)
+
+  def encode_cursor(self, position):
+    payload = json.dumps([_to_json(value) for value in position])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+  def decode_cursor(self, request):
+    encoded = request.query_params.get(self.cursor_query_param)
+    if not encoded:
+      return None
+    try:
+      raw = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+      if not isinstance(raw, list) or len(raw) != len(self.ordering):
+        raise ValueError(raw)
+      return tuple(
+        self.model._meta.get_field(_parse_ordering(name)[0]).to_python(value)
+        for name, value in zip(self.ordering, raw)
+      )
+    except (TypeError, ValueError, UnicodeError, DjangoValidationError):
+      raise NotFound(self.invalid_cursor_message)
+
+  def get_next_link(self):
+    if not self.has_next:
+      return None
+    url = self.request.build_absolute_uri()
+    url = replace_query_param(url, self.mode_query_param, self.mode_query_value)
+    return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self._position(self.page[-1])))
+
+  def get_paginated_response(self, data):
+    return Response({
+      'next': self.get_next_link(),
+      'results': data,
+    })
+
+  def get_paginated_response_schema(self, schema):
+    return {
+      'type': 'object',
+      'required': ['results'],
+      'properties': {
+        'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+        'results': schema,
+      },
+    }
+
+
+class KeysetPaginationMixin:
+  """
+  ViewSet'lerde keyset sayfalamayı isteğe bağlı açar; parametre verilmezse
+  `pagination_class` olduğu gibi kullanılır.
+  """
+  keyset_pagination_class = None
+
+  @property
+  def paginator(self):
+    if (not hasattr(self, '_paginator') and self.keyset_pagination_class is not None
+        and self.keyset_pagination_class.is_requested(self.request)):
+      self._paginator = self.keyset_pagination_class()
+    return super().paginator
+
+
+class CachedCountPaginator(DjangoPaginator):
+  """COUNT(*) sonucunu cache'ten okuyan/tahmin eden Django paginator'ı"""
+
+  def __init__(self, object_list, per_page, namespace, timeout, estimate_threshold, **kwargs):
+    super().__init__(object_list, per_page, **kwargs)
+    self.namespace = namespace
+    self.timeout = timeout
+    self.estimate_threshold = estimate_threshold
+    self.count_exact = True
+
+  @cached_property
+  def count(self):
+    queryset = self.object_list
+    if not queryset.query.where:
+      estimate = self._estimate_count(queryset)
+      if estimate is not None and estimate >= self.estimate_threshold:
+        self.count_exact = False
+        return estimate
+
+    try:
+      key = self._count_key(queryset)
+    except EmptyResultSet:
+      return 0
+    count = get_versioned(self.namespace, key)
+    if count is None:
+      count = super().count
+      set_versioned(self.namespace, key, count, timeout=self.timeout)
+    return count
+
+  async def acount(self):
+    """
+    `count`'un async karşılığı (ASGI okuma yolu); sonuç `count` özelliğine
+    yazılır, sayfa hesapları sonrasında senkron çalışır.
+    """
+    queryset = self.object_list
+    count = None
+    if not queryset.query.where and connections[queryset.db].vendor == 'postgresql':
+      estimate = await sync_to_async(self._estimate_count)(queryset)
+      if estimate is not None and estimate >= self.estimate_threshold:
+        self.count_exact = False
+        count = estimate
+    if count is None:
+      try:
+        key = self._count_key(queryset)
+      except EmptyResultSet:
+        key, count = None, 0
+      if key is not None:
+        count = await aget_versioned(self.namespace, key)
+        if count is None:
+          count = await queryset.acount()
+          await aset_versioned(self.namespace, key, count, timeout=self.timeout)
+    self.__dict__['count'] = count
+    return count
+
+  def _count_key(self, queryset):
+    # Sıralama sayıyı etkilemez; aynı filtreler aynı anahtarı üretir. str(query)
+    # parametreleri tırnaksız gömer (farklı değerler aynı metni verebilir),
+    # bu yüzden SQL ve parametreler ayrı ayrı özetlenir.
+    sql, params = queryset.order_by().query.get_compiler(using=queryset.db).as_sql()
+    digest = hashlib.sha1(f'{sql}\0{params!r}'.encode('utf-8')).hexdigest()
+    return f"count:{queryset.model._meta.label_lower}:{digest}"
+
+  def _estimate_count(self, queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+      return None
+    with connection.cursor() as cursor:
+      cursor.execute(
+        "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+        [queryset.model._meta.db_table],
+      )
+      row = cursor.fetchone()
+    # Hiç ANALYZE edilmemiş tablolarda reltuples -1 (veya 0) döner
+    if not row or row[0] is None or row[0] < 0:
+      return None
+    return row[0]
+
+
+class CachedCountPagination(PageNumberPagination):
+  """
+  Sayfa numaralı sayfalama; toplam sayı filtre imzasına göre cache'lenir ve
+  yanıttaki `count_exact` alanı sayının kesin olup olmadığını belirtir.
+  """
+  # Sayı cache'inin bağlı olduğu namespace (yazmalarda sürümü artırılır)
+  count_cache_namespace = None
+  count_cache_timeout = 300
+  # Filtresiz sorgularda tahmin bu satır sayısının üzerindeyse kullanılır
+  estimate_count_threshold = 100000
+
+  def django_paginator_class(self, object_list, per_page):
+    return CachedCountPaginator(
+      object_list,
+      per_page,
+      namespace=self.count_cache_namespace,
+      timeout=self.count_cache_timeout,
+      estimate_threshold=self.estimate_count_threshold,
+    )
+
+  async def apaginate_queryset(self, queryset, request, view=None):
+    """
+    paginate_queryset'in async karşılığı: sayı ve sayfa satırları async ORM
+    ile okunur. Geçersiz sayfada NotFound yükselir.
+    """
+    self.request = request
+    page_size = self.get_page_size(request)
+    if not page_size:
+      return None
+    paginator = self.django_paginator_class(queryset, page_size)
+    await paginator.acount()
+    try:
+      self.page = paginator.page(self.get_page_number(request, paginator))
+    except InvalidPage:
+      raise NotFound()
+    self.page.object_list = [row async for row in self.page.object_list]
+    if paginator.num_pages > 1 and self.template is not None:
+      self.display_page_controls = True
+    return self.page.object_list
+
+  def get_paginated_response(self, data):
+    return Response({
+      'count': self.page.paginator.count,
+      'count_exact': self.page.paginator.count_exact,
+      'next': self.get_next_link(),
+      'previous': self.get_previous_link(),
+      'results': data,
+    })
+
+  def get_paginated_response_schema(self, schema):
+    response_schema = super().get_paginated_response_schema(schema)
+    response_schema['properties']['count_exact'] = {'type': 'boolean', 'example': True}
+    return response_schema
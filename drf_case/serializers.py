@@ -0,0 +1,130 @@
+"""
+Liste yanıtları için derlenmiş, salt okunur serializer yolu.
+
+ModelSerializer her satır için alanları bağlar, `get_attribute` ile değerleri
+model nesnesinden okur ve alan başına `to_representation` çağırır. Bu modül
+aynı çıktıyı `.values()` satırlarından, serializer başına bir kez hesaplanan
+dönüştürücülerle üretir. Desteklenmeyen alan içeren serializer'lar (iç içe
+serializer, method alanı vb.) için derleme None döner ve normal yola düşülür.
+"""
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Değeri olduğu gibi döndüren alanlar (model kolonunun Python tipi zaten doğru)
+IDENTITY_FIELDS = (
+  serializers.CharField,
+  serializers.IntegerField,
+  serializers.BooleanField,
+  serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer:
+  """Derlenmiş okuma planı: (çıktı adı, kolon, dönüştürücü) listesi"""
+
+  def __init__(self, plan):
+    self.plan = plan
+    self.columns = tuple(column for _, column, _ in plan)
+
+  def values(self, queryset, extra_columns=()):
+    columns = self.columns + tuple(c for c in extra_columns if c not in self.columns)
+    return queryset.values(*columns)
+
+  def serialize(self, rows):
+    return list(self.iter_serialize(rows))
+
+  def iter_serialize(self, rows):
+    """Satırları tek tek dönüştürür; akış (streaming) yanıtlarında bellek sabit kalır"""
+    plan = self.plan
+    for row in rows:
+      item = {}
+      for name, column, convert in plan:
+        value = row[column]
+        # DRF de None değerleri alanın to_representation'ına göndermez
+        item[name] = value if convert is None or value is None else convert(value)
+      yield item
+
+
+def _converter(field):
+  if type(field) in IDENTITY_FIELDS:
+    return None
+  if type(field) is serializers.ChoiceField:
+    choices = field.choice_strings_to_values
+    return lambda value: value if value == '' else choices.get(str(value), value)
+  return field.to_representation
+
+
+@lru_cache(maxsize=256)
+def compile_values_serializer(serializer_class):
+  """
+  ModelSerializer sınıfını ValuesSerializer'a derler; sadece model
+  kolonlarını okuyan alanlardan oluşan serializer'lar desteklenir.
+  """
+  meta = getattr(serializer_class, 'Meta', None)
+  if meta is None or not issubclass(serializer_class, serializers.ModelSerializer):
+    return None
+  model = meta.model
+
+  plan = []
+  for name, field in serializer_class().fields.items():
+    if field.write_only:
+      continue
+    if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+      return None
+    if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+      return None
+    if getattr(field, 'pk_field', None) is not None:
+      return None
+    try:
+      model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+      return None
+    if not model_field.concrete:
+      return None
+    plan.append((name, model_field.name, _converter(field)))
+  return ValuesSerializer(tuple(plan))
+
+
+class ValuesListMixin:
+  """
+  list() yanıtlarını derlenmiş `.values()` yolu ile üretir. Serializer
+  derlenemiyorsa (ör. ?expand=crew) standart DRF yolu kullanılır.
+  """
+
+  def get_values_serializer(self):
+    return compile_values_serializer(type(self.get_serializer()))
+
+  def serialize_queryset(self, queryset):
+    """Sayfalanmamış queryset'i liste verisine çevirir"""
+    values_serializer = self.get_values_serializer()
+    if values_serializer is None:
+      return self.get_serializer(queryset, many=True).data
+    return values_serializer.serialize(values_serializer.values(queryset))
+
+  def iter_representations(self, queryset, chunk_size):
+    """
+    Queryset'i sunucu taraflı cursor ile `chunk_size`'lık parçalar halinde
+    okuyup satır satır dönüştürür; bellekte tek seferde bir parça tutulur.
+    """
+    values_serializer = self.get_values_serializer()
+    if values_serializer is None:
+      serializer = self.get_serializer()
+      return (serializer.to_representation(obj) for obj in queryset.iterator(chunk_size=chunk_size))
+    return values_serializer.iter_serialize(values_serializer.values(queryset).iterator(chunk_size=chunk_size))
+
+  def list(self, request, *args, **kwargs):
+    values_serializer = self.get_values_serializer()
+    if values_serializer is None:
+      return super().list(request, *args, **kwargs)
+
+    queryset = self.filter_queryset(self.get_queryset())
+    # Keyset cursor'ı satırdaki sıralama alanlarını okur
+    ordering = getattr(self.paginator, 'ordering', None) or ()
+    queryset = values_serializer.values(queryset, [name.lstrip('-') for name in ordering])
+
+    page = self.paginate_queryset(queryset)
+    if page is not None:
+      return self.get_paginated_response(values_serializer.serialize(page))
+    return Response(values_serializer.serialize(queryset))
@@ -79,6 +79,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'drf_case.wsgi.application'
+ASGI_APPLICATION = 'drf_case.asgi.application'
+
+# Okuma uç noktaları önce async yoldan denenir (drf_case.aio); ASGI giriş
+# noktası (drf_case.asgi) bu bayrağı varsayılan olarak açar.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
 
 
 # Database
@@ -88,7 +93,8 @@ WSGI_APPLICATION = 'drf_case.wsgi.application'
 DATABASES = {
   'default': dj_database_url.config(
     default='sqlite:///' + str(BASE_DIR / 'db.sqlite3'),
-    conn_max_age=600,
+    # ASGI altında kalıcı bağlantılar kapatılır (drf_case.asgi DB_CONN_MAX_AGE=0)
+    conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 600)),
     conn_health_checks=True,
   )
 }
@@ -113,6 +119,38 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER_PROFILE yeni parolaların hangi algoritmayla özetleneceğini
+# seçer. Diğer hasher'lar listede kalır: mevcut özetler doğrulanmaya devam eder
+# ve kullanıcı bir sonraki girişinde seçili algoritmaya yükseltilir.
+#   argon2: Argon2id, OWASP parametreleri (~50ms, argon2-cffi gerekir)
+#   pbkdf2: Django varsayılanı, 1M iterasyon (~0.3s)
+#   scrypt: ek bağımlılık gerektirmez (~0.3s)
+
+PASSWORD_HASHER_PROFILES = {
+  'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+  'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+  'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER_PROFILE = os.getenv('PASSWORD_HASHER_PROFILE', 'argon2')
+PASSWORD_HASHERS = [
+  PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE],
+  *(hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items() if profile != PASSWORD_HASHER_PROFILE),
+  'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Argon2id maliyeti (users.hashers); memory_cost KiB cinsindendir
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', 19456))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', 1))
+
+# Aynı anda parola özeti hesaplayan istek sayısı üst sınırı (tüm worker'lar
+# genelinde, users.hashing). Sınır doluysa istek en fazla WAIT saniye bekler,
+# sonra 503 + Retry-After alır; kalan worker'lar okuma isteklerine açık kalır.
+PASSWORD_HASHING_SLOTS = int(os.getenv('PASSWORD_HASHING_SLOTS', os.cpu_count() or 1))
+PASSWORD_HASHING_WAIT = float(os.getenv('PASSWORD_HASHING_WAIT', 0.5))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -159,6 +197,57 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+  'drain-delay-notifications': {
+    'task': 'notifications.tasks.drain_delay_notifications',
+    'schedule': float(os.getenv('NOTIFICATION_DRAIN_INTERVAL', 5)),
+  },
+  'relay-outbox': {
+    'task': 'notifications.tasks.relay_outbox',
+    'schedule': float(os.getenv('OUTBOX_RELAY_INTERVAL', 1)),
+  },
+  'prune-outbox': {
+    'task': 'notifications.tasks.prune_outbox',
+    'schedule': 3600.0,
+  },
+  'prune-change-log': {
+    'task': 'flights.tasks.prune_change_log',
+    'schedule': 3600.0,
+  },
+}
+
+# Gecikme bildirim hattı (notifications.pipeline)
+NOTIFICATION_BATCH_SIZE = int(os.getenv('NOTIFICATION_BATCH_SIZE', 200))
+NOTIFICATION_DEDUPE_WINDOW = int(os.getenv('NOTIFICATION_DEDUPE_WINDOW', 600))
+NOTIFICATION_MAX_BATCHES_PER_DRAIN = 50
+
+# Delta senkronizasyonu (flights.changes)
+FLIGHT_CHANGES_BATCH_SIZE = 500
+FLIGHT_CHANGES_MAX_BATCH_SIZE = 1000
+FLIGHT_CHANGES_RETENTION = int(os.getenv('FLIGHT_CHANGES_RETENTION', 3 * 24 * 3600))
+
+# Uçuş durum yayını (flights.events, SSE)
+FLIGHT_EVENTS_REDIS_URL = os.getenv('FLIGHT_EVENTS_REDIS_URL', CACHES['default']['LOCATION'])
+FLIGHT_EVENTS_CHANNEL = 'flights:events'
+# Yavaş istemci başına bekletilen en fazla mesaj
+FLIGHT_EVENTS_QUEUE_SIZE = 100
+FLIGHT_EVENTS_HEARTBEAT = 15
+
+# Kimlik doğrulama snapshot cache'i (users.authentication)
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_USER_CACHE_TIMEOUT = 3600
+
+# Toplu kullanıcı içe aktarma (users.imports). API yüklemeleri Celery
+# worker'ında işlenir (parolalar worker sürecinde özetlenir); worker sayısı
+# import_users komutunun süreç havuzu içindir, 0: komut sürecinde özetlenir
+USER_IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', 500))
+USER_IMPORT_HASH_WORKERS = int(os.getenv('USER_IMPORT_HASH_WORKERS', os.cpu_count() or 1))
+
+# Transactional outbox (notifications.outbox)
+OUTBOX_RELAY_BATCH_SIZE = int(os.getenv('OUTBOX_RELAY_BATCH_SIZE', 500))
+OUTBOX_RELAY_MAX_BATCHES = 20
+# Yayımlanmış olayların saklanma süresi (saniye)
+OUTBOX_RETENTION = int(os.getenv('OUTBOX_RETENTION', 7 * 24 * 3600))
 
 # Production için basit logging konfigürasyonu
 LOGGING_CONFIG = None
@@ -182,11 +271,17 @@ REST_FRAMEWORK = {
     'django_filters.rest_framework.DjangoFilterBackend'
   ],
   'DEFAULT_AUTHENTICATION_CLASSES': [
-    'rest_framework_simplejwt.authentication.JWTAuthentication',
+    'users.authentication.CachedJWTAuthentication',
   ],
   'DEFAULT_PERMISSION_CLASSES': [
     'rest_framework.permissions.IsAuthenticated',
   ]
 }
 
-AUTH_USER_MODEL = 'users.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'users.User'
+
+SIMPLE_JWT = {
+  # Token'lar rol claim'lerini taşır (users.claims)
+  'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.RoleTokenObtainPairSerializer',
+  'TOKEN_REFRESH_SERIALIZER': 'users.serializers.RoleTokenRefreshSerializer',
+}
\ No newline at end of file
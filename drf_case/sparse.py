@@ -0,0 +1,135 @@
+"""
+?fields= ile seyrek alan kümeleri (sparse fieldsets).
+
+İstenen alanlar için serializer'ın kırpılmış bir alt sınıfı üretilir ve sorgu
+`.only()` ile bu alanların kolonlarına indirilir. `ilişki.alan` biçimindeki
+alanlar (ör. ekip için `flight.status`) select_related ile aynı sorguda
+çekilir ve iç içe nesne olarak döner.
+"""
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer_class(serializer_class, fields, relations=()):
+  """
+  Sadece `fields` alanlarını içeren serializer alt sınıfını döndürür.
+  `relations`: ((ad, model ilişki alanı, serializer sınıfı, alanlar), ...)
+  """
+  attrs = {
+    'Meta': type('Meta', (serializer_class.Meta,), {
+      'fields': list(fields) + [relation[0] for relation in relations],
+    }),
+  }
+  # İstenmeyen tanımlı alanlar (ör. FlightWithCrewSerializer.crew) kaldırılır
+  for name in serializer_class._declared_fields:
+    if name not in fields:
+      attrs[name] = None
+  for name, source, related_class, related_fields in relations:
+    attrs[name] = sparse_serializer_class(related_class, related_fields)(source=source, read_only=True)
+  return type(f'Sparse{serializer_class.__name__}', (serializer_class,), attrs)
+
+
+def _model_columns(model, source):
+  """
+  Serializer alanının okuduğu model kolonları. Kaynağı bilinmeyen alanlar
+  (method/property) için None döner; bu durumda kolonlar kırpılmaz.
+  """
+  try:
+    field = model._meta.get_field(source)
+  except FieldDoesNotExist:
+    return None
+  # Ters ilişkiler (ör. crew) prefetch ile ayrı sorguda gelir
+  return (field.name,) if field.concrete else ()
+
+
+class SparseFieldsetMixin:
+  """
+  Okuma isteklerinde `?fields=a,b,ilişki.c` ile yanıtı ve SELECT'i istenen
+  alanlara indirir. Parametre verilmezse davranış değişmez.
+  """
+  fields_query_param = 'fields'
+  # ?fields=<ad>.<alan> ile istenebilen ilişkiler: {ad: (model ilişki alanı, serializer sınıfı)}
+  sparse_relations = {}
+  # İstenmese de yüklenen kolonlar (ör. keyset cursor'ının okuduğu alanlar)
+  sparse_required_fields = ()
+
+  @property
+  def sparse_fields(self):
+    """(alanlar, ilişkiler) ya da ?fields= verilmemişse None"""
+    if not hasattr(self, '_sparse_fields'):
+      self._sparse_fields = self._parse_sparse_fields()
+    return self._sparse_fields
+
+  def _parse_sparse_fields(self):
+    raw = self.request.query_params.get(self.fields_query_param, '')
+    requested = {value.strip() for value in raw.split(',') if value.strip()}
+    if self.request.method not in SAFE_METHODS or not requested:
+      return None
+
+    available = list(self.get_serializer_class()().fields)
+    related, unknown = {}, []
+    for name in requested:
+      relation, _, attr = name.partition('.')
+      if not attr:
+        if name not in available:
+          unknown.append(name)
+      elif relation in self.sparse_relations:
+        related.setdefault(relation, set()).add(attr)
+      else:
+        unknown.append(name)
+
+    relations = []
+    for name, (source, related_class) in self.sparse_relations.items():
+      if name not in related:
+        continue
+      related_available = list(related_class().fields)
+      unknown.extend(f'{name}.{attr}' for attr in related[name] if attr not in related_available)
+      relations.append((name, source, related_class, tuple(a for a in related_available if a in related[name])))
+
+    if unknown:
+      raise ValidationError({self.fields_query_param: [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+    # Alan sırası her zaman serializer'daki sıradır; istek sırası yanıtı değiştirmez
+    return tuple(name for name in available if name in requested), tuple(relations)
+
+  def wants_field(self, name):
+    return self.sparse_fields is None or name in self.sparse_fields[0]
+
+  def get_queryset(self):
+    queryset = super().get_queryset()
+    if self.sparse_fields is None:
+      return queryset
+    fields, relations = self.sparse_fields
+    model = queryset.model
+    serializer_fields = self.get_serializer_class()().fields
+
+    columns = {model._meta.pk.name, *self.sparse_required_fields}
+    for name in fields:
+      found = _model_columns(model, serializer_fields[name].source)
+      if found is None:
+        return queryset
+      columns.update(found)
+
+    for _, source, related_class, related_fields in relations:
+      related_model = model._meta.get_field(source).related_model
+      related_serializer_fields = related_class().fields
+      related_columns = {related_model._meta.pk.name}
+      for attr in related_fields:
+        found = _model_columns(related_model, related_serializer_fields[attr].source)
+        if found is None:
+          return queryset
+        related_columns.update(found)
+      queryset = queryset.select_related(source)
+      columns.add(source)
+      columns.update(f'{source}__{column}' for column in related_columns)
+    return queryset.only(*columns)
+
+  def get_serializer(self, *args, **kwargs):
+    if self.sparse_fields is None:
+      return super().get_serializer(*args, **kwargs)
+    fields, relations = self.sparse_fields
+    serializer_class = sparse_serializer_class(self.get_serializer_class(), fields, relations)
+    kwargs.setdefault('context', self.get_serializer_context())
+    return serializer_class(*args, **kwargs)
@@ -5,7 +5,7 @@ from django.http import JsonResponse
 from django.views.decorators.cache import never_cache
 
 @never_cache
-def health_check(request):
+async def health_check(request):
   """Simple health check endpoint for load balancer/monitoring"""
   return JsonResponse({"status": "healthy", "service": "drf_case"})
 
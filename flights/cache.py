@@ -0,0 +1,59 @@
+import hashlib
+from urllib.parse import urlencode
+from drf_case.cache import get_namespace_version, invalidate_namespace
+from crew.cache import CREW_NAMESPACE
+
+# Uçuş verisine ait tüm cache anahtarları bu namespace altında sürümlenir
+FLIGHTS_NAMESPACE = 'flights'
+
+# Liste yanıtlarının cache süreleri (saniye): soft TTL dolunca tek bir istek
+# kaydı yenilerken diğerleri eski değeri alır, hard TTL'de kayıt silinir.
+FLIGHT_LIST_CACHE_SOFT_TIMEOUT = 240
+FLIGHT_LIST_CACHE_TIMEOUT = 300
+
+# Birden fazla değer alabilen ve sırası sonucu etkilemeyen parametreler
+MULTI_VALUE_PARAMS = ('status',)
+
+# Virgülle ayrılmış ve sırası sonucu etkilemeyen parametreler
+COMMA_LIST_PARAMS = ('fields', 'expand')
+
+
+def invalidate_flight_cache():
+  """Sadece uçuş cache'lerini geçersiz kılar, Redis'in geri kalanına dokunmaz."""
+  invalidate_namespace(FLIGHTS_NAMESPACE)
+
+
+def canonical_query_string(request, paginator=None):
+  """
+  Aynı sonucu üreten sorguları tek bir string'e indirger: parametreler
+  sıralanır, boş değerler atılır, çoklu `status` ve virgüllü `fields`/`expand`
+  değerleri sıralanıp tekilleştirilir ve `page_size` sayfalama sınırlarına göre kırpılır.
+  """
+  params = []
+  for name in sorted(request.query_params.keys()):
+    values = [v.strip() for v in request.query_params.getlist(name)]
+    values = [v for v in values if v]
+    if not values:
+      continue
+    if name in MULTI_VALUE_PARAMS:
+      values = sorted(set(values))
+    elif name in COMMA_LIST_PARAMS:
+      values = [','.join(sorted({item.strip() for v in values for item in v.split(',') if item.strip()}))]
+    elif paginator is not None and name == getattr(paginator, 'page_size_query_param', None):
+      values = [str(paginator.get_page_size(request))]
+    params.append((name, values))
+  return urlencode(params, doseq=True)
+
+
+def flight_list_cache_key(request, paginator=None, expand=(), crew_version=None):
+  # Sayfalama linkleri mutlak URL içerdiği için şema/host/path de anahtara girer
+  base = request.build_absolute_uri(request.path)
+  query = canonical_query_string(request, paginator)
+  digest = hashlib.sha1(f"{base}?{query}".encode('utf-8')).hexdigest()
+  key = f"flights:list:{digest}"
+  if 'crew' in expand:
+    # Ekipli yanıtlar ekip yazmalarında da düşsün diye ekip sürümü anahtara eklenir
+    if crew_version is None:
+      crew_version = get_namespace_version(CREW_NAMESPACE)
+    key = f"{key}:crew:{crew_version}"
+  return key
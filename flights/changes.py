@@ -0,0 +1,197 @@
+"""
+Delta senkronizasyonu: değişiklik kaydının yazılması ve partiler halinde okunması.
+
+Her uçuş/ekip yazması ve silmesi ChangeLogEntry'ye bir kayıt ekler. İstemci
+son gördüğü sırayı (`since`) gönderir, sıradaki kayıtları nesnelerin güncel
+halleriyle birlikte alır ve yanıttaki `next` değeriyle devam eder.
+
+Sıra commit sırasına uyar: `id` ekleme anında verilir ve geç commit olan bir
+transaction'ın kayıtları daha büyük id'ler okunduktan sonra görünebilir.
+PostgreSQL'de kayıtlar (`txid`, `id`) sırasıyla okunur ve sadece açık en eski
+transaction'dan (pg_snapshot_xmin) önceki transaction'ların kayıtları verilir;
+sonradan commit olacak her kayıt bu sınırın üstünde kalır. SQLite yazıcıları
+sıralı çalıştırdığı için orada `txid` 0'dır ve `id` sırası yeterlidir.
+"""
+from datetime import timedelta
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from drf_case.serializers import compile_values_serializer
+from .models import ChangeLogBoundary, ChangeLogEntry, Flight
+
+FLIGHT = 'flight'
+CREW = 'crew'
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+
+class ChangesExpired(APIException):
+  status_code = status.HTTP_410_GONE
+  default_detail = 'Change history for this token has expired; reload the full list.'
+  default_code = 'changes_expired'
+
+
+def parse_token(value):
+  """`txid-id` biçimindeki token'ı (txid, id) çiftine çevirir."""
+  txid, sep, entry_id = value.partition('-')
+  if not sep:
+    int(value)
+    # Commit sırasından önceki tek sayılı token'lar: istemci yeniden yükler
+    raise ChangesExpired()
+  token = (int(txid), int(entry_id))
+  if min(token) < 0:
+    raise ValueError(value)
+  return token
+
+
+def format_token(token):
+  return f'{token[0]}-{token[1]}'
+
+
+def _current_txid():
+  if connection.vendor != 'postgresql':
+    return 0
+  with connection.cursor() as cursor:
+    cursor.execute('SELECT pg_current_xact_id()::text::bigint')
+    return cursor.fetchone()[0]
+
+
+def _horizon():
+  """Açık en eski transaction; bundan küçük txid'ler artık değişmez (PostgreSQL)."""
+  if connection.vendor != 'postgresql':
+    return None
+  with connection.cursor() as cursor:
+    cursor.execute('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+    return cursor.fetchone()[0]
+
+
+def _after(token):
+  txid, entry_id = token
+  return Q(txid__gt=txid) | Q(txid=txid, id__gt=entry_id)
+
+
+def _settled(horizon):
+  """Sırası kesinleşmiş kayıtlar; açık transaction'ların kayıtları beklemede kalır."""
+  queryset = ChangeLogEntry.objects.all()
+  if horizon is not None:
+    queryset = queryset.filter(txid__lt=horizon)
+  return queryset
+
+
+def pruned_through():
+  boundary = ChangeLogBoundary.objects.filter(pk=1).values_list('txid', 'entry_id').first()
+  return boundary or (0, 0)
+
+
+def _advance_pruned_through(token):
+  # Sınır sadece ileri gider; expire_history'nin koyduğu sınırı budama geri almaz
+  txid, entry_id = token
+  behind = Q(txid__lt=txid) | Q(txid=txid, entry_id__lt=entry_id)
+  if not ChangeLogBoundary.objects.filter(behind, pk=1).update(txid=txid, entry_id=entry_id):
+    # Satır migration'da eklenir; silinmişse (ör. flush) yeniden oluşturulur
+    ChangeLogBoundary.objects.get_or_create(pk=1, defaults={'txid': txid, 'entry_id': entry_id})
+
+
+def record_changes(entity, op, ids):
+  """Çağıranın transaction'ı içinde değişiklik kayıtlarını ekler."""
+  if not ids:
+    return
+  txid = _current_txid()
+  ChangeLogEntry.objects.bulk_create([
+    ChangeLogEntry(entity=entity, object_id=pk, op=op, txid=txid) for pk in ids
+  ])
+
+
+def head():
+  """Şu ana kadarki en son sıra (ilk senkronizasyon için başlangıç token'ı)."""
+  horizon = _horizon()
+  latest = _settled(horizon).order_by('-txid', '-id').values_list('txid', 'id').first() or (0, 0)
+  # Tamamı budanmış geçmişte sınırın kendisi başlangıçtır; sınır henüz
+  # kesinleşmemişse (eski bir transaction açık) istemci kısa süre 410 alır
+  boundary = pruned_through()
+  if horizon is None or boundary[0] < horizon:
+    latest = max(latest, boundary)
+  return latest
+
+
+def _load(entity, ids):
+  if entity == FLIGHT:
+    from .serializers import FlightSerializer
+    model, serializer_class = Flight, FlightSerializer
+  else:
+    from crew.models import CrewMember
+    from crew.serializers import CrewMemberSerializer
+    model, serializer_class = CrewMember, CrewMemberSerializer
+  compiled = compile_values_serializer(serializer_class)
+  rows = compiled.values(model.objects.filter(pk__in=ids))
+  return {item['id']: item for item in compiled.iter_serialize(rows)}
+
+
+def read_changes(since, limit):
+  """
+  `since`'ten sonraki en fazla `limit` kaydı okur. Aynı nesnenin partideki
+  kayıtları tek bir değişikliğe indirilir; `data` nesnenin güncel halidir.
+  (değişiklikler, sonraki token, devamı var mı) döndürür.
+  """
+  if since < pruned_through():
+    raise ChangesExpired()
+
+  entries = list(
+    _settled(_horizon())
+    .filter(_after(since))
+    .order_by('txid', 'id')
+    .values_list('txid', 'id', 'entity', 'object_id', 'op')[:limit + 1]
+  )
+  has_more = len(entries) > limit
+  entries = entries[:limit]
+
+  latest = {}
+  for _, seq, entity, object_id, op in entries:
+    # Tekrar eklemek sözlükte kaydı son sıraya taşır
+    latest.pop((entity, object_id), None)
+    latest[(entity, object_id)] = (seq, op)
+
+  data = {}
+  for entity in (FLIGHT, CREW):
+    ids = [object_id for (kind, object_id), (_, op) in latest.items() if kind == entity and op == UPSERT]
+    data[entity] = _load(entity, ids) if ids else {}
+
+  changes = []
+  for (entity, object_id), (seq, op) in latest.items():
+    item = None
+    if op == UPSERT:
+      item = data[entity].get(object_id)
+      if item is None:
+        # Nesne sonradan silinmiş; silme kaydı sıradaki partilerde gelir
+        continue
+    changes.append({'seq': seq, 'type': entity, 'op': op, 'id': object_id, 'data': item})
+
+  next_token = entries[-1][:2] if entries else since
+  return changes, next_token, has_more
+
+
+def prune(retention):
+  """Saklama süresini aşmış kayıtları siler ve budama sınırını kaydeder."""
+  cutoff = timezone.now() - timedelta(seconds=retention)
+  last = (
+    _settled(_horizon()).filter(created_at__lt=cutoff)
+    .order_by('-txid', '-id').values_list('txid', 'id').first()
+  )
+  if last is None:
+    return 0
+  deleted, _ = ChangeLogEntry.objects.exclude(_after(last)).delete()
+  _advance_pruned_through(last)
+  return deleted
+
+
+def expire_history():
+  """
+  Sinyal tetiklemeyen toplu yüklemelerden (ör. generate_data) sonra çağrılır:
+  mevcut tüm token'lar 410 alır ve istemciler tam listeyi yeniden yükler.
+  Eklenen işaret kaydı budama sınırıdır; kendisi hiçbir istemciye dönmez.
+  """
+  marker = ChangeLogEntry.objects.create(entity=FLIGHT, object_id=0, op=DELETE, txid=_current_txid())
+  _advance_pruned_through((marker.txid, marker.id))
+  return marker.id
@@ -0,0 +1,138 @@
+"""
+Uçuş durum değişikliklerinin anlık yayını (Server-Sent Events).
+
+Durum geçişleri commit sonrası Redis pub/sub kanalına yazılır. Her süreçte
+(event loop başına) tek bir Redis aboneliği açılır ve gelen mesajlar süreç
+içindeki tüm dinleyicilerin kuyruklarına dağıtılır (fan-out). Boşta bekleyen
+bir dinleyicinin maliyeti bir asyncio.Queue ve askıdaki bir coroutine'dir;
+Redis bağlantısı ya da thread tutmaz.
+"""
+import asyncio
+import json
+import logging
+import time
+import weakref
+import redis.asyncio as aioredis
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+STATUS_EVENT = 'flight.status'
+
+
+def publish_status_changes(changes):
+  """
+  (flight_id, flight_number, önceki durum, yeni durum) geçişlerini yayınlar.
+  Commit sonrası çağrılır; Redis hatası yazma işlemini etkilemez.
+  """
+  conn = get_redis_connection('default')
+  pipe = conn.pipeline(transaction=False)
+  for flight_id, flight_number, previous, status in changes:
+    pipe.publish(settings.FLIGHT_EVENTS_CHANNEL, json.dumps({
+      'id': flight_id,
+      'flight_number': flight_number,
+      'previous_status': previous,
+      'status': status,
+      'sent_at': time.time(),
+    }, separators=(',', ':')))
+  pipe.execute()
+
+
+class FlightEventBroker:
+  """Tek Redis aboneliğini süreç içindeki dinleyicilere dağıtır"""
+
+  def __init__(self, url, channel, queue_size):
+    self.url = url
+    self.channel = channel
+    self.queue_size = queue_size
+    self.subscribers = set()
+    self.ready = asyncio.Event()
+    self._task = None
+
+  def subscribe(self):
+    queue = asyncio.Queue(maxsize=self.queue_size)
+    self.subscribers.add(queue)
+    if self._task is None or self._task.done():
+      self.ready.clear()
+      self._task = asyncio.get_running_loop().create_task(self._listen())
+    return queue
+
+  def unsubscribe(self, queue):
+    self.subscribers.discard(queue)
+    if not self.subscribers and self._task is not None:
+      # Dinleyici kalmadıysa Redis aboneliği de kapatılır
+      self._task.cancel()
+      self._task = None
+
+  def dispatch(self, data):
+    for queue in tuple(self.subscribers):
+      if queue.full():
+        # Yavaş istemci: en eski mesaj atılır, diğer dinleyiciler beklemez
+        queue.get_nowait()
+      queue.put_nowait(data)
+
+  def _handle(self, message):
+    data = message['data']
+    data = data.decode('utf-8') if isinstance(data, bytes) else data
+    # Bozuk yük istemcilere gönderilmez
+    json.loads(data)
+    self.dispatch(data)
+
+  async def _listen(self):
+    # Dinleyici bitmemeli: bitince abone kuyrukları sadece heartbeat alır
+    while True:
+      client = aioredis.from_url(self.url)
+      pubsub = client.pubsub(ignore_subscribe_messages=True)
+      try:
+        await pubsub.subscribe(self.channel)
+        self.ready.set()
+        async for message in pubsub.listen():
+          try:
+            self._handle(message)
+          except Exception:
+            logger.exception(f"⚠️ Uçuş olayı işlenemedi, atlandı: {message.get('data')!r:.200}")
+      except (aioredis.ConnectionError, aioredis.TimeoutError, OSError) as exc:
+        self.ready.clear()
+        logger.warning(f"⚠️ Uçuş olay aboneliği koptu, yeniden bağlanılıyor: {exc}")
+        await asyncio.sleep(1)
+      except Exception:
+        self.ready.clear()
+        logger.exception("⚠️ Uçuş olay dinleyicisi beklenmedik hatayla durdu, yeniden başlatılıyor")
+        await asyncio.sleep(1)
+      finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+_brokers = weakref.WeakKeyDictionary()
+
+
+def get_broker():
+  """Çalışan event loop'a ait broker'ı döndürür (yoksa oluşturur)."""
+  loop = asyncio.get_running_loop()
+  broker = _brokers.get(loop)
+  if broker is None:
+    broker = FlightEventBroker(
+      settings.FLIGHT_EVENTS_REDIS_URL,
+      settings.FLIGHT_EVENTS_CHANNEL,
+      settings.FLIGHT_EVENTS_QUEUE_SIZE,
+    )
+    _brokers[loop] = broker
+  return broker
+
+
+async def event_stream(broker, queue, heartbeat):
+  """SSE gövdesi; istemci bağlantıyı kapatınca dinleyici kaydı silinir."""
+  try:
+    yield 'retry: 5000\n\n'
+    while True:
+      try:
+        data = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+      except asyncio.TimeoutError:
+        # Proxy'lerin boşta bağlantıyı kapatmaması için yorum satırı
+        yield ': keepalive\n\n'
+        continue
+      yield f'event: {STATUS_EVENT}\ndata: {data}\n\n'
+  finally:
+    broker.unsubscribe(queue)
@@ -1,4 +1,6 @@
 import django_filters
+from datetime import datetime, time, timedelta
+from django.utils import timezone
 from .models import Flight
 
 
@@ -24,15 +26,19 @@ class FlightFilter(django_filters.FilterSet):
     label='Scheduled before'
   )
   
-  # Durum filtresi (çoklu seçim için)
+  # Durum filtresi (çoklu seçim için, ?status=planned&status=delayed).
+  # MultipleChoiceFilter değerleri tek tek eşleştirir; lookup_expr='in'
+  # verilirse her değer karakterlerine bölünür. Join olmadığı için DISTINCT
+  # gereksiz.
   status = django_filters.MultipleChoiceFilter(
     choices=Flight.STATUS_CHOICES,
-    lookup_expr='in'
+    distinct=False
   )
   
-  # Tarih filtresi (sadece gün bazında)
+  # Tarih filtresi (sadece gün bazında). scheduled_time__date kolonu fonksiyona
+  # sokup index kullanımını engellediği için gün aralığına çevrilir.
   scheduled_date = django_filters.DateFilter(
-    field_name='scheduled_time__date',
+    method='filter_scheduled_date',
     label='Scheduled date'
   )
 
@@ -40,6 +46,12 @@ class FlightFilter(django_filters.FilterSet):
   airline = django_filters.CharFilter(lookup_expr='icontains')
   gate = django_filters.CharFilter(lookup_expr='icontains')
 
+  def filter_scheduled_date(self, queryset, name, value):
+    # __date ile aynı anlam: günün başı/sonu aktif zaman dilimine göre alınır
+    start = timezone.make_aware(datetime.combine(value, time.min))
+    end = timezone.make_aware(datetime.combine(value + timedelta(days=1), time.min))
+    return queryset.filter(scheduled_time__gte=start, scheduled_time__lt=end)
+
   class Meta:
     model = Flight
     fields = {
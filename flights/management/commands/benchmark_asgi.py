@@ -0,0 +1,126 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from flights.models import Flight
+
+
+class Command(BaseCommand):
+  help = 'Start gunicorn with the sync and asgi profiles and compare requests/sec and p99 latency of the read endpoints'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--profiles', nargs='+', default=['sync', 'asgi'], choices=['sync', 'asgi'])
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per profile (default: 2)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent client connections (default: 50)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per endpoint (default: 10)')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--username', help='User the access token is issued for (default: first active user)')
+
+  def handle(self, *args, **options):
+    users = get_user_model().objects.filter(is_active=True)
+    if options['username']:
+      users = users.filter(username=options['username'])
+    user = users.order_by('id').first()
+    flight = Flight.objects.order_by('id').first()
+    if user is None or flight is None:
+      raise CommandError('Needs at least one active user and one flight (run seed_data or generate_data first)')
+    token = str(AccessToken.for_user(user))
+    endpoints = [
+      ('health', '/health/'),
+      ('flight list', '/api/flights/?page_size=20'),
+      ('flight detail', f'/api/flights/{flight.pk}/'),
+      ('crew list', '/api/crew/?page_size=20'),
+    ]
+
+    self.stdout.write(f'{"endpoint":<14} {"profile":<7} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"errors":>7}')
+    results = {}
+    for profile in options['profiles']:
+      server = self._start(profile, options)
+      try:
+        for label, path in endpoints:
+          stats = asyncio.run(self._load(options, path, token))
+          results[(label, profile)] = stats
+          rps, p50, p99, errors = stats
+          self.stdout.write(f'{label:<14} {profile:<7} {rps:>9.1f} {p50:>9.2f} {p99:>9.2f} {errors:>7}')
+      finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    if set(options['profiles']) == {'sync', 'asgi'}:
+      self.stdout.write('')
+      for label, _ in endpoints:
+        sync_rps, _, sync_p99, _ = results[(label, 'sync')]
+        asgi_rps, _, asgi_p99, _ = results[(label, 'asgi')]
+        self.stdout.write(
+          f'{label:<14} asgi/sync req/s {asgi_rps / max(sync_rps, 1e-9):.2f}x, '
+          f'p99 {asgi_p99 / max(sync_p99, 1e-9):.2f}x'
+        )
+
+  def _start(self, profile, options):
+    env = dict(os.environ, GUNICORN_PROFILE=profile, GUNICORN_USER=str(os.getuid()), GUNICORN_GROUP=str(os.getgid()))
+    command = [
+      sys.executable, '-m', 'gunicorn', '--config', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+      '--bind', f'127.0.0.1:{options["port"]}', '--workers', str(options['workers']),
+      '--pid', os.path.join(tempfile.gettempdir(), f'benchmark_asgi_{profile}.pid'),
+    ]
+    server = subprocess.Popen(command, env=env, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+      if server.poll() is not None:
+        raise CommandError(f'gunicorn ({profile}) exited with code {server.returncode}')
+      try:
+        status, _ = asyncio.run(self._request(options['port'], '/health/', None))
+        if status == 200:
+          return server
+      except OSError:
+        pass
+      time.sleep(0.2)
+    server.terminate()
+    raise CommandError(f'gunicorn ({profile}) did not become ready')
+
+  async def _request(self, port, path, token):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    headers = f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+    if token:
+      headers += f'Authorization: Bearer {token}\r\n'
+    writer.write(f'{headers}\r\n'.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line = response.split(b'\r\n', 1)[0].split()
+    return int(status_line[1]) if len(status_line) > 1 else 0, len(response)
+
+  async def _load(self, options, path, token):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + options['duration']
+
+    async def client():
+      nonlocal errors
+      while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+          status, _ = await self._request(options['port'], path, token)
+        except OSError:
+          status = 0
+        if status == 200:
+          latencies.append(time.perf_counter() - start)
+        else:
+          errors += 1
+
+    # Isınma: cache'ler ve bağlantılar dolsun
+    await self._request(options['port'], path, token)
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+    elapsed = time.perf_counter() - started
+    if not latencies:
+      return 0.0, 0.0, 0.0, errors
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / elapsed, statistics.median(latencies) * 1000, p99 * 1000, errors
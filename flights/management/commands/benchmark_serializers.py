@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from flights.models import Flight
+from flights.serializers import FlightSerializer
+from crew.models import CrewMember
+from crew.serializers import CrewMemberSerializer
+from drf_case.serializers import compile_values_serializer
+
+
+class Command(BaseCommand):
+  help = 'Compare ModelSerializer and compiled .values() serialization speed on existing rows'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--rows', type=int, default=1000, help='Rows per model (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best run is reported')
+
+  def handle(self, *args, **options):
+    targets = [
+      ('Flight', Flight.objects.order_by('id'), FlightSerializer),
+      ('CrewMember', CrewMember.objects.order_by('id'), CrewMemberSerializer),
+    ]
+    for label, queryset, serializer_class in targets:
+      queryset = queryset[:options['rows']]
+      if not queryset.exists():
+        self.stdout.write(self.style.WARNING(f'{label}: no rows, run seed_data or generate_data first'))
+        continue
+      compiled = compile_values_serializer(serializer_class)
+
+      def drf_path():
+        return JSONRenderer().render(serializer_class(list(queryset), many=True).data)
+
+      def values_path():
+        return JSONRenderer().render(compiled.serialize(list(compiled.values(queryset))))
+
+      drf_body, drf_time = self._best(drf_path, options['repeat'])
+      values_body, values_time = self._best(values_path, options['repeat'])
+      rows = queryset.count()
+      self.stdout.write(f'{label} ({rows} rows, best of {options["repeat"]}):')
+      self.stdout.write(f'  ModelSerializer : {drf_time * 1000:8.2f} ms  ({rows / drf_time:,.0f} rows/s)')
+      self.stdout.write(f'  values() path   : {values_time * 1000:8.2f} ms  ({rows / values_time:,.0f} rows/s)')
+      self.stdout.write(f'  speedup         : {drf_time / values_time:.2f}x')
+      if drf_body == values_body:
+        self.stdout.write(self.style.SUCCESS('  output          : byte-identical'))
+      else:
+        self.stdout.write(self.style.ERROR('  output          : MISMATCH'))
+
+  def _best(self, func, repeat):
+    best, body = None, None
+    for _ in range(max(repeat, 1)):
+      start = time.perf_counter()
+      body = func()
+      elapsed = time.perf_counter() - start
+      best = elapsed if best is None else min(best, elapsed)
+    return body, best
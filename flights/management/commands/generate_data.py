@@ -0,0 +1,253 @@
+import csv
+import io
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from flights.cache import invalidate_flight_cache
+from flights.changes import expire_history
+from flights.models import Flight
+from crew.cache import invalidate_crew_cache
+from crew.models import CrewMember
+
+# (kod, havayolu, ağırlık)
+AIRLINES = [
+  ('TK', 'Turkish Airlines', 46),
+  ('PC', 'Pegasus Airlines', 27),
+  ('VF', 'AnadoluJet', 13),
+  ('XQ', 'SunExpress', 9),
+  ('KK', 'AtlasGlobal', 2),
+  ('LH', 'Lufthansa', 2),
+  ('BA', 'British Airways', 1),
+]
+
+# Kalkışların çoğu hub'lardan yapılır (hub-and-spoke)
+HUBS = [('Istanbul', 62), ('Ankara', 14), ('Antalya', 12), ('Izmir', 9), ('Adana', 3)]
+DESTINATIONS = [
+  ('Istanbul', 14), ('Ankara', 8), ('Izmir', 7), ('Antalya', 7), ('Adana', 3), ('Trabzon', 3),
+  ('London', 7), ('Berlin', 6), ('Frankfurt', 5), ('Amsterdam', 5), ('Paris', 5), ('Munich', 4),
+  ('Rome', 3), ('Madrid', 3), ('Vienna', 3), ('Dubai', 4), ('Baku', 2), ('Tbilisi', 2),
+  ('New York', 2), ('Tokyo', 1),
+]
+
+# Saat başına kalkış ağırlığı (sabah ve akşam bankları, gece az trafik)
+HOUR_WEIGHTS = [2, 1, 1, 1, 2, 4, 9, 10, 9, 7, 6, 6, 6, 6, 7, 8, 9, 10, 10, 9, 7, 5, 4, 3]
+
+TERMINALS = [('A', 30), ('B', 25), ('C', 20), ('D', 15), ('E', 10)]
+
+FIRST_NAMES = [
+  'Ahmet', 'Mehmet', 'Ali', 'Mustafa', 'Emre', 'Can', 'Burak', 'Murat', 'Kerem', 'Onur',
+  'Ayşe', 'Fatma', 'Zeynep', 'Elif', 'Seda', 'Burcu', 'Deniz', 'Merve', 'Selin', 'Gamze',
+  'Özge', 'Pınar', 'Ebru', 'Gizem', 'Tuğba', 'Ece', 'İrem', 'Cem', 'Serkan', 'Hakan',
+]
+LAST_NAMES = [
+  'Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Özkan', 'Çelik', 'Arslan', 'Kara', 'Güneş', 'Aydın',
+  'Yurt', 'Tekin', 'Akın', 'Polat', 'Doğan', 'Yıldız', 'Koç', 'Taş', 'Öz', 'Er',
+  'Kılıç', 'Aslan', 'Çetin', 'Kurt', 'Özdemir', 'Erdoğan', 'Aksoy', 'Bulut', 'Korkmaz', 'Uçar',
+]
+
+FLIGHT_COLUMNS = ['id', 'flight_number', 'origin', 'destination', 'scheduled_time', 'status', 'airline', 'gate', 'updated_at']
+CREW_COLUMNS = ['name', 'role', 'assigned_flight_id', 'updated_at']
+
+
+def _cumulative(weighted):
+  values, total, cumulative = [], 0, []
+  for value, weight in weighted:
+    total += weight
+    values.append(value)
+    cumulative.append(total)
+  return values, cumulative
+
+
+class Command(BaseCommand):
+  help = 'Generate production-sized synthetic flight and crew data with realistic distributions (batched bulk inserts, COPY on PostgreSQL)'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--flights', type=int, default=10000, help='Number of flights to generate (default: 10000)')
+    parser.add_argument('--crew-per-flight', default='4-8', help='Crew size per flight, N or MIN-MAX (default: 4-8)')
+    parser.add_argument('--seed', type=int, help='Random seed; the same seed on the same day generates the same rows')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Flights per transaction (default: 5000)')
+    parser.add_argument('--days-back', type=int, default=30, help='Earliest scheduled day, relative to today (default: 30)')
+    parser.add_argument('--days-ahead', type=int, default=30, help='Latest scheduled day, relative to today (default: 30)')
+    parser.add_argument('--clear', action='store_true', help='Delete all flights and crew first')
+    parser.add_argument('--no-copy', action='store_true', help='Use bulk_create even on PostgreSQL')
+
+  def handle(self, *args, **options):
+    crew_min, crew_max = self._crew_range(options['crew_per_flight'])
+    if options['flights'] < 0 or options['batch_size'] <= 0:
+      raise CommandError('--flights must be >= 0 and --batch-size > 0')
+    if options['days_back'] < 0 or options['days_ahead'] < 0:
+      raise CommandError('--days-back and --days-ahead must be >= 0')
+
+    seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+    self.rng = random.Random(seed)
+    self.now = timezone.now()
+    # Zaman aralığı günün başına sabitlenir; aynı seed aynı gün aynı satırları üretir
+    self.start = datetime.combine(self.now.date(), dt_time.min, tzinfo=dt_timezone.utc) - timedelta(days=options['days_back'])
+    self.days = options['days_back'] + options['days_ahead'] + 1
+    self.use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+    self.airlines = _cumulative([((code, name), weight) for code, name, weight in AIRLINES])
+    self.hubs = _cumulative(HUBS)
+    self.destinations = _cumulative(DESTINATIONS)
+    self.hours = _cumulative(enumerate(HOUR_WEIGHTS))
+    self.terminals = _cumulative(TERMINALS)
+
+    if options['clear']:
+      self._clear()
+
+    self.stdout.write(
+      f"Generating {options['flights']} flights, {crew_min}-{crew_max} crew each "
+      f"(seed={seed}, {'COPY' if self.use_copy else 'bulk_create'})"
+    )
+    started = time.perf_counter()
+    sequence = (Flight.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+    total_flights = total_crew = 0
+    remaining = options['flights']
+    while remaining > 0:
+      size = min(options['batch_size'], remaining)
+      flights = self._flight_rows(sequence, size)
+      with transaction.atomic():
+        ids = self._insert_flights(flights)
+        crew = self._crew_rows(ids, crew_min, crew_max)
+        self._insert_crew(crew)
+      sequence += size
+      remaining -= size
+      total_flights += size
+      total_crew += len(crew)
+      elapsed = time.perf_counter() - started
+      self.stdout.write(f'  {total_flights} flights, {total_crew} crew ({(total_flights + total_crew) / elapsed:,.0f} rows/s)')
+
+    # Toplu insert'ler sinyal tetiklemez: cache ve delta senkronizasyonu bir kez güncellenir
+    invalidate_flight_cache()
+    invalidate_crew_cache()
+    expire_history()
+    if connection.vendor == 'postgresql':
+      with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {Flight._meta.db_table}, {CrewMember._meta.db_table}')
+
+    elapsed = time.perf_counter() - started
+    self.stdout.write(self.style.SUCCESS(
+      f'Created {total_flights} flights and {total_crew} crew members in {elapsed:.1f}s (seed={seed})'
+    ))
+
+  def _crew_range(self, value):
+    try:
+      low, _, high = value.partition('-')
+      crew_min, crew_max = int(low), int(high or low)
+    except ValueError:
+      raise CommandError('--crew-per-flight must be N or MIN-MAX')
+    if crew_min < 0 or crew_max < crew_min:
+      raise CommandError('--crew-per-flight must be N or MIN-MAX with 0 <= MIN <= MAX')
+    return crew_min, crew_max
+
+  def _clear(self):
+    # Satır satır delete() milyonlarca sinyal tetikler; flush komutunun
+    # kullandığı TRUNCATE/DELETE ifadeleri kullanılır
+    tables = [CrewMember._meta.db_table, Flight._meta.db_table]
+    connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables))
+    self.stdout.write(self.style.WARNING('Cleared existing flights and crew'))
+
+  def _choices(self, weighted, size):
+    values, cumulative = weighted
+    return self.rng.choices(values, cum_weights=cumulative, k=size)
+
+  def _status(self, scheduled):
+    delta = (scheduled - self.now).total_seconds()
+    roll = self.rng.random()
+    if delta < -4 * 3600:
+      return 'landed'
+    if delta < 0:
+      # Son saatlerde kalkan uçuşlar havada ya da gecikmeli
+      return 'departed' if roll < 0.8 else 'delayed'
+    if delta < 24 * 3600:
+      return 'delayed' if roll < 0.18 else 'planned'
+    return 'delayed' if roll < 0.03 else 'planned'
+
+  def _gate(self, scheduled, terminal):
+    # Kapılar kalkıştan birkaç gün önce atanır
+    if scheduled - self.now > timedelta(days=2) and self.rng.random() < 0.6:
+      return None
+    return f'{terminal}{self.rng.randint(1, 40)}'
+
+  def _flight_rows(self, sequence, size):
+    rng = self.rng
+    airlines = self._choices(self.airlines, size)
+    origins = self._choices(self.hubs, size)
+    destinations = self._choices(self.destinations, size)
+    hours = self._choices(self.hours, size)
+    terminals = self._choices(self.terminals, size)
+    rows = []
+    for i in range(size):
+      (code, airline), origin, destination = airlines[i], origins[i], destinations[i]
+      while destination == origin:
+        destination = self._choices(self.destinations, 1)[0]
+      scheduled = self.start + timedelta(days=rng.randrange(self.days), hours=hours[i], minutes=5 * rng.randrange(12))
+      rows.append(Flight(
+        flight_number=f'{code}{sequence + i:06d}',
+        origin=origin,
+        destination=destination,
+        scheduled_time=scheduled,
+        status=self._status(scheduled),
+        airline=airline,
+        gate=self._gate(scheduled, terminals[i]),
+        updated_at=self.now,
+      ))
+    return rows
+
+  def _crew_rows(self, flight_ids, crew_min, crew_max):
+    rng = self.rng
+    rows = []
+    for flight_id in flight_ids:
+      size = rng.randint(crew_min, crew_max)
+      names = [f'{first} {last}' for first, last in zip(rng.choices(FIRST_NAMES, k=size), rng.choices(LAST_NAMES, k=size))]
+      for position, name in enumerate(names):
+        # Her ekipte bir pilot, bir yardımcı pilot, gerisi kabin ekibi
+        role = 'pilot' if position == 0 else 'copilot' if position == 1 else 'attendant'
+        rows.append(CrewMember(name=name, role=role, assigned_flight_id=flight_id, updated_at=self.now))
+    return rows
+
+  def _insert_flights(self, flights):
+    if not self.use_copy:
+      Flight.objects.bulk_create(flights)
+      if flights and flights[0].pk is None:
+        # Backend eklenen satırların id'lerini döndürmüyorsa
+        numbers = [flight.flight_number for flight in flights]
+        ids = dict(Flight.objects.filter(flight_number__in=numbers).values_list('flight_number', 'id'))
+        return [ids[number] for number in numbers]
+      return [flight.pk for flight in flights]
+
+    # COPY id döndürmez: id'ler sequence'tan önceden ayrılır
+    table = Flight._meta.db_table
+    with connection.cursor() as cursor:
+      cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        [table, len(flights)],
+      )
+      ids = [row[0] for row in cursor.fetchall()]
+    for flight, pk in zip(flights, ids):
+      flight.id = pk
+    self._copy(table, FLIGHT_COLUMNS, flights)
+    return ids
+
+  def _insert_crew(self, crew):
+    if self.use_copy:
+      self._copy(CrewMember._meta.db_table, CREW_COLUMNS, crew)
+    else:
+      CrewMember.objects.bulk_create(crew)
+
+  def _copy(self, table, columns, objects):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objects:
+      # CSV COPY'de tırnaksız boş alan NULL'dır
+      writer.writerow([
+        value.isoformat() if isinstance(value, datetime) else ('' if value is None else value)
+        for value in (getattr(obj, column) for column in columns)
+      ])
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+      cursor.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
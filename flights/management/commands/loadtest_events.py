@@ -0,0 +1,104 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from flights.events import publish_status_changes
+
+
+class Command(BaseCommand):
+  help = 'Open N idle SSE connections to /api/flights/events/, publish one status event and report fan-out latency'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--url', default='http://localhost:8001/api/flights/events/', help='Event stream URL (ASGI server)')
+    parser.add_argument('--connections', type=int, default=1000, help='Concurrent idle connections (default: 1000)')
+    parser.add_argument('--username', help='User the access token is issued for (default: first active user)')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds to wait for connect and delivery')
+    parser.add_argument('--pid', type=int, help='Server process id; its RSS is reported when psutil is installed')
+
+  def handle(self, *args, **options):
+    users = get_user_model().objects.filter(is_active=True)
+    if options['username']:
+      users = users.filter(username=options['username'])
+    user = users.order_by('id').first()
+    if user is None:
+      raise CommandError('No active user found to issue an access token for')
+    token = str(AccessToken.for_user(user))
+
+    connected, latencies, failed = asyncio.run(self._run(options, token))
+    self.stdout.write(f'connections : {connected}/{options["connections"]} connected, {failed} failed')
+    if latencies:
+      latencies.sort()
+      p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+      self.stdout.write(f'delivered   : {len(latencies)}/{connected}')
+      self.stdout.write(f'fan-out p50 : {statistics.median(latencies) * 1000:8.2f} ms')
+      self.stdout.write(f'fan-out p99 : {p99 * 1000:8.2f} ms')
+    else:
+      self.stdout.write(self.style.ERROR('delivered   : 0'))
+    self._report_rss(options['pid'])
+
+  async def _run(self, options, token):
+    url = urlsplit(options['url'])
+    request = (
+      f'GET {url.path}?token={token} HTTP/1.1\r\n'
+      f'Host: {url.netloc}\r\nAccept: text/event-stream\r\n\r\n'
+    ).encode()
+    published = asyncio.Event()
+    streams = await asyncio.gather(
+      *(self._connect(url, request, options['timeout']) for _ in range(options['connections'])),
+      return_exceptions=True,
+    )
+    streams = [stream for stream in streams if not isinstance(stream, BaseException)]
+    failed = options['connections'] - len(streams)
+
+    # Sunucu tarafında Redis aboneliğinin açılması için kısa bir bekleme
+    await asyncio.sleep(0.5)
+    readers = [asyncio.create_task(self._await_event(reader, published)) for reader, _ in streams]
+    publish_status_changes([(0, 'LOADTEST', 'planned', 'delayed')])
+    published.set()
+    done = await asyncio.gather(
+      *(asyncio.wait_for(task, options['timeout']) for task in readers),
+      return_exceptions=True,
+    )
+    for _, writer in streams:
+      writer.close()
+    return len(streams), [latency for latency in done if isinstance(latency, float)], failed
+
+  async def _connect(self, url, request, timeout):
+    reader, writer = await asyncio.wait_for(
+      asyncio.open_connection(url.hostname, url.port or 80), timeout,
+    )
+    writer.write(request)
+    await writer.drain()
+    status = await asyncio.wait_for(reader.readline(), timeout)
+    if b' 200 ' not in status:
+      writer.close()
+      raise ConnectionError(status.decode(errors='replace').strip())
+    # İlk SSE satırı (retry:) geldiyse dinleyici kaydı tamamdır
+    while not (await asyncio.wait_for(reader.readline(), timeout)).startswith(b'retry:'):
+      pass
+    return reader, writer
+
+  async def _await_event(self, reader, published):
+    while True:
+      line = await reader.readline()
+      if not line:
+        raise ConnectionError('stream closed')
+      if line.startswith(b'data: '):
+        received = time.time()
+        await published.wait()
+        return received - json.loads(line[len(b'data: '):])['sent_at']
+
+  def _report_rss(self, pid):
+    if pid is None:
+      return
+    try:
+      import psutil
+    except ImportError:
+      self.stdout.write(self.style.WARNING('server RSS  : psutil is not installed'))
+      return
+    rss = psutil.Process(pid).memory_info().rss
+    self.stdout.write(f'server RSS  : {rss / 1024 / 1024:.1f} MiB')
@@ -120,7 +120,7 @@ class Command(BaseCommand):
     
     # Display some sample data
     self.stdout.write(self.style.WARNING('\nSample flights:'))
-    for flight in Flight.objects.all()[:5]:
+    for flight in Flight.objects.prefetch_related('crew')[:5]:
       self.stdout.write(f'  {flight.flight_number}: {flight.origin} → {flight.destination} ({flight.status})')
       crew_list = ', '.join([f'{c.name} ({c.role})' for c in flight.crew.all()])
       self.stdout.write(f'    Crew: {crew_list}')
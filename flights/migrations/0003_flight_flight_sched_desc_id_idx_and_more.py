@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0002_flight_airline_flight_gate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['-scheduled_time', 'id'], name='flight_sched_desc_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['status', 'scheduled_time'], name='flight_status_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(condition=models.Q(('status__in', ['planned', 'delayed'])), fields=['scheduled_time'], name='flight_active_sched_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# FlightFilter (icontains) ve SearchFilter'ın kullandığı alanlar. Django
+# PostgreSQL'de icontains'i `UPPER("kolon"::text) LIKE UPPER(%s)` olarak
+# ürettiği için index aynı ifade üzerine kurulur.
+TRIGRAM_FIELDS = ['flight_number', 'origin', 'destination', 'airline', 'gate']
+
+
+def create_trigram_indexes(apps, schema_editor):
+  # pg_trgm sadece PostgreSQL'de var; SQLite (testler) normal LIKE taramasıyla çalışır
+  if schema_editor.connection.vendor != 'postgresql':
+    return
+  schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+  for field in TRIGRAM_FIELDS:
+    schema_editor.execute(
+      f'CREATE INDEX CONCURRENTLY IF NOT EXISTS flight_{field}_trgm_idx '
+      f'ON flights_flight USING gin ((UPPER("{field}"::text)) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+  if schema_editor.connection.vendor != 'postgresql':
+    return
+  for field in TRIGRAM_FIELDS:
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS flight_{field}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+  # CREATE INDEX CONCURRENTLY bir transaction içinde çalışamaz; büyük
+  # tablolarda yazmaları kilitlememek için eşzamanlı oluşturulur.
+  atomic = False
+
+  dependencies = [
+    ('flights', '0003_flight_flight_sched_desc_id_idx_and_more'),
+  ]
+
+  operations = [
+    migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+  ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+def create_boundary(apps, schema_editor):
+    apps.get_model('flights', 'ChangeLogBoundary').objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0006_changelogentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField(default=0)),
+                ('entry_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='changelogentry',
+            options={'ordering': ['txid', 'id']},
+        ),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='txid',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['txid', 'id'], name='changelog_txid_id_idx'),
+        ),
+        migrations.RunPython(create_boundary, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Q
 
 class Flight(models.Model):
   STATUS_CHOICES = [
@@ -15,6 +16,99 @@ class Flight(models.Model):
   status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
   airline = models.CharField(max_length=100, default='Unknown')
   gate = models.CharField(max_length=10, blank=True, null=True)
+  updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+  # DB'den yüklenen/kaydedilen değeri saklanan alanlar; pre_save sinyali
+  # değişiklikleri ek SELECT atmadan bu anlık görüntüden tespit eder.
+  TRACKED_FIELDS = ('status',)
+
+  @classmethod
+  def from_db(cls, db, field_names, values):
+    instance = super().from_db(db, field_names, values)
+    instance._loaded_values = {
+      name: value for name, value in zip(field_names, values)
+      if name in cls.TRACKED_FIELDS
+    }
+    return instance
+
+  def save(self, *args, **kwargs):
+    # Sinyallerin yazdığı outbox olayları uçuş satırıyla aynı transaction'da commit olur
+    using = kwargs.get('using') or router.db_for_write(Flight, instance=self)
+    with transaction.atomic(using=using):
+      super().save(*args, **kwargs)
+    self.snapshot_tracked_fields(kwargs.get('update_fields'))
+
+  def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+    super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+    self.snapshot_tracked_fields(fields)
+
+  def snapshot_tracked_fields(self, fields=None):
+    names = self.TRACKED_FIELDS if fields is None else [f for f in self.TRACKED_FIELDS if f in fields]
+    loaded = self.__dict__.setdefault('_loaded_values', {})
+    for name in names:
+      loaded[name] = getattr(self, name)
+
+  def get_loaded_value(self, name, default=None):
+    """Alanın DB'deki son bilinen değeri (bilinmiyorsa `default`)."""
+    return getattr(self, '_loaded_values', {}).get(name, default)
 
   def __str__(self):
     return f"{self.flight_number} - {self.origin} → {self.destination}"
+
+  class Meta:
+    indexes = [
+      # Varsayılan sıralama (-scheduled_time) ve keyset sayfalama (-scheduled_time, id)
+      models.Index(fields=['-scheduled_time', 'id'], name='flight_sched_desc_id_idx'),
+      # ?status=...&scheduled_time_after/before=... ve status + tarih sıralaması
+      models.Index(fields=['status', 'scheduled_time'], name='flight_status_sched_idx'),
+      # Operasyon ekranlarının sorguladığı aktif (planlanan/geciken) uçuşlar
+      models.Index(
+        fields=['scheduled_time'],
+        name='flight_active_sched_idx',
+        condition=Q(status__in=['planned', 'delayed']),
+      ),
+    ]
+
+
+class ChangeLogEntry(models.Model):
+  """
+  Delta senkronizasyonu için uçuş/ekip değişiklik kaydı. Sıra (`txid`, `id`)
+  çiftidir: `txid` kaydı yazan PostgreSQL transaction'ıdır (diğer
+  backend'lerde 0); istemciler son gördükleri çifti `since` olarak gönderir.
+  """
+  ENTITY_CHOICES = [
+    ('flight', 'Flight'),
+    ('crew', 'Crew Member'),
+  ]
+  OP_CHOICES = [
+    ('upsert', 'Upsert'),
+    ('delete', 'Delete'),
+  ]
+
+  id = models.BigAutoField(primary_key=True)
+  entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+  object_id = models.BigIntegerField()
+  op = models.CharField(max_length=10, choices=OP_CHOICES)
+  txid = models.BigIntegerField(default=0)
+  created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+  def __str__(self):
+    return f"#{self.id} {self.op} {self.entity}:{self.object_id}"
+
+  class Meta:
+    ordering = ['txid', 'id']
+    indexes = [
+      models.Index(fields=['txid', 'id'], name='changelog_txid_id_idx'),
+    ]
+
+
+class ChangeLogBoundary(models.Model):
+  """
+  Budanan en büyük değişiklik sırası (tek satır). Bundan eski `since`
+  değerleri eksik geçmiş demektir; sınır sadece ileri gider.
+  """
+  txid = models.BigIntegerField(default=0)
+  entry_id = models.BigIntegerField(default=0)
+
+  def __str__(self):
+    return f"pruned through {self.txid}-{self.entry_id}"
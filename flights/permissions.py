@@ -1,5 +1,4 @@
-from rest_framework.permissions import BasePermission
+from users.permissions import IsRole
 
-class IsStaffOrAdmin(BasePermission):
-  def has_permission(self, request, view):
-    return request.user and request.user.role in ['staff', 'admin']
\ No newline at end of file
+class IsStaffOrAdmin(IsRole):
+  allowed_roles = ('staff', 'admin')
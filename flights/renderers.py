@@ -0,0 +1,62 @@
+"""
+Dışa aktarma (export) için satır satır render edilen formatlar.
+
+`stream()` her kayıt için bir parça üretir ve StreamingHttpResponse ile
+kullanılır; `render()` sadece hata yanıtları gibi küçük gövdeler içindir.
+"""
+import csv
+import json
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+  """Her satırda bir JSON nesnesi (application/x-ndjson)"""
+  media_type = 'application/x-ndjson'
+  format = 'ndjson'
+  charset = 'utf-8'
+
+  def stream(self, items):
+    for item in items:
+      yield json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if data is None:
+      return b''
+    rows = data if isinstance(data, list) else [data]
+    return ''.join(self.stream(rows)).encode(self.charset)
+
+
+class _Echo:
+  """csv.writer'ın yazdığı satırı olduğu gibi döndüren sahte dosya"""
+
+  def write(self, value):
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+  """İlk satırda alan adları olan CSV (text/csv)"""
+  media_type = 'text/csv'
+  format = 'csv'
+  charset = 'utf-8'
+
+  def stream(self, items):
+    writer = csv.writer(_Echo())
+    header = None
+    for item in items:
+      if header is None:
+        header = list(item)
+        yield writer.writerow(header)
+      yield writer.writerow([self._cell(item.get(name)) for name in header])
+
+  def _cell(self, value):
+    # İç içe değerler (ör. ?expand=crew) hücreye JSON olarak yazılır
+    if isinstance(value, (dict, list)):
+      return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return '' if value is None else value
+
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if data is None:
+      return b''
+    rows = data if isinstance(data, list) else [data]
+    return ''.join(self.stream(rows)).encode(self.charset)
@@ -1,7 +1,99 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Flight
+from crew.models import CrewMember
+
+# Tek bir toplu istekte kabul edilen en fazla uçuş sayısı
+BULK_MAX_ITEMS = 1000
+
+
+class FlightListSerializer(serializers.ListSerializer):
+  """
+  Toplu oluşturma/güncelleme. Her öğe FlightSerializer ile doğrulanır, yazma
+  tek sorguyla (bulk_create/bulk_update) yapılır. bulk_* model sinyallerini
+  tetiklemediği için gecikmeye geçen uçuşlar `delayed_flights`, tüm durum
+  geçişleri `status_changes` içinde toplanır.
+  """
+
+  def __init__(self, *args, **kwargs):
+    kwargs.setdefault('max_length', BULK_MAX_ITEMS)
+    kwargs.setdefault('allow_empty', False)
+    super().__init__(*args, **kwargs)
+    self.delayed_flights = []
+    self.status_changes = []
+
+  def run_child_validation(self, data):
+    if self.instance is not None:
+      # Güncellemede her öğe kendi `id`'si ile eşleşen uçuşa göre doğrulanır
+      instances = {flight.pk: flight for flight in self.instance}
+      pk = data.get('id') if isinstance(data, dict) else None
+      try:
+        instance = instances[int(pk)]
+      except (KeyError, TypeError, ValueError):
+        raise serializers.ValidationError({'id': ['Flight not found.']})
+      self.child.instance = instance
+      self.child.initial_data = data
+      self._targets.append(instance)
+    return super().run_child_validation(data)
+
+  def to_internal_value(self, data):
+    self._targets = []
+    return super().to_internal_value(data)
+
+  def validate(self, attrs):
+    numbers = [item['flight_number'] for item in attrs if 'flight_number' in item]
+    duplicates = sorted({number for number in numbers if numbers.count(number) > 1})
+    if duplicates:
+      raise serializers.ValidationError(
+        f"Duplicate flight_number in request: {', '.join(duplicates)}"
+      )
+    return attrs
+
+  def create(self, validated_data):
+    flights = [Flight(**attrs) for attrs in validated_data]
+    Flight.objects.bulk_create(flights, batch_size=BULK_MAX_ITEMS)
+    # Tekil oluşturmada olduğu gibi yeni uçuşlar için gecikme bildirimi gitmez
+    for flight in flights:
+      flight.snapshot_tracked_fields()
+    return flights
+
+  def update(self, instances, validated_data):
+    fields = set()
+    for instance, attrs in zip(self._targets, validated_data):
+      for attr, value in attrs.items():
+        setattr(instance, attr, value)
+      fields.update(attrs)
+      previous = instance.get_loaded_value('status')
+      if previous != instance.status:
+        self.status_changes.append((instance.pk, instance.flight_number, previous, instance.status))
+        if previous != 'delayed' and instance.status == 'delayed':
+          self.delayed_flights.append(instance)
+
+    if fields:
+      # bulk_update auto_now alanlarını doldurmaz
+      now = timezone.now()
+      for instance in self._targets:
+        instance.updated_at = now
+      fields.add('updated_at')
+      Flight.objects.bulk_update(self._targets, sorted(fields), batch_size=BULK_MAX_ITEMS)
+    for instance in self._targets:
+      instance.snapshot_tracked_fields()
+    return self._targets
+
 
 class FlightSerializer(serializers.ModelSerializer):
   class Meta:
     model = Flight
     fields = '__all__'
+    list_serializer_class = FlightListSerializer
+
+
+class FlightCrewSerializer(serializers.ModelSerializer):
+  """?expand=crew için yalın ekip gösterimi (uçuş alanı tekrar edilmez)"""
+  class Meta:
+    model = CrewMember
+    fields = ['id', 'name', 'role']
+
+
+class FlightWithCrewSerializer(FlightSerializer):
+  crew = FlightCrewSerializer(many=True, read_only=True)
@@ -1,13 +1,61 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
 from .models import Flight
-from notifications.tasks import send_flight_delay_notification
+from .cache import invalidate_flight_cache
+from .changes import DELETE, FLIGHT, UPSERT, record_changes
+from .events import publish_status_changes
+from notifications.outbox import record_delay_events
+
+_UNKNOWN = object()
 
 @receiver(pre_save, sender=Flight)
-def flight_status_change_handler(sender, instance, **kwargs):
+def flight_status_change_handler(sender, instance, update_fields=None, **kwargs):
   if not instance.pk:
     return 
+  if update_fields is not None and 'status' not in update_fields:
+    return
+
+  # Eski durum, model yüklenirken/kaydedilirken alınan anlık görüntüden okunur.
+  # Görüntü yoksa (ör. pk elle verilmiş yeni nesne) tek alanlık sorguya düşülür.
+  previous = instance.get_loaded_value('status', _UNKNOWN)
+  if previous is _UNKNOWN:
+    previous = Flight.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    if previous is None:
+      return
+
+  # Olaylar, satır gerçekten yazıldıktan sonra post_save'de üretilir
+  if previous != instance.status:
+    instance._status_transition = (previous, instance.status)
+
+
+@receiver(post_save, sender=Flight)
+def flight_status_event_handler(sender, instance, created, **kwargs):
+  transition = instance.__dict__.pop('_status_transition', None)
+  if transition is None:
+    return
+  previous, status = transition
+  if previous != 'delayed' and status == 'delayed':
+    # Flight.save atomic olduğundan outbox kaydı güncellemeyle birlikte commit/rollback olur
+    record_delay_events([(instance.pk, instance.flight_number)])
+  # Anlık yayın sadece commit sonrası; Redis hatası kaydetmeyi bozmaz
+  change = (instance.pk, instance.flight_number, previous, status)
+  transaction.on_commit(lambda: publish_status_changes([change]), robust=True)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def flight_cache_invalidation_handler(sender, instance, **kwargs):
+  # Admin, shell veya API fark etmeksizin her yazmada uçuş cache'i düşer
+  invalidate_flight_cache()
+
+
+@receiver(post_save, sender=Flight)
+def flight_change_log_handler(sender, instance, **kwargs):
+  record_changes(FLIGHT, UPSERT, [instance.pk])
+
 
-  old = Flight.objects.get(pk=instance.pk)
-  if old.status != 'delayed' and instance.status == 'delayed':
-    send_flight_delay_notification.delay(instance.pk, instance.flight_number)
+@receiver(post_delete, sender=Flight)
+def flight_delete_change_log_handler(sender, instance, **kwargs):
+  # perform_destroy, toplu silme ve admin silmeleri için tombstone
+  record_changes(FLIGHT, DELETE, [instance.pk])
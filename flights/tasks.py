@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task
+def prune_change_log():
+  """Saklama süresini aşmış delta senkronizasyon kayıtlarını temizler"""
+  from django.conf import settings
+  from .changes import prune
+  return prune(settings.FLIGHT_CHANGES_RETENTION)
@@ -0,0 +1,167 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from drf_case.aio import async_read_urls
+from flights.models import Flight
+from flights.urls import router as flight_router
+from flights.views import async_flight_detail, async_flight_list
+from crew.models import CrewMember
+from crew.urls import router as crew_router
+from crew.views import async_crew_list
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def async_views():
+  patterns = async_read_urls(flight_router.urls, {
+    'flight-list': async_flight_list,
+    'flight-detail': async_flight_detail,
+  }) + async_read_urls(crew_router.urls, {'crewmember-list': async_crew_list})
+  return {pattern.name: pattern.callback for pattern in patterns if iscoroutinefunction(pattern.callback)}
+
+
+class AsyncReadViewTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_async",
+      password="secret123",
+      email="viewer_async@test.com",
+      role="viewer"
+    )
+    self.auth = f"Bearer {AccessToken.for_user(self.user)}"
+    self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+    self.flights = [
+      Flight.objects.create(
+        flight_number=f"AS{i:03d}",
+        origin="Ankara",
+        destination="Viyana",
+        scheduled_time=timezone.now() + timedelta(hours=i + 1),
+        status="planned",
+        gate=f"A{i}"
+      )
+      for i in range(3)
+    ]
+    for i, flight in enumerate(self.flights):
+      CrewMember.objects.create(name=f"Crew {i}", role="pilot", assigned_flight=flight)
+    self.views = async_views()
+    self.factory = RequestFactory()
+
+  def call(self, name, path, **kwargs):
+    request = self.factory.get(path, HTTP_AUTHORIZATION=self.auth, **kwargs.pop('headers', {}))
+    response = async_to_sync(self.views[name])(request, **kwargs)
+    # Senkron yola düşen DRF yanıtlarını normalde handler render eder
+    if hasattr(response, 'render'):
+      response.render()
+    return response
+
+  def test_cached_list_served_without_sync_view(self):
+    """Test that a cached flight list is returned by the async path as-is"""
+    url = reverse('flight-list') + "?page_size=2&ordering=flight_number"
+    expected = self.client.get(url)
+
+    with patch("flights.views.FlightViewSet.list") as mock_list:
+      response = self.call('flight-list', url)
+
+    self.assertFalse(mock_list.called)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.content, expected.content)
+    self.assertEqual(response["ETag"], expected["ETag"])
+    self.assertEqual(response["Allow"], expected["Allow"])
+
+  def test_list_cache_miss_falls_back_to_sync_view(self):
+    """Test that an uncached list is built by the regular view and cached"""
+    url = reverse('flight-list') + "?page_size=2&status=planned"
+    response = self.call('flight-list', url)
+    self.assertEqual(response.status_code, 200)
+
+    with patch("flights.views.FlightViewSet.list") as mock_list:
+      again = self.call('flight-list', url)
+    self.assertFalse(mock_list.called)
+    self.assertEqual(again.content, response.content)
+
+  def test_list_not_modified(self):
+    """Test that a matching If-None-Match gets 304 from the async path"""
+    url = reverse('flight-list') + "?page_size=2"
+    etag = self.client.get(url)["ETag"]
+    response = self.call('flight-list', url, headers={'HTTP_IF_NONE_MATCH': etag})
+    self.assertEqual(response.status_code, 304)
+    self.assertEqual(response["ETag"], etag)
+
+  def test_invalid_expand_uses_sync_error_response(self):
+    """Test that validation errors are produced by the regular view"""
+    url = reverse('flight-list') + "?expand=pilots"
+    response = self.call('flight-list', url)
+    self.assertEqual(response.status_code, 400)
+    self.assertIn(b"Unknown expansion", response.content)
+
+  def test_detail_matches_sync_response(self):
+    """Test that flight detail from the async ORM path matches the DRF response"""
+    url = reverse('flight-detail', args=[self.flights[0].pk])
+    expected = self.client.get(url)
+
+    with patch("flights.views.FlightViewSet.retrieve") as mock_retrieve:
+      response = self.call('flight-detail', url, pk=str(self.flights[0].pk))
+
+    self.assertFalse(mock_retrieve.called)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response["Content-Type"], expected["Content-Type"])
+    self.assertEqual(response.content, expected.content)
+    self.assertEqual(response["ETag"], expected["ETag"])
+
+  def test_missing_detail_returns_drf_404(self):
+    """Test that unknown flights get the regular 404 response"""
+    url = reverse('flight-detail', args=[999999])
+    response = self.call('flight-detail', url, pk="999999")
+    self.assertEqual(response.status_code, 404)
+    self.assertEqual(response.content, self.client.get(url).content)
+
+  def test_crew_page_matches_sync_response(self):
+    """Test that the async crew page has the same body as the DRF list"""
+    url = reverse('crewmember-list') + "?page=2&page_size=2"
+    expected = self.client.get(url)
+
+    with patch("crew.views.CrewMemberViewSet.list") as mock_list:
+      response = self.call('crewmember-list', url)
+
+    self.assertFalse(mock_list.called)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.content, expected.content)
+    self.assertEqual(response["ETag"], expected["ETag"])
+
+  def test_crew_page_out_of_range(self):
+    """Test that an invalid crew page gets the regular 404 response"""
+    url = reverse('crewmember-list') + "?page=50"
+    response = self.call('crewmember-list', url)
+    self.assertEqual(response.status_code, 404)
+
+  def test_anonymous_request_rejected(self):
+    """Test that requests without a valid token get the regular 401"""
+    request = self.factory.get(reverse('flight-list'))
+    response = async_to_sync(self.views['flight-list'])(request)
+    self.assertEqual(response.status_code, 401)
+
+  def test_writes_delegated_to_sync_view(self):
+    """Test that non-read requests go through the regular permission checks"""
+    request = self.factory.post(reverse('flight-list'), {}, content_type="application/json", HTTP_AUTHORIZATION=self.auth)
+    response = async_to_sync(self.views['flight-list'])(request)
+    self.assertEqual(response.status_code, 403)
+
+  def test_health_check(self):
+    """Test that the async health check responds"""
+    response = self.client.get(reverse('health_check'))
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json()["status"], "healthy")
+
+  def test_extra_routes_not_shadowed(self):
+    """Test that wrapping keeps router order so list actions are not taken as a pk"""
+    patterns = async_read_urls(flight_router.urls, {'flight-detail': async_flight_detail})
+    names = [pattern.name for pattern in patterns]
+    self.assertLess(names.index('flight-export'), names.index('flight-detail'))
+    self.assertEqual(len(patterns), len(flight_router.urls))
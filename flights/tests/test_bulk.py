@@ -0,0 +1,146 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from flights.models import Flight
+from crew.models import CrewMember
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightBulkAPITest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.staff_user = User.objects.create_user(
+      username="staff_bulk",
+      password="secret123",
+      email="staff_bulk@test.com",
+      role="staff"
+    )
+    self.viewer_user = User.objects.create_user(
+      username="viewer_bulk",
+      password="secret123",
+      email="viewer_bulk@test.com",
+      role="viewer"
+    )
+    self.flights = [
+      Flight.objects.create(
+        flight_number=f"BK{i:03d}",
+        origin="İstanbul",
+        destination="Londra",
+        scheduled_time=timezone.now() + timedelta(hours=i + 1),
+        status="planned",
+        airline="Turkish Airlines",
+        gate=f"B{i}"
+      )
+      for i in range(3)
+    ]
+    self.url = reverse('flight-bulk-create')
+    self.client.force_authenticate(self.staff_user)
+
+  def _new_flight(self, number, **extra):
+    data = {
+      "flight_number": number,
+      "origin": "Ankara",
+      "destination": "Viyana",
+      "scheduled_time": (timezone.now() + timedelta(hours=5)).isoformat(),
+      "status": "planned",
+      "airline": "AnadoluJet",
+    }
+    data.update(extra)
+    return data
+
+  def test_bulk_create(self):
+    """Test creating several flights in one request"""
+    payload = [self._new_flight("BK100"), self._new_flight("BK101", gate="C3")]
+    with patch("flights.views.invalidate_flight_cache") as mock_invalidate:
+      response = self.client.post(self.url, payload, format='json')
+    self.assertEqual(response.status_code, 201)
+    self.assertEqual([item["flight_number"] for item in response.data], ["BK100", "BK101"])
+    self.assertTrue(all(item["id"] for item in response.data))
+    self.assertEqual(Flight.objects.filter(flight_number__in=["BK100", "BK101"]).count(), 2)
+    mock_invalidate.assert_called_once()
+
+  def test_bulk_create_rejects_duplicates_in_payload(self):
+    """Test that duplicate flight numbers inside one request are rejected"""
+    payload = [self._new_flight("BK200"), self._new_flight("BK200")]
+    response = self.client.post(self.url, payload, format='json')
+    self.assertEqual(response.status_code, 400)
+    self.assertFalse(Flight.objects.filter(flight_number="BK200").exists())
+
+  def test_bulk_create_reports_item_errors(self):
+    """Test that per-item validation errors are returned and nothing is written"""
+    payload = [self._new_flight("BK300"), self._new_flight("BK000")]
+    response = self.client.post(self.url, payload, format='json')
+    self.assertEqual(response.status_code, 400)
+    self.assertEqual(response.data[0], {})
+    self.assertIn("flight_number", response.data[1])
+    self.assertFalse(Flight.objects.filter(flight_number="BK300").exists())
+
+  @patch("flights.views.record_delay_events")
+  def test_bulk_update_batches_delay_notifications(self, mock_task):
+    """Test mass delay sends one batched notification and invalidates the cache once"""
+    payload = [{"id": flight.pk, "status": "delayed"} for flight in self.flights[:2]]
+    payload.append({"id": self.flights[2].pk, "gate": "Z9"})
+
+    with patch("flights.views.invalidate_flight_cache") as mock_invalidate:
+      with self.captureOnCommitCallbacks(execute=True):
+        response = self.client.patch(self.url, payload, format='json')
+
+    self.assertEqual(response.status_code, 200)
+    mock_invalidate.assert_called_once()
+    mock_task.assert_called_once_with([(f.pk, f.flight_number) for f in self.flights[:2]])
+    self.assertEqual(
+      list(Flight.objects.order_by('flight_number').values_list('status', 'gate')),
+      [("delayed", "B0"), ("delayed", "B1"), ("planned", "Z9")]
+    )
+
+  @patch("flights.views.record_delay_events")
+  def test_bulk_update_already_delayed_not_notified(self, mock_task):
+    """Test that flights already delayed are not reported again"""
+    self.flights[0].status = "delayed"
+    self.flights[0].save()
+    payload = [{"id": self.flights[0].pk, "status": "delayed"}]
+    with self.captureOnCommitCallbacks(execute=True):
+      response = self.client.patch(self.url, payload, format='json')
+    self.assertEqual(response.status_code, 200)
+    self.assertFalse(mock_task.called)
+
+  def test_bulk_update_sets_updated_at(self):
+    """Test that bulk updates refresh updated_at like single saves"""
+    before = self.flights[0].updated_at
+    response = self.client.patch(self.url, [{"id": self.flights[0].pk, "gate": "U1"}], format='json')
+    self.assertEqual(response.status_code, 200)
+    self.flights[0].refresh_from_db()
+    self.assertGreater(self.flights[0].updated_at, before)
+
+  def test_bulk_update_unknown_id(self):
+    """Test that an unknown id fails the whole batch"""
+    payload = [{"id": self.flights[0].pk, "gate": "Q1"}, {"id": 999999, "gate": "Q2"}]
+    response = self.client.patch(self.url, payload, format='json')
+    self.assertEqual(response.status_code, 400)
+    self.assertIn("id", response.data[1])
+    self.flights[0].refresh_from_db()
+    self.assertEqual(self.flights[0].gate, "B0")
+
+  def test_bulk_delete(self):
+    """Test deleting several flights (and their crew) in one request"""
+    CrewMember.objects.create(name="Bulk Pilot", role="pilot", assigned_flight=self.flights[0])
+    ids = [self.flights[0].pk, self.flights[1].pk]
+    with patch("drf_case.cache.bump_namespace_version") as mock_bump:
+      response = self.client.delete(self.url, {"ids": ids}, format='json')
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.data["deleted"], 2)
+    self.assertFalse(Flight.objects.filter(pk__in=ids).exists())
+    self.assertFalse(CrewMember.objects.filter(name="Bulk Pilot").exists())
+    # Namespace başına tek artış (flights + crew)
+    self.assertEqual(sorted(call.args[0] for call in mock_bump.call_args_list), ["crew", "flights"])
+
+  def test_bulk_endpoints_forbidden_for_viewer(self):
+    """Test that viewers cannot use bulk endpoints"""
+    self.client.force_authenticate(self.viewer_user)
+    self.assertEqual(self.client.post(self.url, [self._new_flight("BK400")], format='json').status_code, 403)
+    self.assertEqual(self.client.patch(self.url, [{"id": self.flights[0].pk}], format='json').status_code, 403)
+    self.assertEqual(self.client.delete(self.url, {"ids": [self.flights[0].pk]}, format='json').status_code, 403)
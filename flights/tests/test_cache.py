@@ -0,0 +1,222 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIRequestFactory
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import Mock, patch
+import gzip
+import json
+import uuid
+from flights.models import Flight
+from flights.cache import FLIGHTS_NAMESPACE, flight_list_cache_key
+from flights.views import FlightPagination
+from drf_case.cache import (
+  LOCK_KEY,
+  bump_namespace_version,
+  fetch_versioned,
+  get_namespace_version,
+  get_versioned,
+  set_versioned,
+)
+
+User = get_user_model()
+
+
+class FlightCacheInvalidationTest(TestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.flight = Flight.objects.create(
+      flight_number="TK4242",
+      origin="Ankara",
+      destination="Berlin",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned",
+      airline="Turkish Airlines",
+      gate="B1"
+    )
+
+  def test_flight_save_bumps_namespace_version(self):
+    """Test that saving a flight bumps the flights namespace version"""
+    version = get_namespace_version(FLIGHTS_NAMESPACE)
+    self.flight.gate = "B2"
+    self.flight.save()
+    self.assertGreater(get_namespace_version(FLIGHTS_NAMESPACE), version)
+
+  def test_flight_delete_bumps_namespace_version(self):
+    """Test that deleting a flight bumps the flights namespace version"""
+    version = get_namespace_version(FLIGHTS_NAMESPACE)
+    self.flight.delete()
+    self.assertGreater(get_namespace_version(FLIGHTS_NAMESPACE), version)
+
+  def test_flight_write_invalidates_only_flight_entries(self):
+    """Test that flight writes leave unrelated cache keys untouched"""
+    cache.set("unrelated_test_key", "keep-me", timeout=60)
+    set_versioned(FLIGHTS_NAMESPACE, "test_entry", "cached", timeout=60)
+    self.assertEqual(get_versioned(FLIGHTS_NAMESPACE, "test_entry"), "cached")
+
+    self.flight.status = "departed"
+    self.flight.save()
+
+    self.assertIsNone(get_versioned(FLIGHTS_NAMESPACE, "test_entry"))
+    self.assertEqual(cache.get("unrelated_test_key"), "keep-me")
+    cache.delete("unrelated_test_key")
+
+
+class FlightListCacheKeyTest(TestCase):
+  def _key(self, query):
+    request = Request(APIRequestFactory().get('/api/flights/' + query))
+    return flight_list_cache_key(request, FlightPagination())
+
+  def test_param_order_does_not_matter(self):
+    """Test that parameter order produces the same cache key"""
+    self.assertEqual(
+      self._key("?origin=Ankara&page=2"),
+      self._key("?page=2&origin=Ankara")
+    )
+
+  def test_multi_value_status_is_normalized(self):
+    """Test that repeated status values are sorted and deduplicated"""
+    self.assertEqual(
+      self._key("?status=planned&status=delayed"),
+      self._key("?status=delayed&status=planned&status=delayed")
+    )
+
+  def test_page_size_is_clamped(self):
+    """Test that page_size above the maximum maps to the maximum"""
+    self.assertEqual(self._key("?page_size=1000"), self._key("?page_size=100"))
+
+  def test_empty_values_are_ignored(self):
+    """Test that empty parameters do not change the cache key"""
+    self.assertEqual(self._key("?status=planned&search="), self._key("?status=planned"))
+
+  def test_different_filters_have_different_keys(self):
+    """Test that different filters never share a cache entry"""
+    self.assertNotEqual(self._key("?status=planned"), self._key("?status=delayed"))
+
+
+class FlightListResponseCacheTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_cache",
+      password="secret123",
+      email="viewer_cache@test.com",
+      role="viewer"
+    )
+    self.flight = Flight.objects.create(
+      flight_number="TK5151",
+      origin="Ankara",
+      destination="Roma",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned",
+      airline="Turkish Airlines",
+      gate="C1"
+    )
+    self.client.force_authenticate(self.user)
+
+  def test_filtered_list_is_served_from_cache(self):
+    """Test that a filtered, paginated list is cached until a flight write"""
+    url = reverse('flight-list') + "?status=planned&page_size=5"
+    first = self.client.get(url)
+    self.assertEqual(first.status_code, 200)
+    self.assertEqual(first.data["count"], 1)
+
+    # Sinyal tetiklemeyen güncelleme cache'i bozmaz
+    Flight.objects.filter(pk=self.flight.pk).update(status="landed")
+    cached = self.client.get(url)
+    self.assertEqual(json.loads(cached.content)["count"], 1)
+
+    # Model üzerinden yazma cache'i geçersiz kılar
+    self.flight.refresh_from_db()
+    self.flight.save()
+    fresh = self.client.get(url)
+    self.assertEqual(fresh.data["count"], 0)
+
+  def test_cache_hit_returns_prerendered_json(self):
+    """Test that a cache hit returns the same JSON body without re-rendering"""
+    url = reverse('flight-list') + "?status=planned"
+    first = self.client.get(url)
+    with patch("rest_framework.renderers.JSONRenderer.render") as mock_render:
+      cached = self.client.get(url)
+      mock_render.assert_not_called()
+    self.assertEqual(cached.status_code, 200)
+    self.assertEqual(cached["Content-Type"], "application/json")
+    self.assertEqual(json.loads(cached.content), json.loads(first.content))
+
+  @patch("drf_case.cache.GZIP_MIN_SIZE", 0)
+  def test_cache_hit_gzip_content_negotiation(self):
+    """Test that gzipped bodies are sent as-is only to gzip-capable clients"""
+    url = reverse('flight-list') + "?status=planned"
+    first = self.client.get(url)
+
+    compressed = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+    self.assertEqual(compressed["Content-Encoding"], "gzip")
+    self.assertIn("Accept-Encoding", compressed["Vary"])
+    self.assertEqual(json.loads(gzip.decompress(compressed.content)), json.loads(first.content))
+
+    plain = self.client.get(url)
+    self.assertFalse(plain.has_header("Content-Encoding"))
+    self.assertEqual(json.loads(plain.content), json.loads(first.content))
+
+  def test_invalid_filter_is_not_cached(self):
+    """Test that validation errors are not stored in the cache"""
+    url = reverse('flight-list') + "?status=unknown"
+    self.assertEqual(self.client.get(url).status_code, 400)
+    self.assertEqual(self.client.get(url).status_code, 400)
+
+
+class StampedeProtectionTest(TestCase):
+  namespace = "stampede_test"
+
+  def setUp(self):
+    """Use a unique key per test so runs never share entries"""
+    self.key = f"stampede:{uuid.uuid4().hex}"
+    get_namespace_version(self.namespace)
+
+  def _fetch(self, build, soft_timeout=60):
+    return fetch_versioned(self.namespace, self.key, build, soft_timeout=soft_timeout, hard_timeout=300)
+
+  def _hold_lock(self):
+    version = get_namespace_version(self.namespace)
+    cache.add(LOCK_KEY.format(key=self.key), 1, timeout=10, version=version)
+
+  def test_fresh_entry_is_not_rebuilt(self):
+    """Test that a hit inside the soft TTL never calls build"""
+    build = Mock(return_value="v1")
+    self.assertEqual(self._fetch(build), "v1")
+    self.assertEqual(self._fetch(build), "v1")
+    build.assert_called_once()
+
+  def test_soft_expired_entry_is_rebuilt_by_lock_holder(self):
+    """Test that the worker holding the lock refreshes a soft-expired entry"""
+    self._fetch(Mock(return_value="old"), soft_timeout=0)
+    self.assertEqual(self._fetch(Mock(return_value="new")), "new")
+
+  def test_soft_expired_entry_served_stale_while_locked(self):
+    """Test that other workers keep getting the stale value during a rebuild"""
+    self._fetch(Mock(return_value="old"), soft_timeout=0)
+    self._hold_lock()
+    build = Mock(return_value="new")
+    self.assertEqual(self._fetch(build), "old")
+    build.assert_not_called()
+
+  def test_last_good_value_served_after_invalidation(self):
+    """Test that a version bump falls back to the last good copy while locked"""
+    self._fetch(Mock(return_value="old"))
+    bump_namespace_version(self.namespace)
+    self._hold_lock()
+    build = Mock(return_value="new")
+    self.assertEqual(self._fetch(build), "old")
+    build.assert_not_called()
+
+  @patch("drf_case.cache.time.sleep")
+  def test_builds_when_nothing_to_serve(self, mock_sleep):
+    """Test that a locked miss without a stale copy eventually builds itself"""
+    self._hold_lock()
+    build = Mock(return_value="value")
+    with patch("drf_case.cache.time.time", side_effect=[0, 0, 5]):
+      self.assertEqual(self._fetch(build), "value")
+    build.assert_called_once()
@@ -0,0 +1,102 @@
+from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+import time
+from flights.models import Flight
+from crew.models import CrewMember
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightConditionalRequestTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_etag",
+      password="secret123",
+      email="viewer_etag@test.com",
+      role="viewer"
+    )
+    self.client.force_authenticate(self.user)
+    self.flight = Flight.objects.create(
+      flight_number="ET100",
+      origin="Ankara",
+      destination="Oslo",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned",
+      gate="E1"
+    )
+    self.list_url = reverse('flight-list') + "?page_size=10"
+    self.detail_url = reverse('flight-detail', args=[self.flight.pk])
+
+  def test_list_sends_validators(self):
+    """Test that list responses carry ETag and Last-Modified headers"""
+    with patch("drf_case.conditional.time.time", return_value=time.time() + 2):
+      response = self.client.get(self.list_url)
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response["ETag"].startswith('W/"'))
+    self.assertTrue(response.has_header("Last-Modified"))
+
+  def test_unchanged_list_returns_304_without_work(self):
+    """Test that a matching If-None-Match skips queries and serialization"""
+    etag = self.client.get(self.list_url)["ETag"]
+    with CaptureQueriesContext(connection) as ctx, \
+         patch("flights.views.FlightViewSet.list") as mock_list:
+      response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(response.status_code, 304)
+    self.assertEqual(response["ETag"], etag)
+    self.assertFalse(mock_list.called)
+    self.assertEqual(len(ctx.captured_queries), 0)
+
+  def test_write_changes_etag(self):
+    """Test that a flight write invalidates previously issued ETags"""
+    etag = self.client.get(self.list_url)["ETag"]
+    self.flight.gate = "E2"
+    self.flight.save()
+    response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(response.status_code, 200)
+    self.assertNotEqual(response["ETag"], etag)
+
+  def test_etag_depends_on_query(self):
+    """Test that different queries get different ETags"""
+    first = self.client.get(self.list_url)["ETag"]
+    second = self.client.get(self.list_url + "&status=planned")["ETag"]
+    self.assertNotEqual(first, second)
+
+  def test_detail_if_modified_since(self):
+    """Test that the detail view honours If-Modified-Since"""
+    with patch("drf_case.conditional.time.time", return_value=time.time() + 2):
+      response = self.client.get(self.detail_url)
+    self.assertEqual(response.status_code, 200)
+    response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    self.assertEqual(response.status_code, 304)
+
+  def test_no_last_modified_within_the_write_second(self):
+    """Test that Last-Modified is withheld until the second of the last write is over"""
+    # Saat, setUp'taki yazmanın saniyesi içinde sabitlenir
+    with patch("drf_case.conditional.time.time", return_value=time.time() - 5):
+      response = self.client.get(self.detail_url)
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response.has_header("ETag"))
+    self.assertFalse(response.has_header("Last-Modified"))
+
+  def test_expanded_etag_changes_on_crew_write(self):
+    """Test that ?expand=crew ETags also follow crew writes"""
+    url = self.list_url + "&expand=crew"
+    etag = self.client.get(url)["ETag"]
+    CrewMember.objects.create(name="Etag Pilot", role="pilot", assigned_flight=self.flight)
+    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.data["results"][0]["crew"][0]["name"], "Etag Pilot")
+
+  def test_updated_at_set_on_save(self):
+    """Test that updated_at moves forward on save"""
+    before = self.flight.updated_at
+    self.flight.gate = "E3"
+    self.flight.save()
+    self.assertGreater(self.flight.updated_at, before)
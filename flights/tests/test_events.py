@@ -0,0 +1,178 @@
+import asyncio
+import json
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.tokens import AccessToken
+from flights.models import Flight
+from flights.events import get_broker, publish_status_changes
+from users.claims import set_role_claims
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightStatusPublishTest(TestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.flight = Flight.objects.create(
+      flight_number="EV100",
+      origin="Ankara",
+      destination="Prag",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned"
+    )
+
+  @patch("flights.signals.publish_status_changes")
+  def test_status_transition_published_after_commit(self, mock_publish):
+    """Test that status transitions are published only once the write commits"""
+    with self.captureOnCommitCallbacks(execute=False) as callbacks:
+      self.flight.status = "departed"
+      self.flight.save()
+    self.assertFalse(mock_publish.called)
+
+    for callback in callbacks:
+      callback()
+    mock_publish.assert_called_once_with([(self.flight.pk, "EV100", "planned", "departed")])
+
+  @patch("flights.signals.publish_status_changes")
+  def test_other_updates_not_published(self, mock_publish):
+    """Test that saves without a status change publish nothing"""
+    with self.captureOnCommitCallbacks(execute=True):
+      self.flight.gate = "P1"
+      self.flight.save()
+    self.assertFalse(mock_publish.called)
+
+
+class FlightEventBrokerTest(SimpleTestCase):
+  async def _drain(self, broker, queues):
+    for queue in queues:
+      broker.unsubscribe(queue)
+    await asyncio.sleep(0.05)
+
+  async def test_fan_out_to_many_idle_subscribers(self):
+    """Test that one Redis subscription fans a message out to every subscriber"""
+    broker = get_broker()
+    queues = [broker.subscribe() for _ in range(2000)]
+    try:
+      await asyncio.wait_for(broker.ready.wait(), timeout=5)
+      publish_status_changes([(1, "EV1", "planned", "delayed")])
+      messages = await asyncio.wait_for(asyncio.gather(*(queue.get() for queue in queues)), timeout=5)
+    finally:
+      await self._drain(broker, queues)
+
+    self.assertEqual(len(messages), 2000)
+    self.assertEqual(json.loads(messages[0])["status"], "delayed")
+    self.assertIsNone(broker._task)
+
+  async def test_malformed_payload_does_not_stop_listener(self):
+    """Test that a bad pubsub message is skipped and later events still arrive"""
+    broker = get_broker()
+    queue = broker.subscribe()
+    try:
+      await asyncio.wait_for(broker.ready.wait(), timeout=5)
+      with self.assertLogs("flights.events", level="ERROR"):
+        get_redis_connection("default").publish(settings.FLIGHT_EVENTS_CHANNEL, b"{not json")
+        publish_status_changes([(2, "EV2", "planned", "delayed")])
+        message = await asyncio.wait_for(queue.get(), timeout=5)
+    finally:
+      await self._drain(broker, [queue])
+    self.assertEqual(json.loads(message)["flight_number"], "EV2")
+
+  async def test_listener_restarts_after_unexpected_error(self):
+    """Test that an unexpected subscription failure restarts the listener"""
+    broker = get_broker()
+    subscribe = aioredis.client.PubSub.subscribe
+    calls = []
+
+    async def flaky_subscribe(pubsub, *channels):
+      calls.append(channels)
+      if len(calls) == 1:
+        raise RuntimeError("boom")
+      return await subscribe(pubsub, *channels)
+
+    with patch.object(aioredis.client.PubSub, "subscribe", flaky_subscribe):
+      queue = broker.subscribe()
+      try:
+        with self.assertLogs("flights.events", level="ERROR"):
+          await asyncio.wait_for(broker.ready.wait(), timeout=5)
+      finally:
+        await self._drain(broker, [queue])
+    self.assertEqual(len(calls), 2)
+
+  async def test_slow_subscriber_drops_oldest(self):
+    """Test that a full subscriber queue keeps only the newest messages"""
+    broker = get_broker()
+    queue = broker.subscribe()
+    try:
+      for i in range(broker.queue_size + 5):
+        broker.dispatch(str(i))
+      self.assertEqual(queue.qsize(), broker.queue_size)
+      self.assertEqual(queue.get_nowait(), "5")
+    finally:
+      await self._drain(broker, [queue])
+
+
+class FlightEventStreamTest(TestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_events",
+      password="secret123",
+      email="viewer_events@test.com",
+      role="viewer"
+    )
+
+  def _token(self):
+    return str(set_role_claims(AccessToken.for_user(self.user), self.user))
+
+  async def test_stream_requires_token(self):
+    """Test that the event stream rejects anonymous clients"""
+    response = await self.async_client.get(reverse('flight-events'))
+    self.assertEqual(response.status_code, 401)
+
+  async def test_stream_rejects_inactive_user(self):
+    """Test that a deactivated user's still-valid token is refused"""
+    token = self._token()
+    self.user.is_active = False
+    await self.user.asave()
+    response = await self.async_client.get(reverse('flight-events'), {"token": token})
+    self.assertEqual(response.status_code, 401)
+
+  async def test_stream_rejects_revoked_role(self):
+    """Test that a token issued before a role change is refused"""
+    token = self._token()
+    self.user.role = "staff"
+    await self.user.asave()
+    response = await self.async_client.get(reverse('flight-events'), {"token": token})
+    self.assertEqual(response.status_code, 401)
+
+  def test_stream_not_served_under_wsgi(self):
+    """Test that a WSGI worker refuses the stream instead of blocking on it"""
+    response = self.client.get(reverse('flight-events'), {"token": self._token()})
+    self.assertEqual(response.status_code, 501)
+
+  async def test_stream_delivers_status_events(self):
+    """Test that a connected client receives published transitions as SSE"""
+    response = await self.async_client.get(reverse('flight-events'), {"token": self._token()})
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response["Content-Type"], "text/event-stream")
+
+    stream = aiter(response.streaming_content)
+    try:
+      self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+      await asyncio.wait_for(get_broker().ready.wait(), timeout=5)
+      publish_status_changes([(7, "EV7", "planned", "delayed")])
+      chunk = (await asyncio.wait_for(anext(stream), timeout=5)).decode()
+    finally:
+      await stream.aclose()
+      await asyncio.sleep(0.05)
+
+    event, data = chunk.strip().split("\n")
+    self.assertEqual(event, "event: flight.status")
+    self.assertEqual(json.loads(data[len("data: "):])["flight_number"], "EV7")
@@ -0,0 +1,88 @@
+from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from flights.models import Flight
+from crew.models import CrewMember
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightExpandCrewTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_expand",
+      password="secret123",
+      email="viewer_expand@test.com",
+      role="viewer"
+    )
+    self.client.force_authenticate(self.user)
+    self._create_flights(0, 2)
+
+  def _create_flights(self, start, count):
+    for i in range(start, start + count):
+      flight = Flight.objects.create(
+        flight_number=f"EX{i:03d}",
+        origin="İstanbul",
+        destination="Londra",
+        scheduled_time=timezone.now() + timedelta(hours=i + 1),
+        status="planned",
+        airline="Turkish Airlines",
+      )
+      for name, role in (("Pilot", "pilot"), ("Copilot", "copilot"), ("Attendant", "attendant")):
+        CrewMember.objects.create(name=f"{name} {i}", role=role, assigned_flight=flight)
+
+  def _list_queries(self, query):
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(reverse('flight-list') + query)
+    self.assertEqual(response.status_code, 200)
+    return response, len(ctx.captured_queries)
+
+  def test_expand_crew_includes_nested_crew(self):
+    """Test that ?expand=crew nests a lean crew list into each flight"""
+    response, _ = self._list_queries("?expand=crew&page_size=10")
+    flight = response.data["results"][0]
+    self.assertEqual(
+      [member["name"] for member in flight["crew"]],
+      ["Attendant 1", "Copilot 1", "Pilot 1"]
+    )
+    self.assertEqual(set(flight["crew"][0]), {"id", "name", "role"})
+
+  def test_expand_crew_uses_constant_queries(self):
+    """Test that the number of queries does not grow with the page size"""
+    _, small = self._list_queries("?expand=crew&page_size=2")
+    self._create_flights(2, 8)
+    _, large = self._list_queries("?expand=crew&page_size=10")
+    self.assertEqual(small, large)
+    # COUNT + uçuş sayfası + ekip prefetch'i
+    self.assertEqual(large, 3)
+
+  def test_list_without_expand_has_no_crew(self):
+    """Test that the default representation is unchanged"""
+    response, _ = self._list_queries("?page_size=10")
+    self.assertNotIn("crew", response.data["results"][0])
+
+  def test_crew_write_invalidates_expanded_list(self):
+    """Test that expanded responses are refreshed after a crew change"""
+    url = "?expand=crew&page_size=10"
+    self._list_queries(url)
+    CrewMember.objects.filter(name="Pilot 1").get().delete()
+    response, _ = self._list_queries(url)
+    self.assertEqual(len(response.data["results"][0]["crew"]), 2)
+
+  def test_unknown_expansion_rejected(self):
+    """Test that unsupported expansions return 400"""
+    response = self.client.get(reverse('flight-list') + "?expand=pilots")
+    self.assertEqual(response.status_code, 400)
+    self.assertIn("expand", response.data)
+
+  def test_retrieve_with_expand(self):
+    """Test that the detail endpoint honours ?expand=crew"""
+    flight = Flight.objects.get(flight_number="EX000")
+    response = self.client.get(reverse('flight-detail', args=[flight.pk]) + "?expand=crew")
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(len(response.data["crew"]), 3)
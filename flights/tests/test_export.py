@@ -0,0 +1,103 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework_simplejwt.tokens import AccessToken
+import csv
+import io
+import json
+from flights.models import Flight
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightExportTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_export",
+      password="secret123",
+      email="viewer_export@test.com",
+      role="viewer"
+    )
+    self.client.force_authenticate(self.user)
+    for i in range(5):
+      Flight.objects.create(
+        flight_number=f"XP{i:03d}",
+        origin="İstanbul",
+        destination="Londra",
+        scheduled_time=timezone.now() + timedelta(hours=i + 1),
+        status="delayed" if i % 2 else "planned",
+        airline="Turkish Airlines",
+        gate=None if i == 0 else f"X{i}"
+      )
+    self.url = reverse('flight-export')
+
+  def _body(self, response):
+    self.assertTrue(response.streaming)
+    return b''.join(response.streaming_content).decode('utf-8')
+
+  def test_export_ndjson_by_default(self):
+    """Test that the export streams one JSON object per line"""
+    response = self.client.get(self.url)
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+    self.assertIn('filename="flights.ndjson"', response["Content-Disposition"])
+
+    rows = [json.loads(line) for line in self._body(response).splitlines()]
+    self.assertEqual(len(rows), 5)
+    self.assertEqual(rows[0]["origin"], "İstanbul")
+    # Varsayılan sıralama: en geç uçuş önce
+    self.assertEqual(rows[0]["flight_number"], "XP004")
+
+  def test_export_csv(self):
+    """Test that ?format=csv streams a header and one row per flight"""
+    response = self.client.get(self.url + "?format=csv&ordering=flight_number")
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+    rows = list(csv.DictReader(io.StringIO(self._body(response))))
+    self.assertEqual(len(rows), 5)
+    self.assertEqual(rows[0]["flight_number"], "XP000")
+    self.assertEqual(rows[0]["gate"], "")
+
+  def test_export_honors_filters_and_fields(self):
+    """Test that FlightFilter and ?fields= apply to the export"""
+    response = self.client.get(self.url + "?status=delayed&fields=flight_number,status")
+    rows = [json.loads(line) for line in self._body(response).splitlines()]
+    self.assertEqual(
+      sorted(rows, key=lambda row: row["flight_number"]),
+      [{"flight_number": "XP001", "status": "delayed"}, {"flight_number": "XP003", "status": "delayed"}]
+    )
+
+  def test_export_reads_in_chunks(self):
+    """Test that rows are read through a chunked iterator"""
+    with patch("flights.views.EXPORT_CHUNK_SIZE", 2), \
+         patch("django.db.models.query.QuerySet.iterator", autospec=True, side_effect=lambda qs, chunk_size=None: iter(list(qs))) as mock_iterator:
+      response = self.client.get(self.url)
+      self.assertEqual(len(self._body(response).splitlines()), 5)
+    self.assertEqual(mock_iterator.call_args.kwargs["chunk_size"], 2)
+
+  async def test_export_streams_asynchronously_under_asgi(self):
+    """Test that the ASGI export streams chunks instead of buffering the body"""
+    with patch("flights.views.EXPORT_CHUNK_SIZE", 2):
+      response = await self.async_client.get(self.url, headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"})
+      self.assertEqual(response.status_code, 200)
+      self.assertTrue(response.is_async)
+      chunks = [chunk async for chunk in response.streaming_content]
+    self.assertEqual(len(chunks), 3)
+    rows = [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+    self.assertEqual(len(rows), 5)
+
+  def test_export_invalid_filter(self):
+    """Test that invalid filters fail before streaming starts"""
+    response = self.client.get(self.url + "?status=unknown")
+    self.assertEqual(response.status_code, 400)
+
+  def test_export_requires_authentication(self):
+    """Test that anonymous users cannot export flights"""
+    self.client.force_authenticate(None)
+    response = self.client.get(self.url)
+    self.assertEqual(response.status_code, 401)
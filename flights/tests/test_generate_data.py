@@ -0,0 +1,72 @@
+from io import StringIO
+from rest_framework.test import APITestCase
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, F
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from flights.models import Flight
+from crew.models import CrewMember
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def generate(*args):
+  call_command('generate_data', *args, stdout=StringIO())
+
+
+class GenerateDataTest(APITestCase):
+  def test_generates_flights_and_crew(self):
+    """Test that every flight gets one pilot, one copilot and attendants within the range"""
+    generate('--flights', '120', '--crew-per-flight', '3-5', '--seed', '1', '--batch-size', '50')
+    self.assertEqual(Flight.objects.count(), 120)
+    self.assertEqual(len(set(Flight.objects.values_list('flight_number', flat=True))), 120)
+    sizes = Flight.objects.annotate(size=Count('crew')).values_list('size', flat=True)
+    self.assertTrue(all(3 <= size <= 5 for size in sizes))
+    for role in ('pilot', 'copilot'):
+      self.assertEqual(CrewMember.objects.filter(role=role).count(), 120)
+
+  def test_statuses_follow_schedule(self):
+    """Test that past flights are landed/departed and future flights are not"""
+    generate('--flights', '300', '--seed', '2')
+    now = timezone.now()
+    past = set(Flight.objects.filter(scheduled_time__lt=now).values_list('status', flat=True))
+    future = set(Flight.objects.filter(scheduled_time__gte=now).values_list('status', flat=True))
+    self.assertTrue(past <= {'landed', 'departed', 'delayed'})
+    self.assertTrue(future <= {'planned', 'delayed'})
+    self.assertFalse(Flight.objects.filter(origin=F('destination')).exists())
+
+  def test_seed_is_reproducible(self):
+    """Test that the same seed generates the same rows"""
+    generate('--flights', '40', '--seed', '3')
+    first = list(Flight.objects.order_by('id').values_list('origin', 'destination', 'scheduled_time', 'status', 'gate'))
+    generate('--flights', '40', '--seed', '3', '--clear')
+    second = list(Flight.objects.order_by('id').values_list('origin', 'destination', 'scheduled_time', 'status', 'gate'))
+    self.assertEqual(first, second)
+    self.assertEqual(Flight.objects.count(), 40)
+
+  def test_queries_do_not_grow_per_row(self):
+    """Test that a batch is written with a constant number of queries"""
+    with CaptureQueriesContext(connection) as small:
+      generate('--flights', '5', '--crew-per-flight', '2', '--seed', '4')
+    with CaptureQueriesContext(connection) as large:
+      generate('--flights', '20', '--crew-per-flight', '2', '--seed', '4')
+    self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+  def test_expires_delta_sync_tokens(self):
+    """Test that clients holding an older change token are told to reload"""
+    user = User.objects.create_user(username="gen_viewer", password="secret123", email="gen@test.com")
+    self.client.force_authenticate(user)
+    url = reverse('flight-changes')
+    token = self.client.get(url).data["next"]
+    generate('--flights', '5', '--seed', '5')
+    self.assertEqual(self.client.get(url, {"since": token}).status_code, 410)
+    fresh = self.client.get(url).data["next"]
+    self.assertEqual(self.client.get(url, {"since": fresh}).status_code, 200)
+
+  def test_rejects_invalid_crew_range(self):
+    """Test that malformed --crew-per-flight values are rejected"""
+    with self.assertRaises(CommandError):
+      generate('--flights', '1', '--crew-per-flight', '5-2')
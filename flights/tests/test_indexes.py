@@ -0,0 +1,113 @@
+from unittest import skipUnless
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+from datetime import datetime, time, timedelta
+from flights.filters import FlightFilter
+from flights.models import Flight
+from crew.models import CrewMember
+
+
+class ScheduledDateFilterTest(TestCase):
+  def setUp(self):
+    """Set up flights around a day boundary"""
+    self.day = timezone.now().date() + timedelta(days=3)
+    midnight = timezone.make_aware(datetime.combine(self.day, time.min))
+    self.inside = Flight.objects.create(
+      flight_number="SD001",
+      origin="Ankara",
+      destination="Berlin",
+      scheduled_time=midnight,
+      airline="Turkish Airlines"
+    )
+    Flight.objects.create(
+      flight_number="SD002",
+      origin="Ankara",
+      destination="Berlin",
+      scheduled_time=midnight + timedelta(days=1),
+      airline="Turkish Airlines"
+    )
+    Flight.objects.create(
+      flight_number="SD003",
+      origin="Ankara",
+      destination="Berlin",
+      scheduled_time=midnight - timedelta(microseconds=1),
+      airline="Turkish Airlines"
+    )
+
+  def test_scheduled_date_matches_date_lookup(self):
+    """Test that the range filter returns exactly the __date lookup rows"""
+    qs = FlightFilter({'scheduled_date': self.day.isoformat()}, queryset=Flight.objects.all()).qs
+    self.assertEqual(list(qs), [self.inside])
+    self.assertEqual(list(qs), list(Flight.objects.filter(scheduled_time__date=self.day)))
+
+  def test_scheduled_date_is_sargable(self):
+    """Test that the filter compares the raw column instead of casting it"""
+    qs = FlightFilter({'scheduled_date': self.day.isoformat()}, queryset=Flight.objects.all()).qs
+    sql = str(qs.query)
+    self.assertIn('"flights_flight"."scheduled_time" >=', sql)
+    self.assertIn('"flights_flight"."scheduled_time" <', sql)
+    self.assertNotIn('cast_date', sql.lower())
+    self.assertNotIn('::date', sql.lower())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are only checked on PostgreSQL')
+class FlightIndexPlanTest(TestCase):
+  def setUp(self):
+    """Turn off sequential scans so the planner reveals usable indexes on tiny tables"""
+    with connection.cursor() as cursor:
+      cursor.execute("SET LOCAL enable_seqscan = off")
+
+  def _assert_index_scan(self, queryset, *index_names):
+    plan = queryset.explain()
+    self.assertTrue(any(name in plan for name in index_names), plan)
+    self.assertNotIn('Seq Scan', plan)
+
+  def test_default_ordering_uses_index(self):
+    """Test that the default -scheduled_time, id listing is served by an index"""
+    self._assert_index_scan(
+      Flight.objects.order_by('-scheduled_time', 'id')[:10],
+      'flight_sched_desc_id_idx'
+    )
+
+  def test_status_and_time_range_use_index(self):
+    """Test that status + scheduled_time range filters use the composite index"""
+    now = timezone.now()
+    self._assert_index_scan(
+      Flight.objects.filter(status='delayed', scheduled_time__gte=now, scheduled_time__lte=now + timedelta(days=1)),
+      # status='delayed' kısmi index koşulunu da sağladığı için ikisi de uygun
+      'flight_status_sched_idx', 'flight_active_sched_idx'
+    )
+
+  def test_scheduled_date_uses_index(self):
+    """Test that the sargable scheduled_date filter can use a scheduled_time index"""
+    qs = FlightFilter({'scheduled_date': timezone.now().date().isoformat()}, queryset=Flight.objects.all()).qs
+    plan = qs.explain()
+    self.assertIn('Index', plan)
+    self.assertNotIn('Seq Scan', plan)
+
+  def test_active_flights_use_partial_index(self):
+    """Test that planned/delayed board queries use the partial index"""
+    now = timezone.now()
+    self._assert_index_scan(
+      Flight.objects.filter(status__in=['planned', 'delayed'], scheduled_time__gte=now).order_by('scheduled_time'),
+      'flight_active_sched_idx', 'flight_status_sched_idx'
+    )
+
+  def test_icontains_filter_uses_trigram_index(self):
+    """Test that FlightFilter substring filters hit the trigram GIN index"""
+    qs = FlightFilter({'origin': 'stan'}, queryset=Flight.objects.all()).qs
+    self._assert_index_scan(qs, 'flight_origin_trgm_idx')
+
+  def test_search_across_fields_uses_trigram_indexes(self):
+    """Test that the SearchFilter OR over search_fields is served by trigram indexes"""
+    term = 'TK12'
+    condition = Q()
+    for field in ['flight_number', 'origin', 'destination', 'airline', 'gate']:
+      condition |= Q(**{f'{field}__icontains': term})
+    self._assert_index_scan(Flight.objects.filter(condition), 'trgm_idx')
+
+  def test_crew_name_search_uses_trigram_index(self):
+    """Test that crew name substring search hits the trigram GIN index"""
+    self._assert_index_scan(CrewMember.objects.filter(name__icontains='pilot'), 'crew_name_trgm_idx')
@@ -0,0 +1,148 @@
+from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from drf_case.pagination import CachedCountPaginator
+from flights.models import Flight
+from django.contrib.auth import get_user_model
+import json
+
+User = get_user_model()
+
+
+class FlightKeysetPaginationTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_keyset",
+      password="secret123",
+      email="viewer_keyset@test.com",
+      role="viewer"
+    )
+    base = timezone.now()
+    # Aynı saate planlanmış uçuşlar eşitlik bozucu id'yi de test eder
+    offsets = [5, 4, 4, 4, 3, 2, 1]
+    self.flights = [
+      Flight.objects.create(
+        flight_number=f"KS{i:03d}",
+        origin="Ankara",
+        destination="Berlin",
+        scheduled_time=base + timedelta(hours=offset),
+        status="planned",
+        airline="Turkish Airlines"
+      )
+      for i, offset in enumerate(offsets)
+    ]
+    self.client.force_authenticate(self.user)
+
+  def _walk(self, url):
+    ids = []
+    while url:
+      response = self.client.get(url)
+      self.assertEqual(response.status_code, 200)
+      body = json.loads(response.content)
+      self.assertNotIn("count", body)
+      ids.extend(item["id"] for item in body["results"])
+      url = body["next"]
+    return ids
+
+  def test_keyset_walk_matches_ordering(self):
+    """Test that following cursors returns every flight once in -scheduled_time, id order"""
+    expected = [
+      f.pk for f in sorted(self.flights, key=lambda f: (-f.scheduled_time.timestamp(), f.pk))
+    ]
+    ids = self._walk(reverse('flight-list') + "?pagination=keyset&page_size=3")
+    self.assertEqual(ids, expected)
+
+  def test_keyset_respects_filters(self):
+    """Test that keyset pagination applies on top of FlightFilter"""
+    self.flights[0].status = "delayed"
+    self.flights[0].save()
+    ids = self._walk(reverse('flight-list') + "?pagination=keyset&page_size=2&status=planned")
+    self.assertEqual(len(ids), len(self.flights) - 1)
+    self.assertNotIn(self.flights[0].pk, ids)
+
+  def test_keyset_page_runs_no_count_or_offset(self):
+    """Test that a keyset page is fetched without COUNT(*) or OFFSET"""
+    first = json.loads(self.client.get(reverse('flight-list') + "?pagination=keyset&page_size=3").content)
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(first["next"])
+    self.assertEqual(response.status_code, 200)
+    for query in ctx.captured_queries:
+      self.assertNotIn("COUNT(", query["sql"].upper())
+      self.assertNotIn("OFFSET", query["sql"].upper())
+
+  def test_invalid_cursor_returns_404(self):
+    """Test that a tampered cursor is rejected"""
+    response = self.client.get(reverse('flight-list') + "?cursor=not-a-cursor")
+    self.assertEqual(response.status_code, 404)
+
+
+class FlightCachedCountPaginationTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_count",
+      password="secret123",
+      email="viewer_count@test.com",
+      role="viewer"
+    )
+    for i in range(4):
+      Flight.objects.create(
+        flight_number=f"CC{i:03d}",
+        origin="İzmir",
+        destination="Paris",
+        scheduled_time=timezone.now() + timedelta(hours=i),
+        status="planned",
+        airline="Pegasus Airlines"
+      )
+    self.client.force_authenticate(self.user)
+
+  def test_count_is_exact_and_flagged(self):
+    """Test that paginated responses report an exact count"""
+    response = self.client.get(reverse('flight-list') + "?origin=İzmir&page_size=2")
+    body = json.loads(response.content)
+    self.assertEqual(body["count"], 4)
+    self.assertTrue(body["count_exact"])
+
+  def test_count_is_reused_across_pages(self):
+    """Test that later pages of the same filter do not run COUNT(*) again"""
+    self.client.get(reverse('flight-list') + "?origin=İzmir&page_size=2")
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(reverse('flight-list') + "?origin=İzmir&page_size=2&page=2")
+    self.assertEqual(json.loads(response.content)["count"], 4)
+    self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+
+  def test_count_invalidated_on_write(self):
+    """Test that a flight write refreshes the cached count"""
+    self.client.get(reverse('flight-list') + "?origin=İzmir&page_size=2")
+    Flight.objects.filter(flight_number="CC000").delete()
+    response = self.client.get(reverse('flight-list') + "?origin=İzmir&page_size=2&page=2")
+    self.assertEqual(json.loads(response.content)["count"], 3)
+
+  def test_count_key_separates_values_rendering_alike(self):
+    """Test that filter values which render to the same SQL text get distinct count keys"""
+    gate = '"flights_flight"."gate"'
+    first = Flight.objects.filter(airline="x", gate=f"y AND {gate} = z")
+    second = Flight.objects.filter(airline=f"x AND {gate} = y", gate="z")
+    self.assertEqual(str(first.query), str(second.query))
+    paginator = CachedCountPaginator(first, 2, namespace="flights", timeout=60, estimate_threshold=0)
+    self.assertNotEqual(paginator._count_key(first), paginator._count_key(second))
+
+  @patch("drf_case.pagination.CachedCountPaginator._estimate_count", return_value=250000)
+  def test_unfiltered_count_uses_planner_estimate(self, mock_estimate):
+    """Test that large unfiltered tables report the planner estimate"""
+    body = json.loads(self.client.get(reverse('flight-list') + "?page=1").content)
+    self.assertEqual(body["count"], 250000)
+    self.assertFalse(body["count_exact"])
+
+  @patch("drf_case.pagination.CachedCountPaginator._estimate_count", return_value=250000)
+  def test_filtered_count_never_estimated(self, mock_estimate):
+    """Test that filtered queries always get an exact count"""
+    body = json.loads(self.client.get(reverse('flight-list') + "?origin=İzmir").content)
+    self.assertEqual(body["count"], 4)
+    self.assertTrue(body["count_exact"])
+    mock_estimate.assert_not_called()
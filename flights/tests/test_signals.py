@@ -1,7 +1,10 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from datetime import timedelta
 from flights.models import Flight
+from notifications.models import OutboxEvent
 from unittest.mock import patch
 
 
@@ -18,16 +21,16 @@ class FlightSignalTest(TestCase):
       gate="A1"
     )
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_delayed_triggers_notification(self, mock_task):
     """Test that changing status to delayed triggers notification"""
     self.flight.status = "delayed"
     self.flight.save()
     
     self.assertTrue(mock_task.called)
-    mock_task.assert_called_with(self.flight.pk, self.flight.flight_number)
+    mock_task.assert_called_with([(self.flight.pk, self.flight.flight_number)])
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_planned_to_delayed_triggers_notification(self, mock_task):
     """Test specific transition from planned to delayed"""
     # Ensure initial status is planned
@@ -39,9 +42,9 @@ class FlightSignalTest(TestCase):
     
     # Check notification was sent
     self.assertTrue(mock_task.called)
-    mock_task.assert_called_once_with(self.flight.pk, self.flight.flight_number)
+    mock_task.assert_called_once_with([(self.flight.pk, self.flight.flight_number)])
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_departed_no_notification(self, mock_task):
     """Test that changing to departed status doesn't trigger delay notification"""
     self.flight.status = "departed"
@@ -50,7 +53,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_landed_no_notification(self, mock_task):
     """Test that changing to landed status doesn't trigger delay notification"""
     self.flight.status = "landed"
@@ -59,7 +62,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_cancelled_no_notification(self, mock_task):
     """Test that changing to cancelled status doesn't trigger delay notification"""
     self.flight.status = "cancelled"
@@ -68,7 +71,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_multiple_status_changes(self, mock_task):
     """Test multiple status changes and notification behavior"""
     # First change to delayed
@@ -86,7 +89,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger additional delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_delayed_to_delayed_no_duplicate_notification(self, mock_task):
     """Test that keeping status as delayed doesn't trigger duplicate notifications"""
     # Set initial status to delayed
@@ -105,7 +108,7 @@ class FlightSignalTest(TestCase):
 
   def test_flight_creation_with_delayed_status(self):
     """Test creating a flight with delayed status from the start"""
-    with patch("notifications.tasks.send_flight_delay_notification.delay") as mock_task:
+    with patch("flights.signals.record_delay_events") as mock_task:
       delayed_flight = Flight.objects.create(
         flight_number="TK9999",
         origin="Ankara",
@@ -120,12 +123,12 @@ class FlightSignalTest(TestCase):
       # Only check if notification was called, don't enforce it
       # This test documents the current behavior
       if mock_task.called:
-        mock_task.assert_called_with(delayed_flight.pk, delayed_flight.flight_number)
+        mock_task.assert_called_with([(delayed_flight.pk, delayed_flight.flight_number)])
       else:
         # Signal only triggers on update, not creation
         pass
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_status_cancelled_no_notification(self, mock_task):
     """Test that changing to cancelled status doesn't trigger delay notification"""
     self.flight.status = "cancelled"
@@ -134,7 +137,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_multiple_status_changes(self, mock_task):
     """Test multiple status changes and notification behavior"""
     # First change to delayed
@@ -152,7 +155,7 @@ class FlightSignalTest(TestCase):
     # Should not trigger additional delay notification
     self.assertFalse(mock_task.called)
 
-  @patch("notifications.tasks.send_flight_delay_notification.delay")
+  @patch("flights.signals.record_delay_events")
   def test_delayed_to_delayed_no_duplicate_notification(self, mock_task):
     """Test that keeping status as delayed doesn't trigger duplicate notifications"""
     # Set initial status to delayed
@@ -171,7 +174,7 @@ class FlightSignalTest(TestCase):
 
   def test_flight_creation_with_delayed_status(self):
     """Test creating a flight with delayed status from the start"""
-    with patch("notifications.tasks.send_flight_delay_notification.delay") as mock_task:
+    with patch("flights.signals.record_delay_events") as mock_task:
       delayed_flight = Flight.objects.create(
         flight_number="TK9999",
         origin="Ankara",
@@ -186,7 +189,48 @@ class FlightSignalTest(TestCase):
       # Only check if notification was called, don't enforce it
       # This test documents the current behavior
       if mock_task.called:
-        mock_task.assert_called_with(delayed_flight.pk, delayed_flight.flight_number)
+        mock_task.assert_called_with([(delayed_flight.pk, delayed_flight.flight_number)])
       else:
         # Signal only triggers on update, not creation
         pass
+
+  def test_delay_event_written_to_outbox(self):
+    """Test that a delay transition is stored in the outbox with the flight update"""
+    self.flight.status = "delayed"
+    self.flight.save()
+
+    event = OutboxEvent.objects.get(aggregate_id=self.flight.pk)
+    self.assertEqual(event.event_type, OutboxEvent.FLIGHT_DELAYED)
+    self.assertEqual(event.payload, {"flight_number": self.flight.flight_number})
+    self.assertIsNone(event.published_at)
+
+  def test_outbox_event_rolled_back_with_flight_update(self):
+    """Test that a rolled back update leaves no outbox event behind"""
+    with self.assertRaises(RuntimeError):
+      with transaction.atomic():
+        self.flight.status = "delayed"
+        self.flight.save()
+        raise RuntimeError("rollback")
+
+    self.assertFalse(OutboxEvent.objects.exists())
+    self.assertEqual(Flight.objects.get(pk=self.flight.pk).status, "planned")
+
+  @patch("flights.signals.record_delay_events")
+  def test_status_change_detected_without_select(self, mock_task):
+    """Test that saving a loaded flight does not re-query its previous status"""
+    flight = Flight.objects.get(pk=self.flight.pk)
+    flight.status = "delayed"
+    with CaptureQueriesContext(connection) as ctx:
+      flight.save()
+
+    self.assertFalse(any(q["sql"].upper().startswith("SELECT") for q in ctx.captured_queries))
+    mock_task.assert_called_once_with([(flight.pk, flight.flight_number)])
+
+  @patch("flights.signals.record_delay_events")
+  def test_refresh_from_db_updates_snapshot(self, mock_task):
+    """Test that a flight delayed elsewhere is not reported again after refresh"""
+    Flight.objects.filter(pk=self.flight.pk).update(status="delayed")
+    self.flight.refresh_from_db()
+    self.flight.save()
+
+    self.assertFalse(mock_task.called)
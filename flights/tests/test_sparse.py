@@ -0,0 +1,95 @@
+from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from flights.models import Flight
+from crew.models import CrewMember
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class FlightSparseFieldsTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_sparse",
+      password="secret123",
+      email="viewer_sparse@test.com",
+      role="viewer"
+    )
+    self.client.force_authenticate(self.user)
+    self.flights = [
+      Flight.objects.create(
+        flight_number=f"SP{i:03d}",
+        origin="İzmir",
+        destination="Viyana",
+        scheduled_time=timezone.now() + timedelta(hours=i + 1),
+        status="planned",
+        airline="Turkish Airlines",
+        gate=f"S{i}"
+      )
+      for i in range(3)
+    ]
+    CrewMember.objects.create(name="Sparse Pilot", role="pilot", assigned_flight=self.flights[0])
+
+  def _get(self, query):
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(reverse('flight-list') + query)
+    select = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "flights_flight"')]
+    return response, select
+
+  def test_sparse_fields_trim_response_and_columns(self):
+    """Test that only requested fields are serialized and selected"""
+    response, select = self._get("?fields=flight_number,status,gate&page_size=10")
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(set(response.data["results"][0]), {"flight_number", "status", "gate"})
+    self.assertEqual(len(select), 1)
+    self.assertNotIn('"flights_flight"."origin"', select[0])
+    self.assertNotIn('"flights_flight"."airline"', select[0])
+
+  def test_field_order_follows_serializer(self):
+    """Test that request order does not change the response or its cache entry"""
+    first, _ = self._get("?fields=gate,flight_number&page_size=10")
+    second, select = self._get("?fields=flight_number,gate&page_size=10")
+    self.assertEqual(list(first.data["results"][0]), ["flight_number", "gate"])
+    # İkinci istek aynı kanonik anahtarla cache'ten gelir
+    self.assertEqual(select, [])
+    self.assertEqual(second.content, first.content)
+
+  def test_sparse_fields_with_keyset_pagination(self):
+    """Test that keyset cursors still work when the ordering column is not requested"""
+    url = reverse('flight-list') + "?pagination=keyset&page_size=2&fields=flight_number"
+    numbers = []
+    while url:
+      response = self.client.get(url)
+      self.assertEqual(response.status_code, 200)
+      numbers.extend(item["flight_number"] for item in response.data["results"])
+      url = response.data["next"]
+    self.assertEqual(numbers, ["SP002", "SP001", "SP000"])
+
+  def test_sparse_fields_with_expand(self):
+    """Test that expanded crew is only included when requested in fields"""
+    response, _ = self._get("?expand=crew&fields=flight_number,crew&page_size=10")
+    flight = next(f for f in response.data["results"] if f["flight_number"] == "SP000")
+    self.assertEqual(flight, {"flight_number": "SP000", "crew": [
+      {"id": flight["crew"][0]["id"], "name": "Sparse Pilot", "role": "pilot"}
+    ]})
+
+    response, _ = self._get("?expand=crew&fields=flight_number&page_size=10")
+    self.assertEqual(set(response.data["results"][0]), {"flight_number"})
+
+  def test_unknown_field_rejected(self):
+    """Test that unknown fields return 400 and are not cached"""
+    response, _ = self._get("?fields=flight_number,price")
+    self.assertEqual(response.status_code, 400)
+    self.assertIn("fields", response.data)
+
+  def test_detail_with_sparse_fields(self):
+    """Test that the detail endpoint honours ?fields="""
+    response = self.client.get(
+      reverse('flight-detail', args=[self.flights[0].pk]) + "?fields=status"
+    )
+    self.assertEqual(response.data, {"status": "planned"})
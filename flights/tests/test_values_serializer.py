@@ -0,0 +1,116 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+from flights.models import Flight
+from flights.serializers import FlightSerializer, FlightWithCrewSerializer
+from crew.models import CrewMember
+from crew.serializers import CrewMemberSerializer
+from flights.cache import FLIGHTS_NAMESPACE
+from drf_case.cache import bump_namespace_version
+from drf_case.serializers import compile_values_serializer
+
+User = get_user_model()
+
+
+class ValuesSerializerParityTest(TestCase):
+  def setUp(self):
+    """Set up rows covering nulls, unicode and sub-second timestamps"""
+    self.flights = [
+      Flight.objects.create(
+        flight_number="VS001",
+        origin="İstanbul",
+        destination="Zürich",
+        scheduled_time=datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        status="delayed",
+        airline="Turkish Airlines",
+        gate=None
+      ),
+      Flight.objects.create(
+        flight_number="VS002",
+        origin="Ankara",
+        destination="Berlin",
+        scheduled_time=timezone.now() + timedelta(days=3),
+        status="planned",
+        gate="A12"
+      ),
+    ]
+    CrewMember.objects.create(name="Çağrı Öztürk", role="pilot", assigned_flight=self.flights[0])
+    CrewMember.objects.create(name="Deniz Ak", role="attendant", assigned_flight=self.flights[1])
+
+  def _assert_parity(self, serializer_class, queryset):
+    compiled = compile_values_serializer(serializer_class)
+    self.assertIsNotNone(compiled)
+    expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+    actual = JSONRenderer().render(compiled.serialize(compiled.values(queryset)))
+    self.assertEqual(actual, expected)
+
+  def test_flight_output_is_byte_identical(self):
+    """Test that the compiled flight path renders exactly like FlightSerializer"""
+    self._assert_parity(FlightSerializer, Flight.objects.order_by('id'))
+
+  def test_crew_output_is_byte_identical(self):
+    """Test that the compiled crew path renders exactly like CrewMemberSerializer"""
+    self._assert_parity(CrewMemberSerializer, CrewMember.objects.order_by('id'))
+
+  def test_nested_serializers_are_not_compiled(self):
+    """Test that serializers with nested or computed fields fall back to DRF"""
+    class ComputedSerializer(serializers.ModelSerializer):
+      label = serializers.SerializerMethodField()
+
+      def get_label(self, obj):
+        return str(obj)
+
+      class Meta:
+        model = Flight
+        fields = ['id', 'label']
+
+    self.assertIsNone(compile_values_serializer(FlightWithCrewSerializer))
+    self.assertIsNone(compile_values_serializer(ComputedSerializer))
+
+
+class ValuesListEndpointTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    self.user = User.objects.create_user(
+      username="viewer_values",
+      password="secret123",
+      email="viewer_values@test.com",
+      role="viewer"
+    )
+    self.client.force_authenticate(self.user)
+    for i in range(5):
+      Flight.objects.create(
+        flight_number=f"VL{i:03d}",
+        origin="İzmir",
+        destination="Paris",
+        scheduled_time=timezone.now() + timedelta(hours=i),
+        status="planned",
+        gate=None if i % 2 else f"G{i}"
+      )
+
+  def _compare(self, query):
+    url = reverse('flight-list') + query
+    fast = self.client.get(url)
+    bump_namespace_version(FLIGHTS_NAMESPACE)
+    with patch("flights.views.FlightViewSet.get_values_serializer", return_value=None):
+      slow = self.client.get(url)
+    self.assertEqual(fast.status_code, 200)
+    self.assertEqual(fast.content, slow.content)
+
+  def test_paginated_list_matches_serializer_output(self):
+    """Test that paginated responses are identical on both paths"""
+    self._compare("?page_size=100&ordering=flight_number")
+
+  def test_unpaginated_list_matches_serializer_output(self):
+    """Test that the full list is identical on both paths"""
+    self._compare("")
+
+  def test_keyset_list_matches_serializer_output(self):
+    """Test that keyset pages and cursors are identical on both paths"""
+    self._compare("?pagination=keyset&page_size=2&fields=flight_number")
@@ -1,10 +1,21 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import FlightViewSet
+from drf_case.aio import async_read_urls
+from .views import FlightViewSet, async_flight_detail, async_flight_list, flight_events
 
 router = DefaultRouter()
 router.register(r'flights', FlightViewSet)
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+  router_urls = async_read_urls(router_urls, {
+    'flight-list': async_flight_list,
+    'flight-detail': async_flight_detail,
+  })
+
 urlpatterns = [
-  path('', include(router.urls)),
+  # Router'ın flights/<pk>/ kalıbından önce gelmeli
+  path('flights/events/', flight_events, name='flight-events'),
+  path('', include(router_urls)),
 ]
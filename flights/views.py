@@ -1,31 +1,67 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
-from django.core.cache import cache
 from rest_framework.response import Response
+from drf_case.pagination import CachedCountPagination, KeysetPagination, KeysetPaginationMixin
+from drf_case.aio import aauthenticate_token, aconditional, aiter_chunks, finalize, render
+from drf_case.conditional import ConditionalGetMixin
+from drf_case.serializers import ValuesListMixin
+from drf_case.sparse import SparseFieldsetMixin
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from drf_case.cache import afetch_fresh, batched_invalidation, fetch_versioned, render_json_body, prerendered_response
+from notifications.outbox import record_delay_events
 from .models import Flight
-from .serializers import FlightSerializer
+from .serializers import BULK_MAX_ITEMS, FlightSerializer, FlightWithCrewSerializer
+from crew.models import CrewMember
+from crew.cache import CREW_NAMESPACE
 from .filters import FlightFilter
+from .renderers import CSVRenderer, NDJSONRenderer
 from .permissions import IsStaffOrAdmin
+from .events import event_stream, get_broker, publish_status_changes
+from .changes import FLIGHT, UPSERT, format_token, head, parse_token, read_changes, record_changes
+from .cache import (
+  FLIGHTS_NAMESPACE,
+  FLIGHT_LIST_CACHE_SOFT_TIMEOUT,
+  FLIGHT_LIST_CACHE_TIMEOUT,
+  flight_list_cache_key,
+  invalidate_flight_cache,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Dışa aktarmada sunucu taraflı cursor'dan tek seferde okunan satır sayısı
+EXPORT_CHUNK_SIZE = 2000
 
-class FlightPagination(PageNumberPagination):
+
+class FlightPagination(CachedCountPagination):
   """Uçuşlar için özel sayfalama sınıfı"""
+  count_cache_namespace = FLIGHTS_NAMESPACE
   page_size = 10
   page_size_query_param = 'page_size'
   max_page_size = 100
   page_query_param = 'page'
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightKeysetPagination(KeysetPagination):
+  """Derin sayfalar için uçuş keyset sayfalaması (?pagination=keyset)"""
+  ordering = ('-scheduled_time', 'id')
+
+
+class FlightViewSet(ConditionalGetMixin, ValuesListMixin, SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
   queryset = Flight.objects.all()
   serializer_class = FlightSerializer
   pagination_class = FlightPagination
+  keyset_pagination_class = FlightKeysetPagination
+  # ?fields=flight_number,status,gate; keyset cursor'ı scheduled_time'ı okur
+  sparse_required_fields = ('scheduled_time',)
   filterset_class = FlightFilter
   permission_classes = [IsAuthenticated]
   
@@ -39,6 +75,7 @@ class FlightViewSet(viewsets.ModelViewSet):
   # Sıralanabilir alanlar
   ordering_fields = [
     'scheduled_time', 
+    'updated_at',
     'flight_number', 
     'origin', 
     'destination', 
@@ -57,6 +94,46 @@ class FlightViewSet(viewsets.ModelViewSet):
     'gate'
   ]
 
+  conditional_namespaces = (FLIGHTS_NAMESPACE,)
+
+  # ?expand=crew ile genişletilebilen ilişkiler
+  expand_query_param = 'expand'
+  expandable_fields = ('crew',)
+
+  @property
+  def expand(self):
+    """İstekte istenen genişletmeler (ör. ?expand=crew)"""
+    if not hasattr(self, '_expand'):
+      raw = self.request.query_params.get(self.expand_query_param, '')
+      expand = {value.strip() for value in raw.split(',') if value.strip()}
+      unknown = expand.difference(self.expandable_fields)
+      if unknown:
+        raise ValidationError({self.expand_query_param: [
+          f"Unknown expansion: {', '.join(sorted(unknown))}. Allowed: {', '.join(self.expandable_fields)}."
+        ]})
+      self._expand = expand
+    return self._expand
+
+  def get_conditional_namespaces(self):
+    if 'crew' in self.expand:
+      return (FLIGHTS_NAMESPACE, CREW_NAMESPACE)
+    return self.conditional_namespaces
+
+  def get_queryset(self):
+    queryset = super().get_queryset()
+    if self.request.method in SAFE_METHODS and 'crew' in self.expand and self.wants_field('crew'):
+      # Sayfadaki tüm uçuşların ekibi tek ek sorguyla çekilir (N+1 yok)
+      queryset = queryset.prefetch_related(Prefetch(
+        'crew',
+        queryset=CrewMember.objects.only('id', 'name', 'role', 'assigned_flight_id').order_by('name', 'id'),
+      ))
+    return queryset
+
+  def get_serializer_class(self):
+    if self.request.method in SAFE_METHODS and 'crew' in self.expand:
+      return FlightWithCrewSerializer
+    return super().get_serializer_class()
+
   def get_permissions(self):
     if self.request.method in SAFE_METHODS:
       return [IsAuthenticated()]
@@ -64,24 +141,143 @@ class FlightViewSet(viewsets.ModelViewSet):
 
   def perform_create(self, serializer):
     instance = serializer.save()
+    # Uçuş cache'i post_save sinyalinde sürüm artırılarak geçersiz kılınır
     logger.info(f"Yeni uçuş oluşturuldu: {instance}")
-    # Tüm cache'leri temizle çünkü yeni veri eklenmiş
-    cache.clear()
   
   def perform_update(self, serializer):
     instance = serializer.save()
     logger.info(f"Uçuş güncellendi: {instance}")
-    # Tüm cache'leri temizle çünkü veri değişmiş
-    cache.clear()
   
   def perform_destroy(self, instance):
     logger.info(f"Uçuş silindi: {instance}")
     instance.delete()
-    # Tüm cache'leri temizle çünkü veri silinmiş
-    cache.clear()
   
+  @action(detail=False, methods=['post'], url_path='bulk')
+  def bulk_create(self, request):
+    """Uçuş listesini tek transaction'da oluşturur (bulk_create)"""
+    serializer = self.get_serializer(data=request.data, many=True)
+    serializer.is_valid(raise_exception=True)
+    self._bulk_save(serializer)
+    logger.info(f"{len(serializer.instance)} uçuş toplu oluşturuldu")
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+  @bulk_create.mapping.patch
+  def bulk_update(self, request):
+    """`id` içeren kısmi uçuş listesini tek transaction'da günceller (bulk_update)"""
+    if not isinstance(request.data, list) or len(request.data) > BULK_MAX_ITEMS:
+      raise ValidationError({'non_field_errors': [f'Expected a list of at most {BULK_MAX_ITEMS} items.']})
+    ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+    instances = list(Flight.objects.filter(pk__in=[pk for pk in ids if str(pk).isdigit()]))
+    serializer = self.get_serializer(instances, data=request.data, many=True, partial=True)
+    serializer.is_valid(raise_exception=True)
+    self._bulk_save(serializer)
+    logger.info(f"{len(serializer.instance)} uçuş toplu güncellendi")
+    return Response(serializer.data)
+
+  @bulk_create.mapping.delete
+  def bulk_destroy(self, request):
+    """{"ids": [...]} ile verilen uçuşları tek transaction'da siler"""
+    ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    if not isinstance(ids, list) or not ids or len(ids) > BULK_MAX_ITEMS:
+      raise ValidationError({'ids': [f'Expected a list of 1-{BULK_MAX_ITEMS} flight ids.']})
+    if not all(str(pk).isdigit() for pk in ids):
+      raise ValidationError({'ids': ['Flight ids must be integers.']})
+    # Silme (ve CASCADE ile ekip) sinyalleri cache'i blok sonunda bir kez düşürür
+    with batched_invalidation(), transaction.atomic():
+      _, deleted = Flight.objects.filter(pk__in=ids).delete()
+    logger.info(f"Uçuşlar toplu silindi: {ids}")
+    return Response({'deleted': deleted.get(Flight._meta.label, 0)})
+
+  @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+  def export(self, request, *args, **kwargs):
+    """
+    Filtrelenmiş uçuşları NDJSON (varsayılan) ya da CSV (?format=csv) olarak
+    akış halinde döndürür. Satırlar parça parça okunduğu için bellek kullanımı
+    satır sayısından bağımsızdır.
+    """
+    queryset = self.filter_queryset(self.get_queryset())
+    renderer = request.accepted_renderer
+    rows = self.iter_representations(queryset, EXPORT_CHUNK_SIZE)
+    content = renderer.stream(rows)
+    if isinstance(request._request, ASGIRequest):
+      # Cursor'dan parça parça okunur; gövde bellekte toplanmaz
+      content = aiter_chunks(content, EXPORT_CHUNK_SIZE)
+    response = StreamingHttpResponse(
+      content,
+      content_type=f'{renderer.media_type}; charset={renderer.charset}',
+    )
+    response['Content-Disposition'] = f'attachment; filename="flights.{renderer.format}"'
+    logger.info(f"📤 Uçuş dışa aktarımı başladı ({renderer.format})")
+    return response
+
+  @action(detail=False, methods=['get'])
+  def changes(self, request, *args, **kwargs):
+    """
+    `since` token'ından sonraki uçuş/ekip değişikliklerini partiler halinde
+    döndürür. `since` verilmezse sadece güncel token döner; istemci önce bu
+    token'ı alıp tam listeyi çeker, sonra `next` ile değişiklikleri izler.
+    """
+    params = request.query_params
+    if 'since' not in params:
+      return Response({'changes': [], 'next': format_token(head()), 'has_more': False})
+    try:
+      since = parse_token(params['since'])
+    except ValueError:
+      raise ValidationError({'since': ['Expected a token returned by this endpoint.']})
+    try:
+      limit = int(params.get('limit', settings.FLIGHT_CHANGES_BATCH_SIZE))
+    except ValueError:
+      limit = 0
+    if limit <= 0:
+      raise ValidationError({'limit': ['Expected a positive limit.']})
+    limit = min(limit, settings.FLIGHT_CHANGES_MAX_BATCH_SIZE)
+
+    changes, next_token, has_more = read_changes(since, limit)
+    return Response({'changes': changes, 'next': format_token(next_token), 'has_more': has_more})
+
+  def _bulk_save(self, serializer):
+    # Sinyal tetiklemeyen bulk_* yazmaları için cache bir kez düşürülür;
+    # gecikme olayları uçuşlarla aynı transaction'da outbox'a toplu yazılır.
+    try:
+      with transaction.atomic():
+        serializer.save()
+        delayed = [(flight.pk, flight.flight_number) for flight in serializer.delayed_flights]
+        if delayed:
+          record_delay_events(delayed)
+        record_changes(FLIGHT, UPSERT, [flight.pk for flight in serializer.instance])
+    except IntegrityError as exc:
+      raise ValidationError({'non_field_errors': [str(exc)]})
+    invalidate_flight_cache()
+    if serializer.status_changes:
+      changes = serializer.status_changes
+      transaction.on_commit(lambda: publish_status_changes(changes), robust=True)
+
   def list(self, request, *args, **kwargs):
-    # Sadece filtresiz ve arama parametresi olmayan istekleri cache'le
+    # Filtre, arama ve sayfalama kombinasyonları da kanonik sorgu anahtarıyla
+    # cache'lenir; uçuş yazmaları namespace sürümünü artırarak hepsini düşürür.
+    # Aynı anahtar için DB'ye sadece tek bir worker gider (stampede koruması).
+    cache_key = flight_list_cache_key(request, self.paginator, self.expand)
+    built = {}
+
+    def build():
+      built['data'] = self._build_list_data(request, *args, **kwargs)
+      return render_json_body(built['data'])
+
+    rendered = fetch_versioned(
+      FLIGHTS_NAMESPACE,
+      cache_key,
+      build,
+      soft_timeout=FLIGHT_LIST_CACHE_SOFT_TIMEOUT,
+      hard_timeout=FLIGHT_LIST_CACHE_TIMEOUT,
+    )
+    if 'data' in built:
+      return Response(built['data'])
+
+    # Cache'teki hazır JSON (gerekirse gzip'li) gövde doğrudan gönderilir
+    logger.info("✅ Cache'ten alındı.")
+    return prerendered_response(request, rendered)
+
+  def _build_list_data(self, request, *args, **kwargs):
     has_filters = bool(request.query_params.get('flight_number') or 
                       request.query_params.get('origin') or 
                       request.query_params.get('destination') or
@@ -95,24 +291,86 @@ class FlightViewSet(viewsets.ModelViewSet):
                       request.query_params.get('gate'))
 
     has_pagination = bool(request.query_params.get('page') or
-                         request.query_params.get('page_size'))
+                         request.query_params.get('page_size') or
+                         FlightKeysetPagination.is_requested(request))
     
-    # Eğer herhangi bir filtre, arama veya sayfalama parametresi varsa cache kullanma
     if has_filters or has_pagination:
-      logger.info("🔍 Filtreleme/sayfalama var, doğrudan DB'den çekiliyor")
-      return super().list(request, *args, **kwargs)
-    
-    # Cache logic sadece tüm veriler için
-    cache_key = "flight_list_cache_all"
-    data = cache.get(cache_key)
-
-    if data:
-      logger.info("✅ Cache'ten alındı.")
-      return Response(data)
-
-    queryset = self.get_queryset()
-    serializer = self.get_serializer(queryset, many=True)
-    data = serializer.data
-    cache.set(cache_key, data, timeout=300)  # 5 dakika cache
+      # Filtrelenmiş/sayfalanmış sonuç; geçersiz parametrelerde oluşan
+      # hatalar (400/404) cache'e yazılmaz
+      data = super().list(request, *args, **kwargs).data
+    else:
+      # Parametresiz istek tüm uçuşları sayfalamadan döndürür
+      data = self.serialize_queryset(self.get_queryset())
+
     logger.info("📦 DB'den alındı ve cache'e yazıldı.")
-    return Response(data)
+    return data
+
+
+async def flight_events(request):
+  """
+  Uçuş durum geçişlerini Server-Sent Events olarak yayınlar. ASGI altında
+  her bağlantı sadece bir coroutine tutar. EventSource başlık gönderemediği
+  için erişim token'ı `?token=` ile de verilebilir.
+  """
+  if not isinstance(request, ASGIRequest):
+    # WSGI altında akış bir worker'ı bağlantı kapanana kadar kilitler
+    return JsonResponse({'detail': 'Flight events are only served by the ASGI events service.'}, status=501)
+  header = request.headers.get('Authorization', '')
+  raw = header[7:] if header.startswith('Bearer ') else request.GET.get('token', '')
+  try:
+    # Kullanıcı snapshot cache'ten okunur; binlerce bağlantı DB'ye gitmez
+    await aauthenticate_token(raw)
+  except APIException:
+    return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+  broker = get_broker()
+  queue = broker.subscribe()
+  response = StreamingHttpResponse(
+    event_stream(broker, queue, settings.FLIGHT_EVENTS_HEARTBEAT),
+    content_type='text/event-stream',
+  )
+  response['Cache-Control'] = 'no-cache'
+  # nginx'in yanıtı tamponlamaması için
+  response['X-Accel-Buffering'] = 'no'
+  return response
+
+
+async def async_flight_list(view):
+  """
+  Liste yanıtını cache'teki hazır gövdeden döndürür (ASGI okuma yolu). Cache
+  miss ya da soft TTL dolmuşsa None: yenileme senkron yolun stampede
+  korumasıyla yapılır.
+  """
+  state, validators, not_modified = await aconditional(view)
+  if state is None:
+    return None
+  if not_modified is not None:
+    return finalize(view, not_modified, validators)
+
+  # ETag için okunan sürümler cache anahtarında da kullanılır
+  crew_version = state[CREW_NAMESPACE][0] if CREW_NAMESPACE in state else None
+  cache_key = flight_list_cache_key(view.request, view.paginator, view.expand, crew_version=crew_version)
+  rendered = await afetch_fresh(cache_key, version=state[FLIGHTS_NAMESPACE][0])
+  if rendered is None:
+    return None
+  return finalize(view, prerendered_response(view.request, rendered), validators)
+
+
+async def async_flight_detail(view):
+  """Tek uçuşu async ORM ile derlenmiş .values() yolundan döndürür"""
+  # ?fields=/?expand= ve bulunamayan kayıtlar senkron yolda
+  if view.request.query_params or not str(view.kwargs.get('pk', '')).isdigit():
+    return None
+  values_serializer = view.get_values_serializer()
+  if values_serializer is None:
+    return None
+  state, validators, not_modified = await aconditional(view)
+  if state is None:
+    return None
+  if not_modified is not None:
+    return finalize(view, not_modified, validators)
+
+  row = await values_serializer.values(Flight.objects.filter(pk=view.kwargs['pk'])).afirst()
+  if row is None:
+    return None
+  return finalize(view, render(view, values_serializer.serialize([row])[0]), validators)
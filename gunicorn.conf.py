@@ -6,9 +6,20 @@ import os
 bind = "0.0.0.0:8000"
 backlog = 2048
 
+# Çalışma profili: "sync" (WSGI, istek başına bir worker) ya da "asgi"
+# (uvicorn worker'ları; okuma uç noktaları async yoldan yanıtlanır, bkz. drf_case.aio)
+PROFILE = os.getenv("GUNICORN_PROFILE", "sync")
+
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+if PROFILE == "asgi":
+  wsgi_app = "drf_case.asgi:application"
+  worker_class = "uvicorn.workers.UvicornWorker"
+  # Async worker'lar beklerken CPU tutmaz; çekirdek başına bir süreç yeterli
+  workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() + 1))
+else:
+  wsgi_app = "drf_case.wsgi:application"
+  worker_class = "sync"
+  workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -30,8 +41,8 @@ proc_name = 'drf_case_gunicorn'
 preload_app = True
 daemon = False
 pidfile = '/tmp/gunicorn.pid'
-user = 'app'
-group = 'app'
+user = os.getenv("GUNICORN_USER", "app")
+group = os.getenv("GUNICORN_GROUP", "app")
 tmp_upload_dir = None
 
 # Security
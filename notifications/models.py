@@ -0,0 +1,27 @@
+from django.db import models
+from django.db.models import Q
+
+
+class OutboxEvent(models.Model):
+  """
+  Transactional outbox kaydı. Olay, onu doğuran uçuş güncellemesiyle aynı
+  transaction'da yazılır; relay task'ı yayımlanmamış kayıtları partiler
+  halinde okuyup bildirim hattına aktarır (en az bir kez teslim).
+  """
+  FLIGHT_DELAYED = 'flight.delayed'
+
+  event_type = models.CharField(max_length=50)
+  aggregate_id = models.BigIntegerField()
+  payload = models.JSONField(default=dict)
+  created_at = models.DateTimeField(auto_now_add=True)
+  published_at = models.DateTimeField(null=True, blank=True)
+
+  def __str__(self):
+    return f"{self.event_type} #{self.aggregate_id}"
+
+  class Meta:
+    ordering = ['id']
+    indexes = [
+      # Relay sadece yayımlanmamış kayıtları id sırasıyla tarar
+      models.Index(fields=['id'], name='outbox_unpublished_idx', condition=Q(published_at__isnull=True)),
+    ]
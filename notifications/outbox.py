@@ -0,0 +1,68 @@
+"""Flight durum olayları için transactional outbox yazma ve relay işlemleri."""
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxEvent
+from .pipeline import enqueue_delay_events
+
+logger = logging.getLogger(__name__)
+
+
+def record_delay_events(events):
+  """
+  (flight_id, flight_number) gecikme olaylarını outbox'a yazar. Çağıranın
+  transaction'ı içinde çalışır; transaction geri alınırsa olay da kaybolur.
+  """
+  OutboxEvent.objects.bulk_create([
+    OutboxEvent(
+      event_type=OutboxEvent.FLIGHT_DELAYED,
+      aggregate_id=flight_id,
+      payload={'flight_number': flight_number},
+    )
+    for flight_id, flight_number in events
+  ])
+
+
+def relay_batch(batch_size):
+  """
+  Yayımlanmamış en eski `batch_size` olayı kilitleyip bildirim hattına aktarır.
+  SKIP LOCKED sayesinde paralel relay worker'ları aynı kayıtları almaz.
+  Aktarım başarısız olursa transaction geri alınır ve kayıtlar tekrar denenir.
+  """
+  with transaction.atomic():
+    events = list(
+      OutboxEvent.objects
+      .filter(published_at__isnull=True)
+      .order_by('id')
+      .select_for_update(skip_locked=True)[:batch_size]
+    )
+    if not events:
+      return 0
+
+    enqueue_delay_events([
+      (event.aggregate_id, event.payload.get('flight_number'))
+      for event in events
+      if event.event_type == OutboxEvent.FLIGHT_DELAYED
+    ])
+    OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(published_at=timezone.now())
+  return len(events)
+
+
+def relay(batch_size, max_batches):
+  published = 0
+  for _ in range(max_batches):
+    count = relay_batch(batch_size)
+    published += count
+    if count < batch_size:
+      break
+  if published:
+    logger.info(f"📤 Outbox: {published} olay yayımlandı")
+  return published
+
+
+def prune(retention):
+  """Saklama süresini aşmış yayımlanmış kayıtları siler."""
+  cutoff = timezone.now() - timedelta(seconds=retention)
+  deleted, _ = OutboxEvent.objects.filter(published_at__lt=cutoff).delete()
+  return deleted
@@ -0,0 +1,197 @@
+"""
+Gecikme bildirimleri için Redis tamponlu toplu işleme hattı.
+
+Üreticiler (sinyal, toplu güncelleme) olayları Celery'ye tek tek göndermek
+yerine Redis listesine yazar. Aynı uçuşun pencere içindeki tekrar eden
+gecikme geçişleri SET NX ile elenir. Tampon belirli bir boyuta ulaşınca veya
+Celery beat ile periyodik olarak `drain_delay_notifications` task'ı tamponu
+gruplar halinde boşaltır.
+
+Alınan parti teslim edilene kadar drain'e ait bir işlem listesinde durur ve
+ancak `deliver` başarılı olunca silinir. Worker parti ortasında ölürse ya da
+`deliver` hata verirse, PROCESSING_TIMEOUT'u aşmış işlem listeleri sonraki
+drain'in başında tamponun önüne geri alınır (en az bir kez teslim).
+"""
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'notifications:delay:buffer'
+DEDUPE_KEY = 'notifications:delay:dedupe:{flight_id}'
+DRAIN_SCHEDULED_KEY = 'notifications:delay:drain_scheduled'
+PROCESSING_KEY = 'notifications:delay:processing:{drain_id}'
+# İşlem listeleri; skor partinin alındığı an (Redis TIME)
+PROCESSING_SET_KEY = 'notifications:delay:processing'
+# Bir partinin teslimi bu süreden uzun sürmez; aşan liste ölmüş drain'indir (saniye)
+PROCESSING_TIMEOUT = 300
+
+
+def _setting(name, default):
+  return getattr(settings, name, default)
+
+
+# Dedupe kontrolü ve tampona yazma tek atomik adımdır. Önce tampona yazılır,
+# sonra dedupe anahtarları kurulur: RPUSH başarısız olursa hiçbir anahtar
+# yazılmaz ve outbox relay'in tekrar denemesi olayı yeniden kabul eder.
+ENQUEUE_SCRIPT = """
+local window = ARGV[1]
+local seen, accepted = {}, {}
+for i = 2, #KEYS do
+  local key = KEYS[i]
+  if not seen[key] and redis.call('EXISTS', key) == 0 then
+    table.insert(accepted, i - 1)
+  end
+  seen[key] = true
+end
+for _, index in ipairs(accepted) do
+  redis.call('RPUSH', KEYS[1], ARGV[index + 1])
+end
+for _, index in ipairs(accepted) do
+  redis.call('SET', KEYS[index + 1], 1, 'EX', window)
+end
+return {redis.call('LLEN', KEYS[1]), accepted}
+"""
+
+
+def enqueue_delay_events(events):
+  """
+  (flight_id, flight_number) olaylarını tampona yazar. Dedupe penceresinde
+  zaten bildirilmiş uçuşları atlar, kabul edilen olay sayısını döndürür.
+  """
+  events = list(events)
+  if not events:
+    return 0
+
+  conn = get_redis_connection('default')
+  window = _setting('NOTIFICATION_DEDUPE_WINDOW', 600)
+  now = time.time()
+  keys = [BUFFER_KEY] + [DEDUPE_KEY.format(flight_id=flight_id) for flight_id, _ in events]
+  payloads = [
+    json.dumps({'flight_id': flight_id, 'flight_number': flight_number, 'ts': now})
+    for flight_id, flight_number in events
+  ]
+  size, accepted = conn.register_script(ENQUEUE_SCRIPT)(keys=keys, args=[window, *payloads])
+  if not accepted:
+    return 0
+
+  # Tampon dolduysa beat'i beklemeden boşalt; aynı anda tek task planlanır
+  if size >= _setting('NOTIFICATION_BATCH_SIZE', 200) and conn.set(DRAIN_SCHEDULED_KEY, 1, nx=True, ex=5):
+    from .tasks import drain_delay_notifications
+    drain_delay_notifications.delay()
+  return len(accepted)
+
+
+# Partiyi tampondan işlem listesine tek adımda taşır
+POP_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then
+  return items
+end
+redis.call('LTRIM', KEYS[1], #items, -1)
+for _, item in ipairs(items) do
+  redis.call('RPUSH', KEYS[2], item)
+end
+redis.call('ZADD', KEYS[3], redis.call('TIME')[1], KEYS[2])
+return items
+"""
+
+# Süresi aşmış işlem listelerini sıralarını koruyarak tamponun önüne geri koyar
+RECOVER_SCRIPT = """
+local now = tonumber(redis.call('TIME')[1])
+local moved = 0
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now - tonumber(ARGV[1]))) do
+  local items = redis.call('LRANGE', key, 0, -1)
+  for i = #items, 1, -1 do
+    redis.call('LPUSH', KEYS[1], items[i])
+  end
+  moved = moved + #items
+  redis.call('DEL', key)
+  redis.call('ZREM', KEYS[2], key)
+end
+return moved
+"""
+
+
+def pop_batch(conn, size, processing_key):
+  """
+  Tampondan en fazla `size` olayı atomik olarak `processing_key` listesine
+  taşır; parti ack_batch çağrılana kadar orada kalır.
+  """
+  raw = conn.register_script(POP_SCRIPT)(keys=[BUFFER_KEY, processing_key, PROCESSING_SET_KEY], args=[size])
+  return [json.loads(item) for item in raw]
+
+
+def ack_batch(conn, processing_key):
+  """Teslim edilen partiyi işlem listesinden siler."""
+  pipe = conn.pipeline(transaction=True)
+  pipe.delete(processing_key)
+  pipe.zrem(PROCESSING_SET_KEY, processing_key)
+  pipe.execute()
+
+
+def requeue_stale_batches(conn):
+  """Ölmüş drain'lerin teslim edilmemiş partilerini tampona geri alır."""
+  moved = conn.register_script(RECOVER_SCRIPT)(keys=[BUFFER_KEY, PROCESSING_SET_KEY], args=[PROCESSING_TIMEOUT])
+  if moved:
+    logger.warning(f"♻️ Teslim edilmemiş {moved} gecikme olayı tampona geri alındı")
+  return moved
+
+
+def group_events(events):
+  """Olayları uçuşa göre gruplar; aynı uçuşun tekrarları tek kayda iner."""
+  grouped = OrderedDict()
+  for event in events:
+    entry = grouped.setdefault(event['flight_id'], {
+      'flight_id': event['flight_id'],
+      'flight_number': event['flight_number'],
+      'first_seen': event['ts'],
+      'occurrences': 0,
+    })
+    entry['occurrences'] += 1
+  return list(grouped.values())
+
+
+def deliver(notifications):
+  for notification in notifications:
+    logger.warning(
+      f"🚨 Uyarı: {notification['flight_number']} (ID: {notification['flight_id']}) uçuşu gecikmiştir."
+    )
+
+
+def drain(max_batches=None):
+  """Tamponu boşaltır ve her parti için throughput metriklerini döndürür."""
+  conn = get_redis_connection('default')
+  conn.delete(DRAIN_SCHEDULED_KEY)
+  batch_size = _setting('NOTIFICATION_BATCH_SIZE', 200)
+  max_batches = max_batches or _setting('NOTIFICATION_MAX_BATCHES_PER_DRAIN', 50)
+  requeue_stale_batches(conn)
+  processing_key = PROCESSING_KEY.format(drain_id=uuid.uuid4().hex)
+
+  metrics = []
+  for _ in range(max_batches):
+    started = time.monotonic()
+    events = pop_batch(conn, batch_size, processing_key)
+    if not events:
+      break
+    notifications = group_events(events)
+    # Hata olursa parti işlem listesinde kalır ve sonraki drain'lerde geri alınır
+    deliver(notifications)
+    ack_batch(conn, processing_key)
+
+    duration = time.monotonic() - started
+    batch = {
+      'events': len(events),
+      'notifications': len(notifications),
+      'duration_ms': round(duration * 1000, 2),
+      'events_per_sec': round(len(events) / duration, 1) if duration else None,
+      'max_lag_s': round(time.time() - min(event['ts'] for event in events), 3),
+    }
+    metrics.append(batch)
+    logger.info(f"📬 Bildirim partisi işlendi: {batch}")
+  return metrics
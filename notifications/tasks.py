@@ -1,5 +1,29 @@
 from celery import shared_task
+from .pipeline import drain, enqueue_delay_events
 
 @shared_task
 def send_flight_delay_notification(flight_id, flight_number):
-  print(f"🚨 Uyarı: {flight_number} (ID: {flight_id}) uçuşu gecikmiştir.")
+  # Eski sürümden kuyrukta kalmış mesajlar için: olay tampona aktarılır
+  enqueue_delay_events([(flight_id, flight_number)])
+
+
+@shared_task
+def drain_delay_notifications():
+  """Gecikme bildirim tamponunu partiler halinde boşaltır (beat + boyut tetiklemeli)"""
+  return drain()
+
+
+@shared_task
+def relay_outbox():
+  """Outbox'taki yayımlanmamış olayları bildirim hattına aktarır (beat ile periyodik)"""
+  from django.conf import settings
+  from .outbox import relay
+  return relay(settings.OUTBOX_RELAY_BATCH_SIZE, settings.OUTBOX_RELAY_MAX_BATCHES)
+
+
+@shared_task
+def prune_outbox():
+  """Yayımlanmış eski outbox kayıtlarını temizler"""
+  from django.conf import settings
+  from .outbox import prune
+  return prune(settings.OUTBOX_RETENTION)
@@ -0,0 +1,50 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from unittest.mock import patch
+from notifications import outbox
+from notifications.models import OutboxEvent
+from notifications.tasks import prune_outbox, relay_outbox
+
+
+class OutboxRelayTest(TestCase):
+  def setUp(self):
+    """Set up unpublished outbox events"""
+    outbox.record_delay_events([(1, "TK1"), (2, "TK2"), (3, "TK3")])
+
+  @patch("notifications.outbox.enqueue_delay_events")
+  def test_relay_publishes_and_marks_events(self, mock_enqueue):
+    """Test that relayed events are pushed to the pipeline and marked published"""
+    self.assertEqual(relay_outbox(), 3)
+    mock_enqueue.assert_called_once_with([(1, "TK1"), (2, "TK2"), (3, "TK3")])
+    self.assertFalse(OutboxEvent.objects.filter(published_at__isnull=True).exists())
+
+    mock_enqueue.reset_mock()
+    self.assertEqual(relay_outbox(), 0)
+    self.assertFalse(mock_enqueue.called)
+
+  @patch("notifications.outbox.enqueue_delay_events")
+  def test_relay_works_in_batches(self, mock_enqueue):
+    """Test that the relay processes events in bounded batches"""
+    self.assertEqual(outbox.relay(batch_size=2, max_batches=1), 2)
+    self.assertEqual(OutboxEvent.objects.filter(published_at__isnull=True).count(), 1)
+    self.assertEqual(outbox.relay(batch_size=2, max_batches=5), 1)
+    self.assertEqual(mock_enqueue.call_count, 2)
+
+  @patch("notifications.outbox.enqueue_delay_events", side_effect=ConnectionError)
+  def test_failed_publish_is_retried(self, mock_enqueue):
+    """Test that events stay unpublished when the pipeline is unavailable"""
+    with self.assertRaises(ConnectionError):
+      relay_outbox()
+    self.assertEqual(OutboxEvent.objects.filter(published_at__isnull=True).count(), 3)
+
+  def test_prune_removes_only_old_published_events(self):
+    """Test that pruning keeps unpublished and recently published events"""
+    old = timezone.now() - timedelta(days=30)
+    OutboxEvent.objects.filter(aggregate_id=1).update(published_at=old)
+    OutboxEvent.objects.filter(aggregate_id=2).update(published_at=timezone.now())
+
+    self.assertEqual(prune_outbox(), 1)
+    self.assertEqual(
+      sorted(OutboxEvent.objects.values_list('aggregate_id', flat=True)), [2, 3]
+    )
@@ -0,0 +1,111 @@
+from django.test import TestCase, override_settings
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+from unittest.mock import patch
+from notifications import pipeline
+from notifications.tasks import drain_delay_notifications, send_flight_delay_notification
+
+
+class DelayNotificationPipelineTest(TestCase):
+  def setUp(self):
+    """Start every test with an empty buffer and dedupe window"""
+    self.conn = get_redis_connection('default')
+    self._clear()
+    self.addCleanup(self._clear)
+
+  def _clear(self):
+    keys = list(self.conn.scan_iter('notifications:delay:*'))
+    if keys:
+      self.conn.delete(*keys)
+
+  def test_enqueue_buffers_events(self):
+    """Test that events are appended to the Redis buffer"""
+    accepted = pipeline.enqueue_delay_events([(1, "TK1"), (2, "TK2")])
+    self.assertEqual(accepted, 2)
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 2)
+
+  def test_repeated_transitions_are_deduplicated(self):
+    """Test that a flight delayed again inside the window is not buffered twice"""
+    pipeline.enqueue_delay_events([(1, "TK1")])
+    accepted = pipeline.enqueue_delay_events([(1, "TK1"), (2, "TK2")])
+    self.assertEqual(accepted, 1)
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 2)
+
+  def test_failed_push_does_not_consume_dedupe_window(self):
+    """Test that a failed buffer write lets the relay retry the same event"""
+    # Tampon anahtarı yanlış tipte: RPUSH WRONGTYPE ile başarısız olur
+    self.conn.set(pipeline.BUFFER_KEY, "not-a-list")
+    with self.assertRaises(ResponseError):
+      pipeline.enqueue_delay_events([(1, "TK1")])
+    self.assertFalse(self.conn.exists(pipeline.DEDUPE_KEY.format(flight_id=1)))
+
+    self.conn.delete(pipeline.BUFFER_KEY)
+    self.assertEqual(pipeline.enqueue_delay_events([(1, "TK1")]), 1)
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 1)
+
+  def test_same_flight_twice_in_one_call_buffered_once(self):
+    """Test that duplicates inside a single call are deduplicated too"""
+    self.assertEqual(pipeline.enqueue_delay_events([(1, "TK1"), (1, "TK1"), (2, "TK2")]), 2)
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 2)
+
+  @override_settings(NOTIFICATION_BATCH_SIZE=3)
+  @patch("notifications.tasks.drain_delay_notifications.delay")
+  def test_full_buffer_triggers_single_drain(self, mock_drain):
+    """Test that reaching the batch size schedules exactly one drain task"""
+    pipeline.enqueue_delay_events([(1, "TK1"), (2, "TK2")])
+    self.assertFalse(mock_drain.called)
+    pipeline.enqueue_delay_events([(3, "TK3")])
+    pipeline.enqueue_delay_events([(4, "TK4")])
+    mock_drain.assert_called_once()
+
+  @override_settings(NOTIFICATION_BATCH_SIZE=2)
+  def test_drain_processes_batches_and_reports_metrics(self):
+    """Test that draining empties the buffer in batches with throughput metrics"""
+    pipeline.enqueue_delay_events([(i, f"TK{i}") for i in range(5)])
+    with patch("notifications.pipeline.deliver") as mock_deliver:
+      metrics = drain_delay_notifications()
+
+    self.assertEqual([batch["events"] for batch in metrics], [2, 2, 1])
+    for batch in metrics:
+      self.assertIn("duration_ms", batch)
+      self.assertIn("events_per_sec", batch)
+    self.assertEqual(mock_deliver.call_count, 3)
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 0)
+    self.assertEqual(list(self.conn.scan_iter('notifications:delay:processing*')), [])
+
+  def test_failed_delivery_keeps_batch_until_requeued(self):
+    """Test that a batch whose delivery fails is not lost but redelivered by a later drain"""
+    pipeline.enqueue_delay_events([(1, "TK1"), (2, "TK2")])
+    with patch("notifications.pipeline.deliver", side_effect=RuntimeError("smtp down")):
+      with self.assertRaises(RuntimeError):
+        pipeline.drain()
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 0)
+    self.assertEqual(self.conn.zcard(pipeline.PROCESSING_SET_KEY), 1)
+
+    # Süresi dolmamış parti başka bir drain'e ait sayılır ve dokunulmaz
+    with patch("notifications.pipeline.deliver") as mock_deliver:
+      self.assertEqual(pipeline.drain(), [])
+    self.assertFalse(mock_deliver.called)
+
+    with patch("notifications.pipeline.PROCESSING_TIMEOUT", 0), \
+         patch("notifications.pipeline.deliver") as mock_deliver:
+      metrics = pipeline.drain()
+    self.assertEqual([batch["events"] for batch in metrics], [2])
+    delivered = mock_deliver.call_args.args[0]
+    self.assertEqual([n["flight_number"] for n in delivered], ["TK1", "TK2"])
+    self.assertEqual(self.conn.zcard(pipeline.PROCESSING_SET_KEY), 0)
+
+  def test_group_events_merges_same_flight(self):
+    """Test that events for the same flight collapse into one notification"""
+    grouped = pipeline.group_events([
+      {"flight_id": 1, "flight_number": "TK1", "ts": 10.0},
+      {"flight_id": 2, "flight_number": "TK2", "ts": 11.0},
+      {"flight_id": 1, "flight_number": "TK1", "ts": 12.0},
+    ])
+    self.assertEqual([(g["flight_id"], g["occurrences"]) for g in grouped], [(1, 2), (2, 1)])
+    self.assertEqual(grouped[0]["first_seen"], 10.0)
+
+  def test_legacy_task_feeds_buffer(self):
+    """Test that the old per-flight task now only buffers the event"""
+    send_flight_delay_notification(7, "TK7")
+    self.assertEqual(self.conn.llen(pipeline.BUFFER_KEY), 1)
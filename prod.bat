@@ -63,7 +63,7 @@ if "%1"=="cleancache" (
 
 if "%1"=="test" (
   echo Running tests...
-  docker exec drf_case-web-1 python manage.py test users.tests flights.tests crew.tests
+  docker exec drf_case-web-1 python manage.py test users.tests flights.tests crew.tests notifications.tests
   goto :eof
 )
 
@@ -75,6 +75,13 @@ if "%1"=="data" (
   goto :eof
 )
 
+if "%1"=="bigdata" (
+  echo Generating production-sized benchmark data...
+  docker-compose -f %CONFIG_FILE% exec web python manage.py migrate
+  docker-compose -f %CONFIG_FILE% exec web python manage.py generate_data --flights 1000000 --crew-per-flight 4-8
+  goto :eof
+)
+
 REM Help
 echo.
 echo Deployment commands:
@@ -88,4 +95,5 @@ echo   prod.bat health        - Check health endpoint
 echo   prod.bat cleancache    - Clear Python cache files (__pycache__, .pyc, .pyo)
 echo   prod.bat test          - Run tests
 echo   prod.bat data          - Seed initial data
+echo   prod.bat bigdata       - Generate 1M flights with crew for benchmarks
 echo.
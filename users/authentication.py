@@ -0,0 +1,144 @@
+"""
+Kullanıcı snapshot'ı cache'lenen JWT kimlik doğrulaması.
+
+JWTAuthentication her istekte kullanıcı satırını DB'den okur. Burada izin
+kontrollerinin ihtiyaç duyduğu alanlar (SNAPSHOT_FIELDS) kullanıcı başına
+sürümlü bir namespace altında Redis'te ve süreç içi bir LRU'da tutulur. User
+kaydedildiğinde/silindiğinde sürüm artırılır (users.signals); eski sürüme
+ait snapshot'lar hiçbir süreçte okunmaz.
+
+İstek başına maliyet sürüm için tek bir Redis GET'tir. Dönen nesne gerçek bir
+User örneğidir; snapshot dışındaki alanlara erişilirse Django onları
+ertelenmiş (deferred) alan olarak DB'den yükler.
+"""
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from drf_case.cache import aget, aget_namespace_version, aset, get_namespace_version, invalidate_namespace
+
+SNAPSHOT_FIELDS = ('id', 'username', 'role', 'role_version', 'is_active', 'is_staff', 'is_superuser')
+SNAPSHOT_KEY = 'auth:user:{user_id}'
+
+
+def user_namespace(user_id):
+  return f'user:{user_id}'
+
+
+def invalidate_user(user_id):
+  """Kullanıcının snapshot'ını tüm süreçlerde geçersiz kılar."""
+  invalidate_namespace(user_namespace(user_id))
+
+
+class SnapshotLRU:
+  """
+  Thread-safe, boyutu sınırlı (kullanıcı id, sürüm) -> snapshot eşlemesi.
+  Anahtar sürümü içerdiği için kayıtların ayrıca süresi dolmaz; eski
+  sürümler LRU'dan zamanla düşer.
+  """
+
+  def __init__(self, maxsize):
+    self.maxsize = maxsize
+    self._data = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    with self._lock:
+      value = self._data.get(key)
+      if value is not None:
+        self._data.move_to_end(key)
+      return value
+
+  def set(self, key, value):
+    with self._lock:
+      self._data[key] = value
+      self._data.move_to_end(key)
+      while len(self._data) > self.maxsize:
+        self._data.popitem(last=False)
+
+  def clear(self):
+    with self._lock:
+      self._data.clear()
+
+  def __len__(self):
+    return len(self._data)
+
+
+local_snapshots = SnapshotLRU(settings.AUTH_USER_CACHE_SIZE)
+
+
+def _snapshot_query(user_id):
+  User = get_user_model()
+  return User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values(*SNAPSHOT_FIELDS)
+
+
+def build_user(snapshot):
+  """Snapshot'tan (diğer alanları ertelenmiş) User örneği üretir"""
+  User = get_user_model()
+  # from_db değerleri modeldeki kolon sırasıyla bekler
+  names = [field.attname for field in User._meta.concrete_fields if field.attname in snapshot]
+  return User.from_db(DEFAULT_DB_ALIAS, names, [snapshot[name] for name in names])
+
+
+def load_user_snapshot(user_id):
+  """Kullanıcı snapshot'ı (LRU -> Redis -> DB); kullanıcı yoksa None"""
+  version = get_namespace_version(user_namespace(user_id))
+  snapshot = local_snapshots.get((str(user_id), version))
+  if snapshot is None:
+    key = SNAPSHOT_KEY.format(user_id=user_id)
+    snapshot = cache.get(key, version=version)
+    if snapshot is None:
+      snapshot = _snapshot_query(user_id).first()
+      if snapshot is None:
+        return None
+      cache.set(key, snapshot, timeout=settings.AUTH_USER_CACHE_TIMEOUT, version=version)
+    local_snapshots.set((str(user_id), version), snapshot)
+  return snapshot
+
+
+async def aload_user_snapshot(user_id):
+  """load_user_snapshot'ın async karşılığı (ASGI okuma yolu)"""
+  version = await aget_namespace_version(user_namespace(user_id))
+  snapshot = local_snapshots.get((str(user_id), version))
+  if snapshot is None:
+    key = SNAPSHOT_KEY.format(user_id=user_id)
+    snapshot = await aget(key, version=version)
+    if snapshot is None:
+      snapshot = await _snapshot_query(user_id).afirst()
+      if snapshot is None:
+        return None
+      await aset(key, snapshot, timeout=settings.AUTH_USER_CACHE_TIMEOUT, version=version)
+    local_snapshots.set((str(user_id), version), snapshot)
+  return snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+  """JWTAuthentication; kullanıcı DB yerine snapshot cache'ten okunur"""
+
+  def get_user(self, validated_token):
+    if api_settings.CHECK_REVOKE_TOKEN:
+      # Parola özeti snapshot'ta tutulmaz; bu kontrol DB'deki satırla yapılır
+      return super().get_user(validated_token)
+    return self._check(load_user_snapshot(self._user_id(validated_token)))
+
+  async def aget_user(self, validated_token):
+    return self._check(await aload_user_snapshot(self._user_id(validated_token)))
+
+  def _user_id(self, validated_token):
+    try:
+      return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError as exc:
+      raise InvalidToken(_("Token contained no recognizable user identification")) from exc
+
+  def _check(self, snapshot):
+    if snapshot is None:
+      raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if api_settings.CHECK_USER_IS_ACTIVE and not snapshot['is_active']:
+      raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return build_user(snapshot)
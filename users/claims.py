@@ -0,0 +1,45 @@
+"""
+Access token'lardaki rol claim'leri.
+
+/api/token/ ile verilen token'lar kullanıcının rolünü (`role`) ve rol
+sürümünü (`rv`) taşır. İzinler rolü doğrulanmış bu claim'den okur. Rol
+değiştiğinde User.role_version artar; eski `rv`'li token'lar /api/token/refresh/
+ile yenilenene kadar reddedilir. Güncel sürüm kimlik doğrulamada yüklenen
+kullanıcı snapshot'ından okunduğu için kontrol ek sorgu gerektirmez.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import Token
+
+ROLE_CLAIM = 'role'
+ROLE_VERSION_CLAIM = 'rv'
+
+
+class RoleRevoked(AuthenticationFailed):
+  default_detail = _("Role has changed. Refresh the access token.")
+  default_code = 'role_revoked'
+
+
+def set_role_claims(token, user):
+  token[ROLE_CLAIM] = user.role
+  token[ROLE_VERSION_CLAIM] = user.role_version
+  return token
+
+
+def request_role(request):
+  """
+  İsteğin yetkilendirmede kullanılacak rolü. Token rol claim'i taşıyorsa
+  claim (rv güncel değilse RoleRevoked), taşımıyorsa (eski token'lar, test
+  istemcisinin force_authenticate'i) kullanıcının kendi rolü.
+  """
+  token = request.auth
+  if isinstance(token, Token) and ROLE_CLAIM in token:
+    check_role_version(token, request.user)
+    return token[ROLE_CLAIM]
+  return getattr(request.user, 'role', None)
+
+
+def check_role_version(token, user):
+  """Token rol claim'i taşıyorsa `rv` kullanıcının güncel sürümü olmalı (değilse RoleRevoked)."""
+  if ROLE_CLAIM in token and token.get(ROLE_VERSION_CLAIM) != getattr(user, 'role_version', None):
+    raise RoleRevoked()
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+  """
+  Argon2id; maliyet parametreleri ayarlardan okunur. Varsayılanlar OWASP'ın
+  önerdiği değerlerdir (19 MiB, 2 tur, 1 iş parçacığı). Algoritma adı
+  Django'nunkiyle aynıdır; farklı parametrelerle üretilmiş özetler doğrulanır
+  ve girişte bu parametrelere yükseltilir.
+  """
+
+  @property
+  def memory_cost(self):
+    return settings.PASSWORD_ARGON2_MEMORY_COST
+
+  @property
+  def time_cost(self):
+    return settings.PASSWORD_ARGON2_TIME_COST
+
+  @property
+  def parallelism(self):
+    return settings.PASSWORD_ARGON2_PARALLELISM
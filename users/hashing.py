@@ -0,0 +1,80 @@
+"""
+Parola özeti hesaplaması için worker'lar arası eşzamanlılık sınırı.
+
+Parola özeti CPU'ya bağlıdır ve senkron bir worker'ı hesap süresince meşgul
+eder. Eşzamanlı giriş/kayıt dalgası tüm worker'ları kaplarsa /api/flights/
+okumaları kuyrukta bekler. hashing_slot() aynı anda özet hesaplayan istek
+sayısını PASSWORD_HASHING_SLOTS ile sınırlar; slot bulamayan istek kısa bir
+süre bekler, ardından 503 alır ve worker'ı serbest kalır.
+
+Slotlar Redis'te bir sorted set'tir (üye başına alınma zamanı). Çöken bir
+sürecin tuttuğu slot SLOT_TTL sonunda kendiliğinden düşer. Kontrol ve alma
+tek Lua betiğinde Redis saatiyle (TIME) yapılır; web sunucularının saat
+farkları slot sayısını aşırmaz.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+SLOTS_KEY = 'hashing:slots'
+# Tek bir özetin bu süreden uzun sürmesi beklenmez (saniye)
+SLOT_TTL = 30
+POLL_INTERVAL = 0.02
+
+
+class HashingBusy(APIException):
+  status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+  default_detail = _('Too many sign-in requests. Try again shortly.')
+  default_code = 'hashing_busy'
+
+  def __init__(self, wait=1):
+    super().__init__()
+    # DRF exception handler bunu Retry-After başlığına yazar
+    self.wait = wait
+
+
+# Süresi dolan slotları düşürür, boş slot varsa üyeyi ekler (1) yoksa 0
+ACQUIRE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local ttl = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - ttl)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[1])
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+
+def _try_acquire(conn, key, member, limit):
+  return bool(conn.register_script(ACQUIRE_SCRIPT)(keys=[key], args=[member, limit, SLOT_TTL]))
+
+
+@contextmanager
+def hashing_slot():
+  """Blok bir hashing slotu tutarak çalışır; slot yoksa HashingBusy."""
+  limit = settings.PASSWORD_HASHING_SLOTS
+  if limit <= 0:
+    # 0: sınır kapalı
+    yield
+    return
+  conn = get_redis_connection('default')
+  key = cache.make_key(SLOTS_KEY)
+  member = uuid.uuid4().hex
+  deadline = time.monotonic() + settings.PASSWORD_HASHING_WAIT
+  while not _try_acquire(conn, key, member, limit):
+    if time.monotonic() >= deadline:
+      raise HashingBusy()
+    time.sleep(POLL_INTERVAL)
+  try:
+    yield
+  finally:
+    conn.zrem(key, member)
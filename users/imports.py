@@ -0,0 +1,215 @@
+"""
+Toplu kullanıcı içe aktarma (CSV / NDJSON).
+
+Satırlar akıştan parça parça (batch_size) okunur; dosyanın tamamı belleğe
+alınmaz. Her parça için:
+
+- satırlar UserImportSerializer ile doğrulanır, mevcut kullanıcı adı/e-posta
+  çakışmaları tek sorguyla bulunur,
+- parolalar süreç havuzunda paralel ya da çağıran süreçte özetlenir
+  (parolası boş satırlar kullanılamaz parola alır ve havuza gitmez),
+- kullanıcılar ve profilleri tek transaction'da bulk_create ile yazılır.
+
+bulk_create post_save sinyalini tetiklemez: profiller burada oluşturulur.
+Yeni kullanıcıların cache'lenmiş bir snapshot'ı olamayacağı için
+(users.authentication) geçersiz kılınacak bir şey yoktur.
+
+API yüklemeleri istek içinde işlenmez: dosya bir UserImportJob olarak
+kaydedilir ve run_import_job Celery worker'ında çalışır.
+"""
+import csv
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Profile, User, UserImportJob
+from .serializers import UserImportSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+REQUIRED_COLUMNS = ('username', 'email')
+# Yanıtta/çıktıda listelenen en fazla hatalı satır sayısı
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+  """Akış okunamıyor (ör. CSV başlığında zorunlu kolon yok)."""
+
+
+def iter_csv_rows(lines):
+  """(satır no, kayıt) çiftleri; ilk satır kolon adlarıdır."""
+  reader = csv.DictReader(lines)
+  missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+  if missing:
+    raise ImportFormatError(f"CSV header is missing column(s): {', '.join(missing)}")
+  for row in reader:
+    yield reader.line_num, row
+
+
+def iter_ndjson_rows(lines):
+  """(satır no, kayıt) çiftleri; boş satırlar atlanır."""
+  for number, line in enumerate(lines, start=1):
+    if not line.strip():
+      continue
+    try:
+      row = json.loads(line)
+    except ValueError:
+      row = None
+    yield number, row if isinstance(row, dict) else None
+
+
+def iter_rows(lines, fmt):
+  if fmt not in IMPORT_FORMATS:
+    raise ImportFormatError(f"Unsupported format: {fmt}")
+  return iter_csv_rows(lines) if fmt == 'csv' else iter_ndjson_rows(lines)
+
+
+def _clean(row):
+  # CSV'deki boş hücreler "verilmedi" sayılır (role varsayılanı, parolasız hesap)
+  return {key: value for key, value in row.items() if key and value not in ('', None)}
+
+
+class UserImporter:
+  """
+  `workers` > 0 ise parolalar o kadar süreçli bir havuzda özetlenir; 0 ise
+  çağıran süreçte. Havuz `with` bloğu boyunca açık kalır.
+  """
+
+  def __init__(self, batch_size=500, workers=0):
+    self.batch_size = batch_size
+    self.workers = workers
+    self.created = 0
+    self.error_count = 0
+    self.errors = []
+    self._pool = None
+    self._seen_usernames = set()
+    self._seen_emails = set()
+
+  def __enter__(self):
+    if self.workers > 0:
+      self._pool = ProcessPoolExecutor(max_workers=self.workers)
+    return self
+
+  def __exit__(self, *exc_info):
+    if self._pool is not None:
+      self._pool.shutdown()
+      self._pool = None
+
+  def run(self, rows):
+    """`rows` (satır no, kayıt) çiftleridir; özet sözlük döndürür."""
+    batch = []
+    for line, row in rows:
+      batch.append((line, row))
+      if len(batch) >= self.batch_size:
+        self._import_batch(batch)
+        batch = []
+    if batch:
+      self._import_batch(batch)
+    return self.summary()
+
+  def summary(self):
+    errors = sorted(self.errors, key=lambda error: error['line'])
+    return {'created': self.created, 'failed': self.error_count, 'errors': errors}
+
+  def _error(self, line, errors):
+    self.error_count += 1
+    if len(self.errors) < MAX_REPORTED_ERRORS:
+      self.errors.append({'line': line, 'errors': errors})
+
+  def _validate(self, batch):
+    valid = []
+    for line, row in batch:
+      if row is None:
+        self._error(line, {'non_field_errors': ['Invalid JSON object.']})
+        continue
+      serializer = UserImportSerializer(data=_clean(row))
+      if not serializer.is_valid():
+        self._error(line, serializer.errors)
+        continue
+      valid.append((line, serializer.validated_data))
+
+    # Mevcut kayıtlarla ve dosyanın önceki satırlarıyla çakışmalar
+    usernames = {attrs['username'] for _, attrs in valid}
+    emails = {attrs['email'] for _, attrs in valid}
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    accepted = []
+    for line, attrs in valid:
+      errors = {}
+      if attrs['username'] in taken_usernames or attrs['username'] in self._seen_usernames:
+        errors['username'] = ['A user with that username already exists.']
+      if attrs['email'] in taken_emails or attrs['email'] in self._seen_emails:
+        errors['email'] = ['A user with that email already exists.']
+      if errors:
+        self._error(line, errors)
+        continue
+      self._seen_usernames.add(attrs['username'])
+      self._seen_emails.add(attrs['email'])
+      accepted.append((line, attrs))
+    return accepted
+
+  def _hash_passwords(self, passwords):
+    indexes = [i for i, password in enumerate(passwords) if password is not None]
+    hashes = [make_password(None) for _ in passwords]
+    plain = [passwords[i] for i in indexes]
+    if self._pool is not None and plain:
+      chunksize = max(1, len(plain) // (self.workers * 4))
+      hashed = self._pool.map(make_password, plain, chunksize=chunksize)
+    else:
+      hashed = map(make_password, plain)
+    for i, value in zip(indexes, hashed):
+      hashes[i] = value
+    return hashes
+
+  def _import_batch(self, batch):
+    accepted = self._validate(batch)
+    if not accepted:
+      return
+    hashes = self._hash_passwords([attrs.pop('password', None) for _, attrs in accepted])
+    users = [User(password=password, **attrs) for (_, attrs), password in zip(accepted, hashes)]
+    try:
+      with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        if users[0].pk is None:
+          # Backend eklenen satırların id'lerini döndürmüyorsa (ör. MySQL)
+          ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))
+          for user in users:
+            user.pk = ids[user.username]
+        Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=self.batch_size)
+    except IntegrityError as exc:
+      # Doğrulama ile yazma arasında aynı kullanıcı başka yoldan eklendi
+      for line, _ in accepted:
+        self._error(line, {'non_field_errors': [str(exc)]})
+      return
+    self.created += len(users)
+
+
+def run_import_job(job_id):
+  """
+  Bekleyen bir UserImportJob'ı işler ve özetini kaydeder. Celery prefork
+  worker'ları süreç başlatamadığı için parolalar worker sürecinde özetlenir;
+  paralel özet için import_users komutu kullanılır.
+  """
+  updated = UserImportJob.objects.filter(pk=job_id, status=UserImportJob.PENDING).update(status=UserImportJob.RUNNING)
+  if not updated:
+    # Tekrar teslim edilen task: iş zaten alınmış
+    return
+  job = UserImportJob.objects.get(pk=job_id)
+  try:
+    with job.file.open('rb') as handle:
+      lines = (line.decode('utf-8') for line in handle)
+      job.summary = UserImporter(batch_size=settings.USER_IMPORT_BATCH_SIZE).run(iter_rows(lines, job.format))
+    job.status = UserImportJob.SUCCEEDED
+  except (ImportFormatError, UnicodeDecodeError) as exc:
+    job.status, job.error = UserImportJob.FAILED, str(exc)
+  except Exception:
+    logger.exception(f"Kullanıcı içe aktarma işi başarısız: {job_id}")
+    job.status, job.error = UserImportJob.FAILED, 'Import failed unexpectedly.'
+  job.finished_at = timezone.now()
+  job.file.delete(save=False)
+  job.save()
+  return job.summary
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+USERNAME = 'benchmark_login'
+PASSWORD = 'benchmark-login-pass'
+
+
+class Command(BaseCommand):
+  help = 'Start gunicorn per password hasher profile and measure /api/token/ throughput and /api/flights/ latency under login load'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--profiles', nargs='+', default=list(settings.PASSWORD_HASHER_PROFILES), choices=list(settings.PASSWORD_HASHER_PROFILES))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='Concurrent login clients (default: 1 4 16)')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent /api/flights/ clients during the login load (default: 4)')
+    parser.add_argument('--slots', type=int, default=settings.PASSWORD_HASHING_SLOTS, help='PASSWORD_HASHING_SLOTS for the server (0 disables the limit)')
+    parser.add_argument('--workers', type=int, default=3, help='gunicorn worker processes (default: 3)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per run (default: 10)')
+    parser.add_argument('--port', type=int, default=8100)
+
+  def handle(self, *args, **options):
+    user, created = User.objects.get_or_create(username=USERNAME, defaults={'email': f'{USERNAME}@example.com'})
+    if created or not user.check_password(PASSWORD):
+      user.set_password(PASSWORD)
+      user.save()
+    token = str(AccessToken.for_user(user))
+
+    self.stdout.write(
+      f'{"profile":<8} {"logins":>6} {"login/s":>8} {"p50 ms":>8} {"p99 ms":>8} {"503":>6} '
+      f'{"flights p99 ms":>15}'
+    )
+    for profile in options['profiles']:
+      server = self._start(profile, options)
+      try:
+        # İlk giriş özeti seçili algoritmaya yükseltir
+        asyncio.run(self._login(options['port']))
+        for concurrency in options['concurrency']:
+          logins, rejected, reads = asyncio.run(self._load(options, concurrency, token))
+          rate, p50, p99 = self._stats(logins, options['duration'])
+          _, _, reads_p99 = self._stats(reads, options['duration'])
+          self.stdout.write(
+            f'{profile:<8} {concurrency:>6} {rate:>8.1f} {p50:>8.1f} {p99:>8.1f} {rejected:>6} {reads_p99:>15.1f}'
+          )
+      finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+  def _start(self, profile, options):
+    env = dict(
+      os.environ,
+      GUNICORN_PROFILE='sync', GUNICORN_USER=str(os.getuid()), GUNICORN_GROUP=str(os.getgid()),
+      PASSWORD_HASHER_PROFILE=profile, PASSWORD_HASHING_SLOTS=str(options['slots']),
+    )
+    command = [
+      sys.executable, '-m', 'gunicorn', '--config', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+      '--bind', f'127.0.0.1:{options["port"]}', '--workers', str(options['workers']),
+      '--pid', os.path.join(tempfile.gettempdir(), f'benchmark_login_{profile}.pid'),
+    ]
+    server = subprocess.Popen(command, env=env, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+      if server.poll() is not None:
+        raise CommandError(f'gunicorn ({profile}) exited with code {server.returncode}')
+      try:
+        if asyncio.run(self._request(options['port'], 'GET', '/health/')) == 200:
+          return server
+      except OSError:
+        pass
+      time.sleep(0.2)
+    server.terminate()
+    raise CommandError(f'gunicorn ({profile}) did not become ready')
+
+  async def _request(self, port, method, path, token=None, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    headers = f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+    if token:
+      headers += f'Authorization: Bearer {token}\r\n'
+    payload = b''
+    if body is not None:
+      payload = json.dumps(body).encode()
+      headers += f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+    writer.write(f'{headers}\r\n'.encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line = response.split(b'\r\n', 1)[0].split()
+    return int(status_line[1]) if len(status_line) > 1 else 0
+
+  async def _login(self, port):
+    return await self._request(port, 'POST', '/api/token/', body={'username': USERNAME, 'password': PASSWORD})
+
+  async def _load(self, options, concurrency, token):
+    port = options['port']
+    logins, reads = [], []
+    rejected = 0
+    deadline = time.perf_counter() + options['duration']
+
+    async def login_client():
+      nonlocal rejected
+      while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+          status = await self._login(port)
+        except OSError:
+          status = 0
+        if status == 200:
+          logins.append(time.perf_counter() - start)
+        else:
+          rejected += 1
+          # Retry-After yerine kısa bekleme; yük ölçümü sürsün
+          await asyncio.sleep(0.05)
+
+    async def read_client():
+      while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+          status = await self._request(port, 'GET', '/api/flights/?page_size=20', token)
+        except OSError:
+          status = 0
+        if status == 200:
+          reads.append(time.perf_counter() - start)
+
+    await asyncio.gather(
+      *(login_client() for _ in range(concurrency)),
+      *(read_client() for _ in range(options['readers'])),
+    )
+    return logins, rejected, reads
+
+  def _stats(self, latencies, duration):
+    if not latencies:
+      return 0.0, 0.0, 0.0
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / duration, statistics.median(latencies) * 1000, p99 * 1000
@@ -0,0 +1,42 @@
+import os
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from users.imports import IMPORT_FORMATS, ImportFormatError, UserImporter, iter_rows
+
+
+class Command(BaseCommand):
+  help = 'Bulk import users (with profiles) from a CSV or NDJSON file, streaming it in batches'
+
+  def add_arguments(self, parser):
+    parser.add_argument('path', help="CSV/NDJSON file, or '-' for stdin")
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help='Input format (default: from the file extension)')
+    parser.add_argument('--batch-size', type=int, default=settings.USER_IMPORT_BATCH_SIZE, help='Rows per transaction')
+    parser.add_argument('--workers', type=int, default=settings.USER_IMPORT_HASH_WORKERS, help='Password hashing processes (0: hash in this process)')
+
+  def handle(self, *args, **options):
+    path = options['path']
+    fmt = options['format']
+    if fmt is None:
+      extension = os.path.splitext(path)[1].lstrip('.').lower()
+      fmt = {'csv': 'csv', 'ndjson': 'ndjson', 'jsonl': 'ndjson'}.get(extension)
+      if fmt is None:
+        raise CommandError('Cannot infer the format, pass --format csv|ndjson')
+    if options['batch_size'] <= 0:
+      raise CommandError('--batch-size must be positive')
+
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+      with UserImporter(batch_size=options['batch_size'], workers=options['workers']) as importer:
+        summary = importer.run(iter_rows(stream, fmt))
+    except (ImportFormatError, UnicodeDecodeError) as exc:
+      raise CommandError(str(exc))
+    finally:
+      if stream is not sys.stdin:
+        stream.close()
+
+    for error in summary['errors']:
+      self.stdout.write(self.style.WARNING(f"line {error['line']}: {error['errors']}"))
+    if summary['failed'] > len(summary['errors']):
+      self.stdout.write(self.style.WARNING(f"... {summary['failed'] - len(summary['errors'])} more invalid rows"))
+    self.stdout.write(self.style.SUCCESS(f"Imported {summary['created']} users ({summary['failed']} rows skipped)"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,14 +1,36 @@
 
+import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
+USER_ROLES = ('viewer', 'staff', 'admin')
+
 class User(AbstractUser):
   email = models.EmailField(unique=True)
   role = models.CharField(max_length=20, default='viewer')  # viewer, staff, admin
+  # Rol her değiştiğinde artar; token'lardaki `rv` claim'i bununla karşılaştırılır
+  role_version = models.PositiveIntegerField(default=0)
 
   REQUIRED_FIELDS = ['email']
   USERNAME_FIELD = 'username'
 
+  @classmethod
+  def from_db(cls, db, field_names, values):
+    instance = super().from_db(db, field_names, values)
+    instance._loaded_role = instance.__dict__.get('role')
+    return instance
+
+  def save(self, *args, **kwargs):
+    # Rol değişikliği eski rol claim'li token'ları geçersiz kılar (users.claims).
+    # QuerySet.update() ile yapılan rol değişiklikleri bunu atlar.
+    loaded_role = getattr(self, '_loaded_role', None)
+    if loaded_role is not None and self.role != loaded_role:
+      self.role_version += 1
+      if kwargs.get('update_fields') is not None:
+        kwargs['update_fields'] = {*kwargs['update_fields'], 'role_version'}
+    super().save(*args, **kwargs)
+    self._loaded_role = self.role
+
   def __str__(self):
     return self.username
 
@@ -24,3 +46,33 @@ class Profile(models.Model):
 
   def __str__(self):
     return f"Profile of {self.user.username}"
+
+class UserImportJob(models.Model):
+  """
+  API'den yüklenen toplu kullanıcı dosyası. Dosya kaydedilir ve bir Celery
+  task'ı (users.tasks.run_user_import) işler; istemci durumu id ile sorar.
+  """
+  PENDING = 'pending'
+  RUNNING = 'running'
+  SUCCEEDED = 'succeeded'
+  FAILED = 'failed'
+  STATUS_CHOICES = [
+    (PENDING, 'Pending'),
+    (RUNNING, 'Running'),
+    (SUCCEEDED, 'Succeeded'),
+    (FAILED, 'Failed'),
+  ]
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  created_by = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, related_name='+')
+  format = models.CharField(max_length=10)
+  status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+  # İşlendikten sonra silinir
+  file = models.FileField(upload_to='user_imports/', blank=True)
+  summary = models.JSONField(null=True, blank=True)
+  error = models.TextField(blank=True)
+  created_at = models.DateTimeField(auto_now_add=True)
+  finished_at = models.DateTimeField(null=True, blank=True)
+
+  def __str__(self):
+    return f"Import {self.id} ({self.status})"
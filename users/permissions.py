@@ -1,10 +1,18 @@
 from rest_framework.permissions import BasePermission
+from .claims import request_role
 
 class IsRole(BasePermission):
-  def __init__(self, allowed_roles):
-    self.allowed_roles = allowed_roles
+  """
+  Rolü `allowed_roles` içinde olan kullanıcılara izin verir. Rol doğrulanmış
+  token claim'inden okunur (users.claims); DB'ye ya da profile'a gidilmez.
+  """
+  allowed_roles = ()
+
+  def __init__(self, allowed_roles=None):
+    if allowed_roles is not None:
+      self.allowed_roles = tuple(allowed_roles)
 
   def has_permission(self, request, view):
-    if not request.user.is_authenticated:
+    if not (request.user and request.user.is_authenticated):
       return False
-    return hasattr(request.user, 'profile') and request.user.profile.role in self.allowed_roles
+    return request_role(request) in self.allowed_roles
@@ -1,5 +1,12 @@
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
-from .models import User, Profile
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import build_user, load_user_snapshot
+from .claims import set_role_claims
+from .hashing import hashing_slot
+from .models import USER_ROLES, User, Profile, UserImportJob
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -12,17 +19,44 @@ class RegisterSerializer(serializers.ModelSerializer):
 
   def create(self, validated_data):
     role = validated_data.pop('role', 'viewer')  # Default to viewer if not provided
-    user = User.objects.create_user(
-      username=validated_data['username'],
-      email=validated_data['email'],
-      password=validated_data['password'],
-      role=role,
-      first_name=validated_data.get('first_name', ''),
-      last_name=validated_data.get('last_name', '')
-    )
+    with hashing_slot():
+      user = User.objects.create_user(
+        username=validated_data['username'],
+        email=validated_data['email'],
+        password=validated_data['password'],
+        role=role,
+        first_name=validated_data.get('first_name', ''),
+        last_name=validated_data.get('last_name', '')
+      )
     return user
 
 
+class UserImportSerializer(serializers.Serializer):
+  """
+  Toplu içe aktarmada tek satır (users.imports). Benzersizlik kontrolleri
+  satır başına sorgu atmamak için parça düzeyinde yapılır.
+  """
+  username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+  email = serializers.EmailField()
+  password = serializers.CharField(required=False, write_only=True)
+  role = serializers.ChoiceField(choices=USER_ROLES, default='viewer')
+  first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+  last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+
+  def validate_username(self, value):
+    return User.normalize_username(value)
+
+  def validate_email(self, value):
+    return User.objects.normalize_email(value)
+
+
+class UserImportJobSerializer(serializers.ModelSerializer):
+  class Meta:
+    model = UserImportJob
+    fields = ['id', 'status', 'format', 'summary', 'error', 'created_at', 'finished_at']
+    read_only_fields = fields
+
+
 class ProfileSerializer(serializers.ModelSerializer):
   class Meta:
     model = Profile
@@ -37,3 +71,28 @@ class UserSerializer(serializers.ModelSerializer):
     model = User
     fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'is_active', 'date_joined', 'profile']
     read_only_fields = ['id', 'date_joined']
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+  """/api/token/: token'lara `role` ve `rv` claim'lerini ekler"""
+
+  @classmethod
+  def get_token(cls, user):
+    return set_role_claims(super().get_token(user), user)
+
+  def validate(self, attrs):
+    # authenticate() parolayı (kullanıcı yoksa da sahte bir parolayı) özetler
+    with hashing_slot():
+      return super().validate(attrs)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+  """/api/token/refresh/: yeni access token kullanıcının güncel rolünü taşır"""
+
+  def validate(self, attrs):
+    refresh = self.token_class(attrs['refresh'])
+    snapshot = load_user_snapshot(refresh.payload.get(api_settings.USER_ID_CLAIM))
+    if snapshot is None or not snapshot['is_active']:
+      raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+    set_role_claims(refresh, build_user(snapshot))
+    return super().validate({**attrs, 'refresh': str(refresh)})
@@ -1,5 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import invalidate_user
 from .models import User
 from .models import Profile
 
@@ -7,3 +9,9 @@ from .models import Profile
 def create_user_profile(sender, instance, created, **kwargs):
   if created:
     Profile.objects.create(user=instance)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+  # Rol/aktiflik değişiklikleri bir sonraki istekte tüm süreçlerde görünür
+  invalidate_user(getattr(instance, api_settings.USER_ID_FIELD))
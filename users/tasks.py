@@ -0,0 +1,8 @@
+from celery import shared_task
+
+
+@shared_task
+def run_user_import(job_id):
+  """API'den yüklenen toplu kullanıcı dosyasını işler"""
+  from .imports import run_import_job
+  return run_import_job(job_id)
@@ -0,0 +1,105 @@
+from asgiref.sync import async_to_sync
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from flights.models import Flight
+from users.authentication import CachedJWTAuthentication, SnapshotLRU, local_snapshots
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    local_snapshots.clear()
+    self.user = User.objects.create_user(
+      username="viewer_snapshot",
+      password="secret123",
+      email="viewer_snapshot@test.com",
+      role="viewer"
+    )
+    self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+    self.flight = Flight.objects.create(
+      flight_number="SN100",
+      origin="Ankara",
+      destination="Lizbon",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned"
+    )
+    self.url = reverse('flight-detail', args=[self.flight.pk])
+
+  def user_queries(self, ctx):
+    return [q["sql"] for q in ctx.captured_queries if User._meta.db_table in q["sql"]]
+
+  def test_repeated_requests_skip_user_select(self):
+    """Test that authenticated requests after the first do not query the user table"""
+    self.assertEqual(self.client.get(self.url).status_code, 200)
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.get(self.url)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(self.user_queries(ctx), [])
+
+  def test_redis_snapshot_shared_across_processes(self):
+    """Test that an empty local LRU is refilled from Redis, not the DB"""
+    self.client.get(self.url)
+    local_snapshots.clear()
+    with CaptureQueriesContext(connection) as ctx:
+      self.client.get(self.url)
+    self.assertEqual(self.user_queries(ctx), [])
+
+  def test_role_change_visible_on_next_request(self):
+    """Test that saving the user invalidates the cached role"""
+    payload = {"status": "delayed"}
+    self.assertEqual(self.client.patch(self.url, payload, format="json").status_code, 403)
+
+    self.user.role = "staff"
+    self.user.save()
+    self.assertEqual(self.client.patch(self.url, payload, format="json").status_code, 200)
+
+  def test_deactivated_user_rejected(self):
+    """Test that deactivation takes effect immediately"""
+    self.client.get(self.url)
+    self.user.is_active = False
+    self.user.save()
+    self.assertEqual(self.client.get(self.url).status_code, 401)
+
+  def test_deleted_user_rejected(self):
+    """Test that tokens of deleted users stop working"""
+    self.client.get(self.url)
+    self.user.delete()
+    self.assertEqual(self.client.get(self.url).status_code, 401)
+
+  def test_snapshot_user_loads_other_fields_lazily(self):
+    """Test that fields outside the snapshot are still available"""
+    token = AccessToken.for_user(self.user)
+    user = CachedJWTAuthentication().get_user(token)
+    self.assertEqual((user.pk, user.role, user.username), (self.user.pk, "viewer", "viewer_snapshot"))
+    self.assertTrue(user.is_authenticated)
+    self.assertEqual(user.email, "viewer_snapshot@test.com")
+
+  def test_async_lookup_uses_same_snapshot(self):
+    """Test that the async lookup reads the snapshot cached by the sync path"""
+    token = AccessToken.for_user(self.user)
+    CachedJWTAuthentication().get_user(token)
+    with CaptureQueriesContext(connection) as ctx:
+      user = async_to_sync(CachedJWTAuthentication().aget_user)(token)
+    self.assertEqual(user.pk, self.user.pk)
+    self.assertEqual(self.user_queries(ctx), [])
+
+
+class SnapshotLRUTest(APITestCase):
+  def test_evicts_least_recently_used(self):
+    """Test that the LRU keeps at most maxsize entries"""
+    lru = SnapshotLRU(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    self.assertEqual(len(lru), 2)
+    self.assertIsNone(lru.get("b"))
+    self.assertEqual(lru.get("a"), 1)
@@ -0,0 +1,98 @@
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from flights.models import Flight
+from users.authentication import local_snapshots
+from users.permissions import IsRole
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class RoleClaimTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    local_snapshots.clear()
+    self.user = User.objects.create_user(
+      username="staff_claims",
+      password="secret123",
+      email="staff_claims@test.com",
+      role="staff"
+    )
+    self.flight = Flight.objects.create(
+      flight_number="RC100",
+      origin="İzmir",
+      destination="Viyana",
+      scheduled_time=timezone.now() + timedelta(hours=2),
+      status="planned"
+    )
+    self.url = reverse('flight-detail', args=[self.flight.pk])
+
+  def obtain(self):
+    response = self.client.post('/api/token/', {"username": "staff_claims", "password": "secret123"}, format="json")
+    self.assertEqual(response.status_code, 200)
+    return response.data
+
+  def authorize(self, access):
+    self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+  def test_token_carries_role_claims(self):
+    """Test that issued tokens carry the role and its version"""
+    access = AccessToken(self.obtain()["access"])
+    self.assertEqual((access["role"], access["rv"]), ("staff", 0))
+
+  def test_staff_write_skips_user_select(self):
+    """Test that a write authorized by the role claim does not query the user table"""
+    self.authorize(self.obtain()["access"])
+    self.assertEqual(self.client.get(self.url).status_code, 200)
+    with CaptureQueriesContext(connection) as ctx:
+      response = self.client.patch(self.url, {"status": "delayed"}, format="json")
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual([q["sql"] for q in ctx.captured_queries if User._meta.db_table in q["sql"]], [])
+
+  def test_role_change_revokes_claim(self):
+    """Test that a token issued before a role change is rejected"""
+    tokens = self.obtain()
+    self.authorize(tokens["access"])
+    self.user.role = "viewer"
+    self.user.save()
+    self.assertEqual(self.user.role_version, 1)
+
+    response = self.client.patch(self.url, {"status": "delayed"}, format="json")
+    self.assertEqual(response.status_code, 401)
+    self.assertEqual(response.data["detail"].code, "role_revoked")
+
+    # Yenilenen token güncel rolü taşır
+    refreshed = self.client.post('/api/token/refresh/', {"refresh": tokens["refresh"]}, format="json")
+    self.assertEqual(refreshed.status_code, 200)
+    access = AccessToken(refreshed.data["access"])
+    self.assertEqual((access["role"], access["rv"]), ("viewer", 1))
+    self.authorize(refreshed.data["access"])
+    self.assertEqual(self.client.patch(self.url, {"status": "delayed"}, format="json").status_code, 403)
+
+  def test_refresh_rejected_for_inactive_user(self):
+    """Test that deactivated users cannot refresh their tokens"""
+    tokens = self.obtain()
+    self.user.is_active = False
+    self.user.save()
+    response = self.client.post('/api/token/refresh/', {"refresh": tokens["refresh"]}, format="json")
+    self.assertEqual(response.status_code, 401)
+
+  def test_unrelated_save_keeps_role_version(self):
+    """Test that saving other fields does not revoke tokens"""
+    self.user.first_name = "Ada"
+    self.user.save()
+    self.user.refresh_from_db()
+    self.assertEqual(self.user.role_version, 0)
+
+  def test_is_role_uses_user_role_without_claim(self):
+    """Test that IsRole falls back to user.role and never touches the profile"""
+    request = APIRequestFactory().get('/')
+    request.user = User.objects.get(pk=self.user.pk)
+    request.auth = None
+    self.assertTrue(IsRole(['staff']).has_permission(request, None))
+    self.assertFalse(IsRole(['admin']).has_permission(request, None))
@@ -0,0 +1,81 @@
+import time
+from rest_framework.test import APITestCase
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from users.hashing import SLOT_TTL, SLOTS_KEY, HashingBusy, hashing_slot
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class PasswordHashingTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    get_redis_connection('default').delete(cache.make_key(SLOTS_KEY))
+    self.user = User.objects.create_user(
+      username="hashing_user",
+      password="secret123",
+      email="hashing_user@test.com"
+    )
+
+  def login(self):
+    return self.client.post('/api/token/', {"username": "hashing_user", "password": "secret123"}, format="json")
+
+  def test_selected_profile_used_for_new_passwords(self):
+    """Test that new passwords use the tuned Argon2id parameters"""
+    self.assertTrue(self.user.password.startswith("argon2$argon2id$v=19$m=19456,t=2,p=1$"))
+
+  def test_legacy_hash_upgraded_on_login(self):
+    """Test that existing PBKDF2 hashes keep working and are upgraded"""
+    User.objects.filter(pk=self.user.pk).update(password=make_password("secret123", hasher="pbkdf2_sha256"))
+    self.assertEqual(self.login().status_code, 200)
+    self.user.refresh_from_db()
+    self.assertTrue(self.user.password.startswith("argon2$"))
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_login_rejected_when_slots_busy(self):
+    """Test that logins get 503 with Retry-After while all slots are taken"""
+    with hashing_slot():
+      response = self.login()
+    self.assertEqual(response.status_code, 503)
+    self.assertEqual(response["Retry-After"], "1")
+    self.assertEqual(self.login().status_code, 200)
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_registration_rejected_when_slots_busy(self):
+    """Test that registration does not hash or create the user while saturated"""
+    data = {"username": "busy_user", "email": "busy@test.com", "password": "supersecure"}
+    with hashing_slot():
+      response = self.client.post(reverse('register'), data, format='json')
+    self.assertEqual(response.status_code, 503)
+    self.assertFalse(User.objects.filter(username="busy_user").exists())
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_slot_released_on_error(self):
+    """Test that a failing block gives its slot back"""
+    with self.assertRaises(ValueError):
+      with hashing_slot():
+        raise ValueError
+    with hashing_slot():
+      pass
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_abandoned_slot_expires(self):
+    """Test that slots held by crashed processes are reclaimed after SLOT_TTL"""
+    key = cache.make_key(SLOTS_KEY)
+    get_redis_connection('default').zadd(key, {"crashed": time.time() - SLOT_TTL - 1})
+    with hashing_slot():
+      pass
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_slot_limit_holds_across_clock_skew(self):
+    """Test that a host whose clock runs behind cannot take a slot held elsewhere"""
+    key = cache.make_key(SLOTS_KEY)
+    # Saati ileri giden başka bir sunucunun tuttuğu slot
+    get_redis_connection('default').zadd(key, {"skewed_host": time.time() + 5})
+    with self.assertRaises(HashingBusy):
+      with hashing_slot():
+        pass
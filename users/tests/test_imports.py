@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_redis import get_redis_connection
+from users.hashing import SLOTS_KEY, hashing_slot
+from users.imports import UserImporter, iter_rows, run_import_job
+from users.models import Profile, UserImportJob
+from users.tasks import run_user_import
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+CSV_BODY = (
+  "username,email,password,role,first_name\n"
+  "pilot_ada,ada@test.com,secret123,staff,Ada\n"
+  "cabin_can,can@test.com,,,Can\n"
+  "bad_role,bad@test.com,secret123,captain,\n"
+)
+
+
+class UserImportTest(APITestCase):
+  def setUp(self):
+    """Set up test data"""
+    get_redis_connection('default').delete(cache.make_key(SLOTS_KEY))
+    media_root = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, media_root)
+    media = override_settings(MEDIA_ROOT=media_root)
+    media.enable()
+    self.addCleanup(media.disable)
+    self.staff = User.objects.create_user(
+      username="import_staff",
+      password="secret123",
+      email="import_staff@test.com",
+      role="staff"
+    )
+    self.url = reverse('user-import')
+    self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.staff)}")
+
+  def _import(self, body, content_type='text/csv'):
+    """Yüklemeyi yapar, kuyruğa alınan işi çalıştırır ve işin durumunu döner"""
+    with patch("users.views.run_user_import.delay", side_effect=run_user_import) as mock_delay:
+      with self.captureOnCommitCallbacks(execute=True):
+        response = self.client.generic('POST', self.url, body, content_type=content_type)
+    self.assertEqual(response.status_code, 202)
+    self.assertEqual(response.data["status"], UserImportJob.PENDING)
+    mock_delay.assert_called_once_with(str(response.data["id"]))
+    self.assertEqual(response["Location"], f"http://testserver{reverse('user-import-detail', args=[response.data['id']])}")
+    return self.client.get(response["Location"])
+
+  def test_csv_import_creates_users_and_profiles(self):
+    """Test that valid rows are created with profiles and invalid rows are reported"""
+    response = self._import(CSV_BODY)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.data["status"], UserImportJob.SUCCEEDED)
+    summary = response.data["summary"]
+    self.assertEqual((summary["created"], summary["failed"]), (2, 1))
+    self.assertEqual(summary["errors"][0]["line"], 4)
+    self.assertIn("role", summary["errors"][0]["errors"])
+    self.assertIsNotNone(response.data["finished_at"])
+
+    ada = User.objects.get(username="pilot_ada")
+    self.assertEqual((ada.role, ada.first_name), ("staff", "Ada"))
+    self.assertTrue(ada.check_password("secret123"))
+    can = User.objects.get(username="cabin_can")
+    self.assertEqual(can.role, "viewer")
+    self.assertFalse(can.has_usable_password())
+    self.assertEqual(Profile.objects.filter(user__in=[ada, can]).count(), 2)
+
+  def test_ndjson_duplicates_and_conflicts(self):
+    """Test that existing and repeated usernames/emails are skipped"""
+    rows = [
+      {"username": "import_staff", "email": "other@test.com"},
+      {"username": "fresh_user", "email": "fresh@test.com", "password": "secret123"},
+      {"username": "fresh_user", "email": "fresh2@test.com"},
+      {"username": "third_user", "email": "FRESH@test.com"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+    summary = self._import(body, content_type='application/x-ndjson').data["summary"]
+    # Sadece domain normalize edilir; FRESH@test.com ayrı bir adrestir
+    self.assertEqual((summary["created"], summary["failed"]), (2, 3))
+    self.assertEqual([error["line"] for error in summary["errors"]], [1, 3, 5])
+
+  def test_bad_header_fails_the_job(self):
+    """Test that a CSV without required columns ends as a failed job with the reason"""
+    response = self._import("name,mail\nx,y\n")
+    self.assertEqual(response.data["status"], UserImportJob.FAILED)
+    self.assertIn("username", response.data["error"])
+    self.assertIsNone(response.data["summary"])
+
+  def test_uploaded_file_is_removed_after_the_job(self):
+    """Test that the stored body is deleted once the job finishes"""
+    response = self._import(CSV_BODY)
+    job = UserImportJob.objects.get(pk=response.data["id"])
+    self.assertFalse(job.file)
+    self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, 'user_imports')), [])
+
+  def test_job_runs_once(self):
+    """Test that a redelivered task does not import the same file twice"""
+    response = self._import(CSV_BODY)
+    self.assertIsNone(run_import_job(response.data["id"]))
+    self.assertEqual(User.objects.filter(username="pilot_ada").count(), 1)
+
+  @override_settings(PASSWORD_HASHING_SLOTS=1, PASSWORD_HASHING_WAIT=0)
+  def test_upload_is_accepted_while_hashing_slots_are_busy(self):
+    """Test that the request itself does no hashing and is queued even when logins hold every slot"""
+    with hashing_slot(), patch("users.views.run_user_import.delay") as mock_delay:
+      with self.captureOnCommitCallbacks(execute=True):
+        response = self.client.generic('POST', self.url, CSV_BODY, content_type='text/csv')
+    self.assertEqual(response.status_code, 202)
+    mock_delay.assert_called_once()
+    self.assertFalse(User.objects.filter(username="pilot_ada").exists())
+
+  def test_viewer_forbidden(self):
+    """Test that only staff and admins can import users or read jobs"""
+    job = UserImportJob.objects.create(created_by=self.staff, format='csv')
+    viewer = User.objects.create_user(username="import_viewer", password="secret123", email="iv@test.com")
+    self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(viewer)}")
+    response = self.client.generic('POST', self.url, CSV_BODY, content_type='text/csv')
+    self.assertEqual(response.status_code, 403)
+    self.assertFalse(UserImportJob.objects.exclude(pk=job.pk).exists())
+    response = self.client.get(reverse('user-import-detail', args=[job.pk]))
+    self.assertEqual(response.status_code, 403)
+
+  def test_unsupported_media_type(self):
+    """Test that unknown bodies are rejected without creating a job"""
+    response = self.client.post(self.url, {"username": "x"}, format="json")
+    self.assertEqual(response.status_code, 415)
+    self.assertFalse(UserImportJob.objects.exists())
+
+
+class ImportUsersCommandTest(APITestCase):
+  def test_command_imports_with_process_pool(self):
+    """Test that the command streams the file and hashes in worker processes"""
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+      handle.write("username,email,password\n")
+      for i in range(6):
+        handle.write(f"pool_{i},pool_{i}@test.com,secret{i}xyz\n")
+    self.addCleanup(os.remove, handle.name)
+    out = StringIO()
+    call_command('import_users', handle.name, '--batch-size', '4', '--workers', '2', stdout=out)
+    self.assertIn("Imported 6 users", out.getvalue())
+    self.assertTrue(User.objects.get(username="pool_5").check_password("secret5xyz"))
+    self.assertEqual(Profile.objects.filter(user__username__startswith="pool_").count(), 6)
+
+  def test_queries_do_not_grow_with_rows(self):
+    """Test that a batch is validated and written with a fixed number of queries"""
+    def rows(count, offset):
+      return iter_rows(["username,email\n"] + [f"bulk_{offset + i},bulk_{offset + i}@test.com\n" for i in range(count)], 'csv')
+
+    with CaptureQueriesContext(connection) as small:
+      UserImporter().run(rows(2, 0))
+    with CaptureQueriesContext(connection) as large:
+      summary = UserImporter().run(rows(50, 100))
+    self.assertEqual(summary["created"], 50)
+    self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+  def test_importer_reports_partial_progress(self):
+    """Test that the importer counts rows across batches"""
+    lines = ["username,email\n"] + [f"batch_{i},batch_{i}@test.com\n" for i in range(5)]
+    summary = UserImporter(batch_size=2).run(iter_rows(lines, 'csv'))
+    self.assertEqual((summary["created"], summary["failed"]), (5, 0))
@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import RegisterView
+from .views import RegisterView, UserImportJobView, UserImportView
 
 urlpatterns = [
   path('register/', RegisterView.as_view(), name='register'),
+  path('import/', UserImportView.as_view(), name='user-import'),
+  path('import/<uuid:pk>/', UserImportJobView.as_view(), name='user-import-detail'),
 ]
@@ -1,8 +1,63 @@
-from rest_framework import generics
-from .serializers import RegisterSerializer
-from .models import User
+from django.core.files import File
+from django.db import transaction
+from rest_framework import generics, status
+from rest_framework.exceptions import UnsupportedMediaType
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+from .permissions import IsRole
+from .serializers import RegisterSerializer, UserImportJobSerializer
+from .models import User, UserImportJob
+from .tasks import run_user_import
+import logging
+
+logger = logging.getLogger(__name__)
+
+# İçe aktarmada kabul edilen gövde türleri
+IMPORT_MEDIA_TYPES = {
+  'text/csv': 'csv',
+  'application/x-ndjson': 'ndjson',
+  'application/jsonl': 'ndjson',
+}
 
 class RegisterView(generics.CreateAPIView):
   queryset = User.objects.all()
   serializer_class = RegisterSerializer
   permission_classes = []  # public endpoint
+
+class UserImportView(APIView):
+  """
+  CSV (text/csv, ilk satır kolon adları) ya da NDJSON gövdeden toplu kullanıcı
+  oluşturur. Gövde parse edilmeden diske akıtılır ve bir UserImportJob olarak
+  Celery'ye verilir; yanıt 202 ve işin adresidir. Parola özetleri web
+  worker'ında hesaplanmaz, girişler ve gunicorn zaman aşımı etkilenmez.
+  Hatalı satırlar işin özetinde satır numarasıyla döner.
+  """
+  parser_classes = []
+
+  def get_permissions(self):
+    return [IsAuthenticated(), IsRole(['staff', 'admin'])]
+
+  def post(self, request):
+    media_type = request.content_type.split(';')[0].strip().lower()
+    fmt = IMPORT_MEDIA_TYPES.get(media_type)
+    if fmt is None:
+      raise UnsupportedMediaType(media_type)
+
+    job = UserImportJob(created_by=request.user, format=fmt)
+    job.file.save(f'{job.id}.{fmt}', File(request._request), save=False)
+    job.save()
+    transaction.on_commit(lambda: run_user_import.delay(str(job.pk)))
+    logger.info(f"👥 Kullanıcı içe aktarma işi kuyruğa alındı: {job.pk}")
+    location = reverse('user-import-detail', args=[job.pk], request=request)
+    return Response(UserImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+
+class UserImportJobView(generics.RetrieveAPIView):
+  """İçe aktarma işinin durumu; bittiğinde özeti (oluşturulan, hatalı satırlar)"""
+  queryset = UserImportJob.objects.all()
+  serializer_class = UserImportJobSerializer
+
+  def get_permissions(self):
+    return [IsAuthenticated(), IsRole(['staff', 'admin'])]